@@ -4,15 +4,46 @@
 from machine import Pin,I2C
 from micropython import const
 from utime import sleep_ms
+from array import array
+from ustruct import unpack_from
 
 from adxl345_const import *
+from regio import RegIO, FIELD_MASKS, field, extract, insert
+
+# bit field descriptors (register, shift, mask) of the multi bit fields, computed once at import
+RATE_FIELD         = field(ADXL345_BW_RATE,RATE,RATE_SIZE)
+LOW_POWER_FIELD    = field(ADXL345_BW_RATE,LOW_POWER,LOW_POWER_SIZE)
+WAKEUP_FIELD       = field(ADXL345_POWER_CTL,WAKEUP,WAKEUP_SIZE)
+AUTO_SLEEP_FIELD   = field(ADXL345_POWER_CTL,AUTO_SLEEP,AUTO_SLEEP_SIZE)
+RANGE_FIELD        = field(ADXL345_DATA_FORMAT,RANGE,RANGE_SIZE)
+SAMPLES_FIELD      = field(ADXL345_FIFO_CTL,SAMPLES,SAMPLES_SIZE)
+FIFO_TYPE_FIELD    = field(ADXL345_FIFO_CTL,FIFO_TYPE,FIFO_TYPE_SIZE)
+FIFO_ENTRIES_FIELD = field(ADXL345_FIFO_STATUS,FIFO_ENTRIES,FIFO_ENTRIES_SIZE)
 
 class ADXL345(object):
     
-    def __init__(self,scl=22,sda=21,debug=False):
+    def __init__(self,scl=22,sda=21,debug=False,cache=False,freq=400000,i2c=None):
+        # i2c: an existing I2C bus or any bus transport (see bustransport.py), e.g. an
+        #      SPITransport to run the adxl345 on SPI at up to 5 MHz
+        #      If None, the hardware I2C bus 1 is created on scl, sda with clock freq
         self.debug = debug
+        self.fifoStatus = bytearray(1)
+        self.accelBuf = bytearray(ADXL345_SAMPLE_SIZE)
+        self.drainSample = array('h',[0,0,0])
+        # shadow copy of the configuration registers, see setCache()
+        self.cache = cache
+        self.shadow = bytearray(ADXL345_SHADOW_SIZE)
+        self.shadowValid = bytearray(ADXL345_SHADOW_SIZE)
+        self.cacheable = bytearray(ADXL345_SHADOW_SIZE)
+        for reg in ADXL345_CACHED_REGISTERS :
+            self.cacheable[reg] = 1
+        # batched configuration, see configure()
+        self.batch = 0
+        self.dirty = bytearray(ADXL345_SHADOW_SIZE)
         
-        self.i2c = I2C(1,scl=Pin(scl),sda=Pin(sda),freq=400000)
+        if i2c is None:
+            i2c = I2C(1,scl=Pin(scl),sda=Pin(sda),freq=freq)
+        self.i2c = i2c
         i2c_slaves = self.i2c.scan()
         if ADXL345_ADDRESS in i2c_slaves:
             if self.debug:
@@ -22,14 +53,18 @@ class ADXL345(object):
             print("Please check your connections")
             return
         self.adxl345_addr = ADXL345_ADDRESS      
-        devID = self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_DEVID,1)
+        # all register accesses go through regio, which counts the bus transfers
+        self.regio = RegIO(self.i2c,self.adxl345_addr)
+        devID = self.regio.readByte(ADXL345_DEVID)
         if self.debug:
-            print("Device ID: 0x{:02x}".format(int(devID[0])))
-        if int(devID[0]) != ADXL345_DEVICE_ID:
+            print("Device ID: 0x{:02x}".format(devID))
+        if devID != ADXL345_DEVICE_ID:
             print("Bad value from devid register, is the device a AXCL345?")
             return
         if self.debug :
             print("Found an ADXL345 on the I2C bus, continuing...")
+        if self.cache :
+            self.sync()
 
     def setDebug(self,enable):
         self.debug = enable
@@ -51,84 +86,187 @@ class ADXL345(object):
                 print("negative value: {:d} ".format(val)) 
             return val
 
-    def setBit(self,register,bit_pos,value):
-        mask = 1 << bit_pos
-        tmp = bytearray(1)
-        tmp[0] = self.i2c.readfrom_mem(self.adxl345_addr,register,1)[0]
-        if self.debug :
-            print("Mask: 0x{:02x}, shift: {:d}".format(mask,bit_pos))
-            print("Previous state of register 0x{:02x}: 0x{:02x}".format(register,tmp[0]))
-        mask = ~mask # get rid of the previous state of the bit
-        tmp[0] &= mask
-        tmp[0] |= value << bit_pos
+    # Shadow register cache
+    # When enabled, the configuration registers (THRESH_TAP .. INT_MAP without ACT_TAP_STATUS,
+    # DATA_FORMAT and FIFO_CTL) are kept in a write-through copy. Bit field updates then cost
+    # a single write and reads no bus access at all.
+    # Registers changed by the chip itself (ACT_TAP_STATUS, INT_SOURCE, FIFO_STATUS, the data
+    # registers) are never cached. Use sync() or invalidate() if the configuration was changed
+    # behind our back, e.g. by another program or a power cycle of the sensor
+    def setCache(self,enable) :
+        self.cache = enable
+        self.invalidate()
+        if enable :
+            self.sync()
+
+    def getCache(self) :
+        return self.cache
+
+    def invalidate(self,register=None) :
+        if register is None :
+            for reg in range(ADXL345_SHADOW_SIZE) :
+                self.shadowValid[reg] = 0
+        else :
+            self.shadowValid[register] = 0
+
+    def sync(self,register=None) :
+        # reload the shadow copy from the chip
+        if register is not None :
+            self.shadowValid[register] = 0
+            return self.readRegister(register)
+        if not self.cache :
+            return
+        shadow = memoryview(self.shadow)
+        # THRESH_TAP .. INT_MAP in a single burst
+        self.regio.readInto(ADXL345_THESH_TAP,
+                            shadow[ADXL345_THESH_TAP:ADXL345_INT_MAP+1])
+        self.regio.readInto(ADXL345_DATA_FORMAT,
+                            shadow[ADXL345_DATA_FORMAT:ADXL345_DATA_FORMAT+1])
+        self.regio.readInto(ADXL345_FIFO_CTL,
+                            shadow[ADXL345_FIFO_CTL:ADXL345_FIFO_CTL+1])
+        for reg in range(ADXL345_SHADOW_SIZE) :
+            self.shadowValid[reg] = self.cacheable[reg]
         if self.debug :
-            print("New state of register 0x{:02x}: 0x{:02x}".format(register,tmp[0]))
-        self.i2c.writeto_mem(self.adxl345_addr,register,tmp)
+            print("Shadow registers synchronized")
+
+    def readRegister(self,register) :
+        shadowed = self.cache or self.batch
+        if shadowed and self.shadowValid[register] :
+            return self.shadow[register]
+        value = self.regio.readByte(register)
+        if shadowed and self.cacheable[register] :
+            self.shadow[register] = value
+            self.shadowValid[register] = 1
+        return value
+
+    def writeRegister(self,register,value) :
+        if self.batch and self.cacheable[register] :
+            # inside a configure() block: only remember the new value
+            self.shadow[register] = value & 0xff
+            self.shadowValid[register] = 1
+            self.dirty[register] = 1
+            return
+        self.regio.writeByte(register,value)
+        if self.cache and self.cacheable[register] :
+            self.shadow[register] = value & 0xff
+            self.shadowValid[register] = 1
+
+    # Batched configuration
+    # All register writes inside a
+    #     with adxl345.configure() :
+    #         adxl345.setActXEnable(True)
+    #         ...
+    # block only modify the shadow copy. When the block is left, every modified register is
+    # written exactly once, contiguous registers in a single multi-byte transfer.
+    # POWER_CTL is written last: the measurement only starts once the configuration is complete
+    def configure(self) :
+        return self
+
+    def __enter__(self) :
+        self.batch += 1
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback) :
+        self.batch -= 1
+        if self.batch :                   # nested block, the outermost one flushes
+            return False
+        if exc_type is None :
+            self.flush()
+        for reg in range(ADXL345_SHADOW_SIZE) :
+            if self.dirty[reg] and exc_type is not None :
+                self.shadowValid[reg] = 0     # the write was discarded, the chip keeps its value
+            self.dirty[reg] = 0
+        if not self.cache :
+            self.invalidate()
+        return False
+
+    def flush(self) :
+        shadow = memoryview(self.shadow)
+        transfers = 0
+        reg = 0
+        while reg < ADXL345_SHADOW_SIZE :
+            if not self.dirty[reg] or reg == ADXL345_POWER_CTL :
+                reg += 1
+                continue
+            # extend the transfer over registers with known contents as long as
+            # there are more modified registers to come
+            end = reg + 1
+            nextReg = end
+            while nextReg < ADXL345_SHADOW_SIZE and nextReg != ADXL345_POWER_CTL and \
+                  self.cacheable[nextReg] and self.shadowValid[nextReg] :
+                nextReg += 1
+                if self.dirty[nextReg-1] :
+                    end = nextReg
+            self.regio.write(reg,shadow[reg:end])
+            transfers += 1
+            if self.debug :
+                print("flush: {:d} bytes to register 0x{:02x}".format(end-reg,reg))
+            for r in range(reg,end) :
+                self.dirty[r] = 0
+            reg = end
+        if self.dirty[ADXL345_POWER_CTL] :
+            self.regio.write(ADXL345_POWER_CTL,
+                             shadow[ADXL345_POWER_CTL:ADXL345_POWER_CTL+1])
+            self.dirty[ADXL345_POWER_CTL] = 0
+            transfers += 1
+        return transfers
+
+    # bit field helpers: the field starts at bitfield_pos (its most significant bit) and is
+    # bitfield_size bits wide. Masks are taken from regio.FIELD_MASKS, field values are cut
+    # to the field size. getField/setField take a descriptor made by regio.field(), the setters
+    # and getters of the multi bit fields use the descriptors defined at the top of this file
+    def setBit(self,register,bit_pos,value):
+        self.setMasked(register,bit_pos,1 << bit_pos,value)
         
     def getBit(self,register,bit_pos):
-        tmp = self.i2c.readfrom_mem(self.adxl345_addr,register,1)[0]
-        if self.debug :
-            print("read from register 0x{:02x}: 0x{:02x}".format(register,tmp))
-        return (tmp >> bit_pos) & 1 
+        return self.getMasked(register,bit_pos,1 << bit_pos)
 
     def setBits(self,register,bitfield_pos,bitfield_size,value):
-        tmp = bytearray(1)
-        mask = 1
-        for i in range(bitfield_size-1) :
-            mask <<=1
-            mask |=1
-        shift = bitfield_pos - bitfield_size +1  
-        mask <<= shift
-        if self.debug:
-            print("Mask: 0x{:02x}, shift: {:d}".format(mask,shift))
-        tmp[0] = self.i2c.readfrom_mem(self.adxl345_addr,register,1)[0]
-        if self.debug :
-            print("Previous state of register 0x{:02x}: 0x{:02x}".format(register,tmp[0]))
-             
-        mask = ~mask # get rid of the previous state of the bit
-        tmp[0] &= mask
-        mask = ~mask
-        tmp[0] |= value << shift & mask
-        
-        if self.debug :
-            print("New state of register 0x{:02x}: 0x{:02x}".format(register,tmp[0]))
-        
-        self.i2c.writeto_mem(self.adxl345_addr,register,tmp)
+        shift = bitfield_pos - bitfield_size + 1
+        self.setMasked(register,shift,FIELD_MASKS[bitfield_size] << shift,value)
 
     def getBits(self,register,bitfield_pos,bitfield_size):
-        mask = 1
-        for i in range(bitfield_size-1) :
-            mask <<=1
-            mask |=1
-        shift = bitfield_pos -bitfield_size +1
-        mask <<=shift
+        shift = bitfield_pos - bitfield_size + 1
+        return self.getMasked(register,shift,FIELD_MASKS[bitfield_size] << shift)
+
+    def setField(self,descriptor,value):
+        self.setMasked(descriptor[0],descriptor[1],descriptor[2],value)
+
+    def getField(self,descriptor):
+        return self.getMasked(descriptor[0],descriptor[1],descriptor[2])
+
+    def setMasked(self,register,shift,mask,value):
+        tmp = self.readRegister(register)
         if self.debug :
-            print("mask = 0x{:02x}, shift = {:d}".format(mask,shift))
-        tmp = self.i2c.readfrom_mem(self.adxl345_addr,register,1)[0]
+            print("Mask: 0x{:02x}, shift: {:d}".format(mask,shift))
+            print("Previous state of register 0x{:02x}: 0x{:02x}".format(register,tmp))
+        tmp = insert(tmp,shift,mask,value)
+        if self.debug :
+            print("New state of register 0x{:02x}: 0x{:02x}".format(register,tmp))
+        self.writeRegister(register,tmp)
+
+    def getMasked(self,register,shift,mask):
+        tmp = self.readRegister(register)
         if self.debug :
             print("Value in register 0x{:02x}: 0x{:02x}".format(register,tmp))
-        return (tmp & mask) >> shift
+        return extract(tmp,shift,mask)
     
     def setTapThreshold(self,threshold) :
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_THESH_TAP,tmp)
+        self.writeRegister(ADXL345_THESH_TAP,threshold)
 
     def getTapThreshold(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_THESH_TAP,1)[0]
+        return self.readRegister(ADXL345_THESH_TAP)
     
     def setXOffset(self,offset):
         if offset < -128 or offset > 127:
             print("Offset must be in the range -128 .. 127")
             return
-        tmp = bytearray(1)
-        tmp[0] = offset
         if self.debug :
-            print("Setting offset: 0x{:02x}".format(tmp[0]))
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_OFSX,tmp)
+            print("Setting offset: 0x{:02x}".format(offset & 0xff))
+        self.writeRegister(ADXL345_OFSX,offset)
 
     def getXOffset(self):
-        tmp =  self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_OFSX,1)[0]
+        tmp =  self.readRegister(ADXL345_OFSX)
         if tmp & 0x80 : # negative 8 bit number
             offset = int((~tmp+1) & 0xff)
             offset = -offset
@@ -142,14 +280,12 @@ class ADXL345(object):
         if offset < -128 or offset > 127:
             print("Offset must be in the range -128 .. 127")
             return
-        tmp = bytearray(1)
-        tmp[0] = offset
         if self.debug :
-            print("Setting offset: 0x{:02x}".format(tmp[0]))
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_OFSY,tmp)
+            print("Setting offset: 0x{:02x}".format(offset & 0xff))
+        self.writeRegister(ADXL345_OFSY,offset)
 
     def getYOffset(self):
-        tmp =  self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_OFSY,1)[0]
+        tmp =  self.readRegister(ADXL345_OFSY)
         if tmp & 0x80 : # negative 8 bit number
             offset = int((~tmp+1) & 0xff)
             offset = -offset
@@ -163,14 +299,12 @@ class ADXL345(object):
         if offset < -128 or offset > 127:
             print("Offset must be in the range -128 .. 127")
             return
-        tmp = bytearray(1)
-        tmp[0] = offset
         if self.debug :
-            print("Setting offset: 0x{:02x}".format(tmp[0]))
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_OFSZ,tmp)
+            print("Setting offset: 0x{:02x}".format(offset & 0xff))
+        self.writeRegister(ADXL345_OFSZ,offset)
 
     def getZOffset(self):
-        tmp =  self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_OFSZ,1)[0]
+        tmp =  self.readRegister(ADXL345_OFSZ)
         if tmp & 0x80 : # negative 8 bit number
             offset = int((~tmp+1) & 0xff)
             offset = -offset
@@ -181,61 +315,47 @@ class ADXL345(object):
         return offset
         
     def setTapDuration(self,duration):
-        tmp = bytearray(1)
-        tmp[0] = duration
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_DUR,tmp)
+        self.writeRegister(ADXL345_DUR,duration)
 
     def getTapDuration(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_DUR,1)[0]
+        return self.readRegister(ADXL345_DUR)
 
     def setTapLatency(self,latency):
-        tmp = bytearray(1)
-        tmp[0] = latency
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_LATENT,tmp)
+        self.writeRegister(ADXL345_LATENT,latency)
 
     def getTapLatency(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_LATENT,1)[0]
+        return self.readRegister(ADXL345_LATENT)
         
     def setTapWindow(self,timeWindow):
-        tmp = bytearray(1)
-        tmp[0] = timeWindow
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_WINDOW,tmp)
+        self.writeRegister(ADXL345_WINDOW,timeWindow)
 
     def getTapWindow(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_WINDOW,1)[0]
+        return self.readRegister(ADXL345_WINDOW)
 
     def setActivityThreshold(self,threshold):
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_THRESH_ACT,tmp)
+        self.writeRegister(ADXL345_THRESH_ACT,threshold)
 
     def getActivityThreshold(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_THRESH_ACT,1)[0]
+        return self.readRegister(ADXL345_THRESH_ACT)
 
     def setInactivityThreshold(self,threshold):
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_THRESH_INACT,tmp)
+        self.writeRegister(ADXL345_THRESH_INACT,threshold)
 
     def getActivityThreshold(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_THRESH_INACT,1)[0]
+        return self.readRegister(ADXL345_THRESH_INACT)
 
     def setInactivityTime(self,inactivityTime):
-        tmp = bytearray(1)
-        tmp[0] = inactivityTime
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_TIME_INACT,tmp)
+        self.writeRegister(ADXL345_TIME_INACT,inactivityTime)
 
     def getInactivityTime(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_TIME_INACT,1)[0]
+        return self.readRegister(ADXL345_TIME_INACT)
 
     # ACT_INACT_CTL register
     def setAct_InactControl(self,act_inactControl):
-        tmp = bytearray(1)
-        tmp[0] = act_inactControl
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_ACT_INACT_CTL,tmp)
+        self.writeRegister(ADXL345_ACT_INACT_CTL,act_inactControl)
 
     def getAct_InactControl(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_ACT_INACT_CTL,1)[0]
+        return self.readRegister(ADXL345_ACT_INACT_CTL)
 
     def setInactXEnable(self,en) :
         self.setBit(ADXL345_ACT_INACT_CTL,INACT_X_EN,en)
@@ -286,30 +406,24 @@ class ADXL345(object):
         return self.getBit(ADXL345_ACT_INACT_CTL,ACT_AC_DC)
       
     def setFreeFallThreshold(self,threshold):
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_THRESH_FF,tmp)
+        self.writeRegister(ADXL345_THRESH_FF,threshold)
 
     def getFreeFallThreshold(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_THRESH_FF,1)[0]
+        return self.readRegister(ADXL345_THRESH_FF)
 
     def setFreeFallTime(self,freeFallTime):
-        tmp = bytearray(1)
-        tmp[0] = freeFallTime
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_THRESH_FF,tmp)
+        self.writeRegister(ADXL345_THRESH_FF,freeFallTime)
 
     def getFreeFallTime(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_THRESH_FF,1)[0]
+        return self.readRegister(ADXL345_THRESH_FF)
 
     # TAP_AXES register
     
     def setTapAxes(self,axis_enable):
-        tmp = bytearray(1)
-        tmp[0] = axis_enable
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_TAP_AXES,tmp)
+        self.writeRegister(ADXL345_TAP_AXES,axis_enable)
 
     def getFreeFallTime(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_TAP_AXES,1)[0]
+        return self.readRegister(ADXL345_TAP_AXES)
 
     def setTapXEnable(self,en) :
         self.setBit(ADXL345_TAP_AXES,TAP_X_EN,en)
@@ -337,7 +451,7 @@ class ADXL345(object):
       
     # ACT_TAP_STATUS
     def getTapStatus(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_ACT_TAP_STATUS,1)[0]
+        return self.readRegister(ADXL345_ACT_TAP_STATUS)
 
     def getTapXSource(self):
         return self.getBit(ADXL345_ACT_TAP_STATUS,TAP_X_SOURCE)
@@ -362,45 +476,41 @@ class ADXL345(object):
     
     # BW_RATE register
     def setDataRateAndPowerCtl(self,dataRateAndPowerCtl):
-        tmp = bytearray(1)
-        tmp[0] = dataRateAndPowerCtl
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_BW_RATE,tmp)
+        self.writeRegister(ADXL345_BW_RATE,dataRateAndPowerCtl)
 
     def getDataRateAndPowerCtl(self) :
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_BW_RATE,1)[0]
+        return self.readRegister(ADXL345_BW_RATE)
 
     def setDataRate(self,dataRate):
-        self.setBits(ADXL345_BW_RATE,RATE,RATE_SIZE,dataRate)
+        self.setField(RATE_FIELD,dataRate)
 
     def getDataRate(self) :
-        return self.getBits(ADXL345_BW_RATE,RATE,RATE_SIZE)
+        return self.getField(RATE_FIELD)
 
     def setLowPower(self,lowPower) :    
-        self.setBits(ADXL345_BW_RATE,LOW_POWER,LOW_POWER_SIZE,lowPower)
+        self.setField(LOW_POWER_FIELD,lowPower)
         
     def getLowPower(self) :
-        return self.getBits(ADXL345_BW_RATE,LOW_POWER,LOW_POWER_SIZE)
+        return self.getField(LOW_POWER_FIELD)
 
     # POWER_CTL register
     def setPowerCtl(self,powerCtl):
-        tmp = bytearray(1)
-        tmp[0] = powerCtl
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_POWER_CTL,tmp)
+        self.writeRegister(ADXL345_POWER_CTL,powerCtl)
 
     def getPowerCtl(self) :
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_POWER_CTL,1)[0]
+        return self.readRegister(ADXL345_POWER_CTL)
 
     def setWakeUp(self,wakeup) :
-        self.setBits(ADXL345_POWER_CTL,WAKEUP,WAKEUP_SIZE,wakeup)
+        self.setField(WAKEUP_FIELD,wakeup)
 
     def getWakeUp(self) :
-        return self.getBits(ADXL345_POWER_CTL,WAKEUP,WAKEUP_SIZE)
+        return self.getField(WAKEUP_FIELD)
 
     def setSleep(self,sleepBit) :
         self.setBit(ADXL345_POWER_CTL,SLEEP,sleepBit)
 
     def getSleep(self) :
-        return self.getBits(ADXL345_POWER_CTL,SLEEP)
+        return self.getBit(ADXL345_POWER_CTL,SLEEP)
 
     def setMeasure(self,measureBit) :
         self.setBit(ADXL345_POWER_CTL,MEASURE,measureBit)
@@ -409,138 +519,134 @@ class ADXL345(object):
         return self.getBit(ADXL345_POWER_CTL,MEASURE)
 
     def setAutoSleep(self,autosleep) :
-        self.setBits(ADXL345_POWER_CTL,AUTO_SLEEP,AUTO_SLEEP_SIZE,autosleep)
+        self.setField(AUTO_SLEEP_FIELD,autosleep)
 
     def getAutoSleep(self) :
-        return self.getBits(ADXL345_POWER_CTL,AUTO_SLEEP,AUTO_SIZE)
+        return self.getField(AUTO_SLEEP_FIELD)
 
     def setLink(self,linkBit) :
         self.setBit(ADXL345_POWER_CTL,LINK,linkBit)
 
     def getLink(self) :
-        return self.getBits(ADXL345_POWER_CTL,LINK)
+        return self.getBit(ADXL345_POWER_CTL,LINK)
 
 
     # INT_ENABLE register
 
     def setInterruptEnable(self,enable):
-        tmp = bytearray(1)
-        tmp[0] = enable
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_INT_ENABLE,tmp)
+        self.writeRegister(ADXL345_INT_ENABLE,enable)
 
     def getInterruptEnable(self) :
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_INT_ENABLE,1)[0]
+        return self.readRegister(ADXL345_INT_ENABLE)
 
     def setOverrunIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,OVERRUN,enable)
 
     def getOverrunIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,OVERRUN)
+        return self.getBit(ADXL345_INT_ENABLE,OVERRUN)
 
     def setWatermarkIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,WATERMARK,enable)
 
     def getWatermarkIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,WATERMARK)
+        return self.getBit(ADXL345_INT_ENABLE,WATERMARK)
 
     def setFreeFallIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,FREE_FALL,enable)
 
     def getFreeFallIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,FREE_FALL)
+        return self.getBit(ADXL345_INT_ENABLE,FREE_FALL)
 
     def setInactivityIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,INACTIVITY,enable)
 
     def getInactivityIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,INACTIVITY)
+        return self.getBit(ADXL345_INT_ENABLE,INACTIVITY)
 
     def setActivityIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,ACTIVITY,enable)
 
     def getActivityIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,ACTIVITY)
+        return self.getBit(ADXL345_INT_ENABLE,ACTIVITY)
 
     def setDoubleTapIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,DOUBLE_TAP,enable)
 
     def getDoubleTapIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,DOUBLE_TAP)
+        return self.getBit(ADXL345_INT_ENABLE,DOUBLE_TAP)
 
     def setSingleTapIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,SINGLE_TAP,enable)
 
     def getSingleTapIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,SINGLE_TAP)
+        return self.getBit(ADXL345_INT_ENABLE,SINGLE_TAP)
 
     def setDataReadyIntEnable(self,enable) :
         self.setBit(ADXL345_INT_ENABLE,DATA_READY,enable)
 
     def getDataReadyIntEnable(self) :
-        return self.getBits(ADXL345_INT_ENABLE,DATA_READY)
+        return self.getBit(ADXL345_INT_ENABLE,DATA_READY)
 
     # INT_MAP register
 
     def setInterruptMapping(self,enable):
-        tmp = bytearray(1)
-        tmp[0] = enable
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_INT_MAP,tmp)
+        self.writeRegister(ADXL345_INT_MAP,enable)
 
     def getInterruptMapping(self) :
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_INT_MAP,1)[0]
+        return self.readRegister(ADXL345_INT_MAP)
 
     def setOverrunMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,OVERRUN,enable)
 
     def getOverrunMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,OVERRUN)
+        return self.getBit(ADXL345_INT_MAP,OVERRUN)
 
     def setWatermarkMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,WATERMARK,enable)
 
     def getWatermarkMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,WATERMARK)
+        return self.getBit(ADXL345_INT_MAP,WATERMARK)
 
     def setFreeFallMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,FREE_FALL,enable)
 
     def getFreeFallMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,FREE_FALL)
+        return self.getBit(ADXL345_INT_MAP,FREE_FALL)
 
     def setInactivityMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,INACTIVITY,enable)
 
     def getInactivityMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,INACTIVITY)
+        return self.getBit(ADXL345_INT_MAP,INACTIVITY)
 
     def setActivityMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,ACTIVITY,enable)
 
     def getActivityMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,ACTIVITY)
+        return self.getBit(ADXL345_INT_MAP,ACTIVITY)
 
     def setDoubleTapMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,DOUBLE_TAP,enable)
 
     def getDoubleTapMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,DOUBLE_TAP)
+        return self.getBit(ADXL345_INT_MAP,DOUBLE_TAP)
 
     def setSingleTapMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,SINGLE_TAP,enable)
 
     def getSingleTapMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,SINGLE_TAP)
+        return self.getBit(ADXL345_INT_MAP,SINGLE_TAP)
 
     def setDataReadyMapping(self,enable) :
         self.setBit(ADXL345_INT_MAP,DATA_READY,enable)
 
     def getDataReadyMapping(self) :
-        return self.getBits(ADXL345_INT_MAP,DATA_READY)
+        return self.getBit(ADXL345_INT_MAP,DATA_READY)
 
     # INT_SOURCE register
 
     def getInterruptSource(self) :
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_INT_SOURCE,1)[0]
+        return self.readRegister(ADXL345_INT_SOURCE)
 
     def getOverrunSource(self) :
         return self.getBit(ADXL345_INT_SOURCE,OVERRUN)
@@ -568,24 +674,22 @@ class ADXL345(object):
 
     # DATA_FORMAT register
     def setDataFormat(self,format):
-        tmp = bytearray(1)
-        tmp[0] = format
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_DATA_FORMAT,tmp)
+        self.writeRegister(ADXL345_DATA_FORMAT,format)
 
     def getDataFormat(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_DATA_FORMAT,1)[0]
+        return self.readRegister(ADXL345_DATA_FORMAT)
 
     def setRange(self,range) :
-        self.setBits(ADXL345_DATA_FORMAT,RANGE,RANGE_SIZE,range)
+        self.setField(RANGE_FIELD,range)
 
     def getRange(self) :
-        return self.getBits(ADXL345_DATA_FORMAT,RANGE,RANGE_SIZE)
+        return self.getField(RANGE_FIELD)
 
     def setJustiy(self,justify) :
         self.setBit(ADXL345_DATA_FORMAT,JUSTIFY,justify)
 
     def getJustify(self) :
-        return self.getBits(ADXL345_DATA_FORMAT,JUSTIFY)
+        return self.getBit(ADXL345_DATA_FORMAT,JUSTIFY)
     
     def setFullRes(self,fullres) :
         self.setBit(ADXL345_DATA_FORMAT,FULL_RES,fullres)
@@ -597,57 +701,55 @@ class ADXL345(object):
         self.setBit(ADXL345_DATA_FORMAT,INT_,intInvert)
 
     def getInterruptInvert(self) :
-        return self.getBits(ADXL345_DATA_FORMAT,INT_INVERT)
+        return self.getBit(ADXL345_DATA_FORMAT,INT_INVERT)
     
     def setSPIMode(self,spiMode) :
         self.setBit(ADXL345_DATA_FORMAT,SPI,spiMode)
 
     def getSPIMode(self) :
-        return self.getBits(ADXL345_DATA_FORMAT,SPI)
+        return self.getBit(ADXL345_DATA_FORMAT,SPI)
     
     def setSelfTest(self,selfTest) :
         self.setBit(ADXL345_DATA_FORMAT,SELF_TEST,selfTest)
 
     def getSelfTest(self) :
-        return self.getBits(ADXL345_DATA_FORMAT,SELF_TEST)
+        return self.getBit(ADXL345_DATA_FORMAT,SELF_TEST)
     
 
     # FIFO_CTL register
     def setFIFO_Ctl(self,fifoControl):
-        tmp = bytearray(1)
-        tmp[0] = fifoControl
-        self.i2c.writeto_mem(self.adxl345_addr,ADXL345_FIFO_CTL,tmp)
+        self.writeRegister(ADXL345_FIFO_CTL,fifoControl)
 
     def getFIFO_Ctl(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_FIFO_CTL,1)[0]
+        return self.readRegister(ADXL345_FIFO_CTL)
 
     def setSamples(self,samples) :
-        self.setBits(ADXL345_FIFO_CTL,SAMPLES,SAMPLES_SIZE,samples)
+        self.setField(SAMPLES_FIELD,samples)
 
     def getSamples(self) :
-        return self.getBits(ADXL345_FOF_CTL,SAMPLES,SAMPLES_SIZE)
+        return self.getField(SAMPLES_FIELD)
 
     def setTrigger(self,trigger) :
         self.setBit(ADXL345_FIFO_CTL,TRIGGER,trigger)
 
     def getTrigget(self) :
-        return self.getBits(ADXL345_FIFO_CTL,TRIGGER)
+        return self.getBit(ADXL345_FIFO_CTL,TRIGGER)
 
     def setFIFOMode(self,fifoMode) :
-        self.setBits(ADXL345_FIFO_CTL,FIFO_TYPE,FIFO_TYPE_SIZE,fifoMode)
+        self.setField(FIFO_TYPE_FIELD,fifoMode)
 
     def getFIFOMode(self) :
-        return self.getBits(ADXL345_FIFO_CTL,FIFO_TYPE,FIFO_TYPE_SIZE)
+        return self.getField(FIFO_TYPE_FIELD)
 
     # FIFO_STATUS
     def getFIFO_Status(self):
-        return self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_FIFO_STATUS,1)[0]
+        return self.readRegister(ADXL345_FIFO_STATUS)
 
     def fifoDataAvailable(self) :
         return (self.getFIFO_Entries() > 0)
     
     def getFIFO_Entries(self):
-        return self.getBits(ADXL345_FIFO_STATUS,FIFO_ENTRIES,FIFO_ENTRIES_SIZE)
+        return self.getField(FIFO_ENTRIES_FIELD)
 
     def getFIFO_Trigger(self):
         return self.getBit(ADXL345_FIFO_STATUS,FIFO_TRIG)
@@ -657,7 +759,7 @@ class ADXL345(object):
         measBit = self.getMeasure()
         self.setMeasure(False)
         while self.getFIFO_Entries() != 0 :
-            trash = self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_DATAAX0,6)
+            self.regio.readInto(ADXL345_DATAAX0,self.accelBuf)
         if self.debug :
             print("FIFO successfully cleared")
         self.setMeasure(measBit)
@@ -671,21 +773,54 @@ class ADXL345(object):
                 print("Overrun Error")
                 self.clearFIFO()
             return self.getAccelerometerData()
+
+    def drainFIFO(self,buf,start=0) :
+        # Reads all samples available in the FIFO into buf, which must be preallocated.
+        # buf is either an array('h') (3 values per sample) or a bytearray (6 bytes per sample)
+        # The samples are stored from sample number start on, such that successive drains
+        # can fill one contiguous buffer
+        # FIFO_STATUS is read only once and every sample costs a single 6 byte burst into a
+        # preallocated sample buffer, from which the values are copied: nothing is allocated.
+        # The samples are copied as they come from the adxl345 (little endian 16 bit) which
+        # is the native byte order on the ESP32, so no decoding and no tuples are needed
+        # returns the number of samples read and an overrun flag: the FIFO was full (33 entries,
+        # 32 in the FIFO and one in the data registers), new samples may have replaced unread ones
+        self.regio.readInto(ADXL345_FIFO_STATUS,self.fifoStatus)
+        entries = self.fifoStatus[0] & FIFO_ENTRIES_MASK
+        overrun = entries > ADXL345_FIFO_SIZE
+        if type(buf) is array :
+            step = 3
+            sample = self.drainSample
+        else :
+            step = ADXL345_SAMPLE_SIZE
+            sample = self.accelBuf
+        samples = len(buf) // step - start
+        if samples < 0 :
+            samples = 0
+        if entries < samples :
+            samples = entries
+        regio = self.regio
+        index = start * step
+        for _ in range(samples) :
+            regio.readInto(ADXL345_DATAAX0,sample)
+            for j in range(step) :
+                buf[index] = sample[j]
+                index += 1
+        if self.debug :
+            print("drainFIFO: {:d} entries, {:d} read, overrun: {}".format(entries,samples,overrun))
+        return samples,overrun
         
     # Accelerometer data registers
-    def getAccelerometerData(self) :
-        tmp = self.i2c.readfrom_mem(self.adxl345_addr,ADXL345_DATAAX0,6)
-        raw = bytearray(2)
-        raw[0] = tmp[1]
-        raw[1] = tmp[0]
-        ax = self.bytesToInt(raw)
-        raw[0] = tmp[3]
-        raw[1] = tmp[2]
-        ay = self.bytesToInt(raw)
-        raw[0] = tmp[5]
-        raw[1] = tmp[4]
-        az = self.bytesToInt(raw)
-        return(ax,ay,az)
+    def getAccelerometerData(self,out=None) :
+        # returns the raw acceleration values (ax,ay,az)
+        # The adxl345 delivers little endian 16 bit values, the native byte order of the ESP32.
+        # If out, an array('h') of 3 values, is given, the data are read straight into it
+        # and nothing at all is allocated. This is the mode to use for high data rates.
+        if out is not None :
+            self.regio.readInto(ADXL345_DATAAX0,out)
+            return out
+        self.regio.readInto(ADXL345_DATAAX0,self.accelBuf)
+        return unpack_from('<hhh',self.accelBuf)
 
     # get physical values
     def AccelerometerPhysical(self) :
@@ -0,0 +1,160 @@
+# adxl345_acquisition.py: interrupt driven acquisition engine for the adxl345
+# The FIFO runs in stream mode. When it holds watermark samples the adxl345 raises its
+# watermark interrupt, the interrupt handler schedules a drain, and the drain reads the
+# whole FIFO into a ring buffer. The main program pulls fixed size blocks from the ring
+# buffer whenever it likes, as long as it keeps up on average.
+# The activity and inactivity flags are latched by the adxl345 and collected at each drain,
+# so that the main program can wait for a gesture without touching the I2C bus.
+#
+# Typical use:
+#     acq = ADXL345Acquisition(adxl345,intPin=18,watermark=16)
+#     acq.start()
+#     block = array('h',[0]*3*16)
+#     while True:
+#         if acq.readBlock(block) :
+#             ...
+#         else :
+#             sleep_ms(10)
+#
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+#
+
+from machine import Pin
+from micropython import const, schedule
+from array import array
+
+from adxl345_const import *
+from ringbuffer import RingBuffer
+
+ADXL345_MAX_DRAINS  = const(4)     # max FIFO reads per scheduled drain
+
+class ADXL345Acquisition(object) :
+
+    def __init__(self,adxl345,intPin=18,intLine=2,watermark=16,capacity=512,events=True,timestamps=False) :
+        # adxl345:   the ADXL345 object
+        # intPin:    the ESP32 pin connected to the adxl345 interrupt line
+        # intLine:   the adxl345 interrupt line (1 or 2) the watermark and overrun interrupts are mapped to
+        # watermark: number of FIFO entries raising the watermark interrupt (1..31)
+        # capacity:  number of samples kept in the ring buffer
+        # events:    collect the activity and inactivity flags at each drain
+        # timestamps: keep the ticks_us() time of each sample in the ring buffer
+        if watermark < 1 or watermark >= ADXL345_FIFO_SIZE :
+            raise ValueError("watermark must be between 1 and {:d}".format(ADXL345_FIFO_SIZE-1))
+        self.adxl345 = adxl345
+        self.pin = Pin(intPin,Pin.IN)
+        self.intLine = intLine
+        self.watermark = watermark
+        self.collectEvents = events
+        # one drain reads at most the 32 FIFO slots + the sample in the data registers
+        self.chunk = array('h',[0]*3*(ADXL345_FIFO_SIZE+1))
+        self.ring = RingBuffer(capacity,3,timestamps)
+        self.period = 0               # us between 2 samples, to timestamp the samples of a drain
+        self.pending = False          # a drain has been scheduled
+        self.events = 0               # INT_SOURCE bits collected since the last getEvents()
+        self.running = False
+        # statistics
+        self.drains = 0
+        self.overruns = 0             # the FIFO overflowed before it was drained
+        # allocate the bound methods once: the interrupt handler must not allocate memory
+        self.drainRef = self.drain
+        self.irqRef = self.irq
+
+    def start(self) :
+        # configure the FIFO and the interrupts, then start the measurement
+        adxl = self.adxl345
+        mapping = self.intLine == 2
+        with adxl.configure() :
+            adxl.setMeasure(False)
+            adxl.setFIFOMode(MODE_STREAM)
+            adxl.setSamples(self.watermark)
+            adxl.setWatermarkMapping(mapping)
+            adxl.setOverrunMapping(mapping)
+            adxl.setWatermarkIntEnable(True)
+            adxl.setOverrunIntEnable(True)
+        adxl.clearFIFO()
+        adxl.getInterruptSource()        # clear the latched interrupt flags
+        self.ring.discard()
+        # output data rate: 3200 Hz / 2**(RATE_3200 - rate code)
+        self.period = (625 << (RATE_3200 - adxl.getDataRate())) // 2
+        self.events = 0
+        self.pending = False
+        self.running = True
+        self.pin.irq(trigger=Pin.IRQ_RISING,handler=self.irqRef)
+        adxl.setMeasure(True)
+
+    def stop(self) :
+        self.running = False
+        self.pin.irq(handler=None)
+        adxl = self.adxl345
+        with adxl.configure() :
+            adxl.setMeasure(False)
+            adxl.setWatermarkIntEnable(False)
+            adxl.setOverrunIntEnable(False)
+
+    def irq(self,pin) :
+        # runs in interrupt context: no I2C, no memory allocation, just schedule the drain
+        if self.pending :
+            return
+        self.pending = True
+        try :
+            schedule(self.drainRef,0)
+        except RuntimeError :             # the schedule queue is full, readBlock() polls the line
+            self.pending = False
+
+    def drain(self,arg=None) :
+        # scheduled by the interrupt handler, runs in the main thread between two bytecodes
+        # May also be called directly, e.g. to poll without interrupts.
+        self.pending = False
+        if not self.running :
+            return 0
+        adxl = self.adxl345
+        total = 0
+        for _ in range(ADXL345_MAX_DRAINS) :
+            n,overrun = adxl.drainFIFO(self.chunk)
+            self.drains += 1
+            if overrun :
+                self.overruns += 1
+            self.store(n)
+            total += n
+            # the watermark interrupt is a level: if the FIFO filled up above the watermark
+            # again while we were reading, there will be no new rising edge
+            if not self.pin.value() :
+                break
+        if self.collectEvents :
+            self.events |= adxl.getInterruptSource()
+        # still above the watermark after ADXL345_MAX_DRAINS reads: the line stays high and
+        # there will be no rising edge, schedule the next drain now
+        if self.pin.value() :
+            self.irq(self.pin)
+        return total
+
+    def store(self,n) :
+        # append n samples from the chunk to the ring buffer, the newest ones are dropped
+        # and counted in ring.overruns if the ring buffer is full
+        self.ring.write_block(self.chunk,n,period=self.period)
+
+    def available(self) :
+        # number of samples in the ring buffer
+        return self.ring.available()
+
+    def readBlock(self,out,samples=None,stamps=None) :
+        # copy the oldest samples into out, an array('h') with 3 values per sample
+        # Returns True if a complete block was copied, False if not enough samples are
+        # available yet, in which case nothing is consumed
+        # If the line is high without a drain pending, the drain could not be scheduled:
+        # drain here, otherwise the acquisition would stop for good
+        if self.running and not self.pending and self.pin.value() :
+            self.drain()
+        return self.ring.read_block(out,samples,stamps)
+
+    def discard(self) :
+        # throw away all samples in the ring buffer
+        self.ring.discard()
+
+    def getEvents(self) :
+        # returns the INT_SOURCE bits (ACTIVITY, INACTIVITY, ...) collected since the last call
+        events = self.events
+        self.events = 0
+        return events
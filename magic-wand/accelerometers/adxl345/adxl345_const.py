@@ -33,6 +33,16 @@ ADXL345_DATAAZ1               = const(0x37)    # Z-Axis Data 1
 ADXL345_FIFO_CTL              = const(0x38)    # FIFO control
 ADXL345_FIFO_STATUS           = const(0x39)    # FIFO status
 
+ADXL345_FIFO_SIZE             = const(32)      # FIFO slots, one more sample waits in the data registers
+ADXL345_SAMPLE_SIZE           = const(6)       # x,y,z, 16 bits each
+
+# Shadow register cache
+ADXL345_SHADOW_SIZE           = const(0x40)    # covers the whole register map
+# configuration registers that only change when we write them
+ADXL345_CACHED_REGISTERS      = tuple(range(ADXL345_THESH_TAP,ADXL345_ACT_TAP_STATUS)) + \
+                                tuple(range(ADXL345_BW_RATE,ADXL345_INT_MAP+1)) + \
+                                (ADXL345_DATA_FORMAT,ADXL345_FIFO_CTL)
+
 # Bit definitions
 
 # ACT_INACT_CTL
@@ -110,6 +120,7 @@ MODE_TRIGGER                  = const(3)
 # FIFO_STATUS
 FIFO_ENTRIES                  = const(5)
 FIFO_ENTRIES_SIZE             = const(6)
+FIFO_ENTRIES_MASK             = const(0x3f)
 FIFO_TRIG                     = const(7)
 
 # Data rates
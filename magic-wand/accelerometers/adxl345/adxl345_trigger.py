@@ -0,0 +1,185 @@
+# adxl345_trigger.py: pre-trigger gesture capture with the adxl345 FIFO in trigger mode
+# While armed, the FIFO runs in trigger mode and always holds the latest samples. The
+# activity interrupt is mapped to the interrupt line selected by the trigger bit: when the
+# activity fires, the adxl345 keeps the last preTrigger samples in the FIFO and continues
+# collecting the samples after the event. Until then the CPU does nothing at all: no polling,
+# no I2C transfer, only the pin interrupt is armed.
+# On the event the FIFO is switched to stream mode with the watermark interrupt on the same
+# line, and the pre- and post-trigger samples are drained into one contiguous gesture buffer
+# until it holds the requested number of samples.
+#
+# Typical use:
+#     capture = ADXL345TriggerCapture(adxl345,intPin=18,preTrigger=25,samples=200)
+#     capture.arm()
+#     while not capture.ready() :
+#         sleep_ms(100)
+#     gesture,n = capture.getGesture()
+#
+# The activity thresholds and axes are set up by the caller. No other interrupt should be
+# mapped to the trigger line, it would trigger the capture as well.
+#
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+#
+
+from machine import Pin
+from micropython import const, schedule
+from array import array
+
+from adxl345_const import *
+
+IDLE      = const(0)
+ARMED     = const(1)              # waiting for the trigger event
+CAPTURING = const(2)              # draining the post-trigger samples
+DONE      = const(3)              # the gesture buffer is complete
+
+ADXL345_MAX_DRAINS = const(4)     # max FIFO reads per scheduled drain
+
+class ADXL345TriggerCapture(object) :
+
+    def __init__(self,adxl345,intPin=18,intLine=2,preTrigger=16,samples=200,watermark=16) :
+        # adxl345:    the ADXL345 object
+        # intPin:     the ESP32 pin connected to the adxl345 interrupt line
+        # intLine:    the adxl345 interrupt line (1 or 2) used as trigger
+        # preTrigger: number of samples kept from before the activity (0..31)
+        # samples:    number of samples in a gesture, pre-trigger samples included
+        # watermark:  FIFO entries raising the watermark interrupt after the event (1..31)
+        if preTrigger < 0 or preTrigger >= ADXL345_FIFO_SIZE :
+            raise ValueError("preTrigger must be between 0 and {:d}".format(ADXL345_FIFO_SIZE-1))
+        if watermark < 1 or watermark >= ADXL345_FIFO_SIZE :
+            raise ValueError("watermark must be between 1 and {:d}".format(ADXL345_FIFO_SIZE-1))
+        if samples <= preTrigger :
+            raise ValueError("samples must be larger than preTrigger")
+        self.adxl345 = adxl345
+        self.pin = Pin(intPin,Pin.IN)
+        self.intLine = intLine
+        self.preTrigger = preTrigger
+        self.samples = samples
+        self.watermark = watermark
+        self.gesture = array('h',[0]*3*samples)
+        self.count = 0                # samples in the gesture buffer
+        self.state = IDLE
+        self.pending = False          # a service call has been scheduled
+        self.fifoStatus = bytearray(1)
+        # statistics
+        self.triggers = 0
+        self.overruns = 0             # samples were lost, the gesture is not contiguous
+        # allocate the bound methods once: the interrupt handler must not allocate memory
+        self.serviceRef = self.service
+        self.irqRef = self.irq
+
+    def arm(self) :
+        # prepare the capture of the next gesture
+        adxl = self.adxl345
+        trigger = self.intLine == 2
+        self.state = IDLE
+        adxl.setMeasure(False)
+        # going through bypass mode empties the FIFO and re-arms the trigger
+        adxl.setFIFOMode(MODE_BYPASS)
+        with adxl.configure() :
+            adxl.setWatermarkIntEnable(False)
+            adxl.setOverrunIntEnable(False)
+            adxl.setActivityMapping(trigger)
+            adxl.setActivityIntEnable(True)
+            adxl.setFIFO_Ctl(MODE_TRIGGER << (FIFO_TYPE-1) | trigger << TRIGGER | self.preTrigger)
+        adxl.getInterruptSource()        # clear the latched interrupt flags
+        self.count = 0
+        self.overruns = 0
+        self.pending = False
+        self.state = ARMED
+        self.pin.irq(trigger=Pin.IRQ_RISING,handler=self.irqRef)
+        adxl.setMeasure(True)
+
+    def disarm(self) :
+        self.state = IDLE
+        self.pin.irq(handler=None)
+        adxl = self.adxl345
+        with adxl.configure() :
+            adxl.setMeasure(False)
+            adxl.setActivityIntEnable(False)
+            adxl.setWatermarkIntEnable(False)
+        adxl.setFIFOMode(MODE_BYPASS)
+
+    def irq(self,pin) :
+        # runs in interrupt context: no I2C, no memory allocation, just schedule the service
+        if self.pending :
+            return
+        self.pending = True
+        try :
+            schedule(self.serviceRef,0)
+        except RuntimeError :             # the schedule queue is full, ready() polls the line
+            self.pending = False
+
+    def service(self,arg=None) :
+        # scheduled by the interrupt handler, runs in the main thread between two bytecodes
+        self.pending = False
+        if self.state == ARMED :
+            if not self.triggerEvent() :
+                return
+        if self.state != CAPTURING :
+            return
+        adxl = self.adxl345
+        for _ in range(ADXL345_MAX_DRAINS) :
+            n,overrun = adxl.drainFIFO(self.gesture,self.count)
+            if overrun :
+                self.overruns += 1
+            self.count += n
+            if self.count >= self.samples :
+                self.finish()
+                return
+            # the watermark interrupt is a level: if the FIFO filled up above the watermark
+            # again while we were reading, there will be no new rising edge
+            if not self.pin.value() :
+                break
+        # still above the watermark after ADXL345_MAX_DRAINS reads: the line stays high and
+        # there will be no rising edge, schedule the next service now
+        if self.pin.value() :
+            self.irq(self.pin)
+
+    def triggerEvent(self) :
+        # the interrupt line went up while armed: check that the FIFO has seen the trigger,
+        # then switch to stream mode before the FIFO fills up and stops collecting
+        adxl = self.adxl345
+        adxl.regio.readInto(ADXL345_FIFO_STATUS,self.fifoStatus)
+        if not self.fifoStatus[0] & (1 << FIFO_TRIG) :
+            adxl.getInterruptSource()
+            return False
+        trigger = self.intLine == 2
+        adxl.setFIFO_Ctl(MODE_STREAM << (FIFO_TYPE-1) | trigger << TRIGGER | self.watermark)
+        with adxl.configure() :
+            adxl.setActivityIntEnable(False)
+            adxl.setWatermarkMapping(trigger)
+            adxl.setWatermarkIntEnable(True)
+        adxl.getInterruptSource()        # release the latched activity
+        self.triggers += 1
+        self.state = CAPTURING
+        return True
+
+    def finish(self) :
+        # the gesture buffer is complete: stop the FIFO until the next arm()
+        self.state = DONE
+        self.pin.irq(handler=None)
+        adxl = self.adxl345
+        with adxl.configure() :
+            adxl.setMeasure(False)
+            adxl.setWatermarkIntEnable(False)
+        adxl.setFIFOMode(MODE_BYPASS)
+
+    def ready(self) :
+        # True once a complete gesture has been captured
+        # If the line is high without a service pending, the service could not be scheduled:
+        # run it here, otherwise the capture would stop for good
+        if (self.state == ARMED or self.state == CAPTURING) and not self.pending and self.pin.value() :
+            self.service()
+        return self.state == DONE
+
+    def triggered(self) :
+        # True once the trigger event has been seen
+        return self.state >= CAPTURING
+
+    def getGesture(self) :
+        # returns the gesture buffer, an array('h') with 3 values per sample, and the
+        # number of samples in it. The first preTrigger samples precede the activity
+        # (fewer if the activity came less than preTrigger samples after arm())
+        return self.gesture,self.count
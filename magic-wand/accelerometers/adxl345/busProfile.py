@@ -0,0 +1,35 @@
+# busProfile.py: shows where the bus time goes when setting up the adxl345 and reading
+# its FIFO, with and without the register cache
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+#
+
+from utime import sleep_ms
+from array import array
+
+from adxl345_const import *
+from adxl345 import ADXL345
+from busprofiler import BusProfiler
+
+def setup(adxl345):
+    adxl345.setLowPower(0)
+    adxl345.setDataRate(RATE_100)
+    adxl345.setRange(ACCEL_2G)
+    adxl345.setFullRes(True)
+    adxl345.setFIFOMode(MODE_STREAM)
+    adxl345.setMeasure(True)
+
+samples = array('h',[0]*3*ADXL345_FIFO_SIZE)
+
+for cache in (False,True):
+    adxl345 = ADXL345(cache=cache)
+    profiler = BusProfiler(adxl345)
+    with profiler:
+        setup(adxl345)
+        for _ in range(10):
+            sleep_ms(100)
+            adxl345.drainFIFO(samples)
+    print("register cache: {:s}".format(str(cache)))
+    profiler.report()
+    print()
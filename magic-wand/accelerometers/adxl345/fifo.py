@@ -1,5 +1,7 @@
 # adxl345FIFO.py: Initializes the adxl345 Accelerometer and reads the acceleration
 # on the 3 axis using the FIFO
+# The FIFO is emptied in a single call to drainFIFO, which allows data rates
+# well above the 25 Hz we can reach when reading the samples one by one
 # Copyright (c) U. Raich March 2022
 # This program is part of a course on machine learning at the University of Cape Coast,Ghana
 # It is released under the MIT license
@@ -7,25 +9,26 @@
 
 from machine import Pin,I2C
 from micropython import const
-from utime import sleep_ms, sleep
+from utime import sleep_ms, sleep, ticks_ms, ticks_diff
 from micropython import const
+from array import array
 
 from adxl345_const import *
 from adxl345 import ADXL345
-import random
 
 adxl345 = ADXL345(debug=False)
 
+# room for a full FIFO: 32 slots + the sample in the data registers, 3 values each
+samples = array('h',[0]*3*(ADXL345_FIFO_SIZE+1))
+
 # set low power to 0 to use normal operation
 adxl345.setLowPower(0)
-# set rate to 25 Hz (max for 400 kHz I2C bus frequency)
-adxl345.setDataRate(RATE_25)
+# set rate to 400 Hz
+adxl345.setDataRate(RATE_400)
 # Set the range to 2g
 adxl345.setRange(ACCEL_2G)
-# set FIFO mode to "FIFO"
-adxl345.setFIFOMode(MODE_FIFO)
-# set the watermark to 1
-adxl345.setSamples(1)
+# set FIFO mode to "stream", the FIFO keeps the latest 32 samples
+adxl345.setFIFOMode(MODE_STREAM)
 # make sure the fifo is empty
 adxl345.clearFIFO()
 # start the measurement
@@ -33,9 +36,18 @@ adxl345.setMeasure(True)
 
 print("Reading data from fifo")
 
+total = 0
+overruns = 0
+startTime = ticks_ms()
 while True:
-    # data.append(adxl345.getFIFO_Data())
-    data = adxl345.getFIFO_Data()
-    if data:
-        print("x: {:d} y: {:d} z: {:d}".format(data[0],data[1],data[2]))
-
+    n,overrun = adxl345.drainFIFO(samples)
+    total += n
+    if overrun :
+        overruns += 1
+    if ticks_diff(ticks_ms(),startTime) >= 1000 :
+        print("{:d} samples/s, overruns: {:d}, last: x: {:d} y: {:d} z: {:d}".format(
+            total,overruns,samples[0],samples[1],samples[2]))
+        total = 0
+        overruns = 0
+        startTime = ticks_ms()
+    sleep_ms(20)
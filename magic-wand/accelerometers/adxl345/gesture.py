@@ -10,28 +10,48 @@ from micropython import const
 from utime import sleep_ms, sleep
 from micropython import const
 
+from array import array
+import sys
+
 from adxl345_const import *
 from adxl345 import ADXL345
+from adxl345_acquisition import ADXL345Acquisition
+from adxl345_trigger import ADXL345TriggerCapture
+from ringbuffer import RingBuffer
+from segmenter import Segmenter
+from gestureformat import LABELS, writeFrame
 import random
 
-adxl345 = ADXL345(debug=False)
+# keep a shadow copy of the configuration registers: the setup below needs no register reads
+adxl345 = ADXL345(debug=False,cache=True)
 
 AX = const(0)
 AY = const(1)
 AZ = const(2)
 LOOPS = const(100)
 AVERAGE = const(10)
-
-types = {0: "zero",
-         1: "one",
-         2: "two",
-         3: "three",
-         4: "four",
-         5: "five",
-         6: "six",
-         7: "seven",
-         8: "eight",
-         9: "nine"}
+BLOCK = const(16)        # samples per block, the watermark interrupt fires every 160 ms at 100 Hz
+INT2_PIN = const(18)     # the adxl345 INT2 line, connected as in gestureInt.py
+MAX_GESTURE = const(500) # max number of samples in a gesture, 5 s at 100 Hz
+RATE = const(100)        # sample rate in Hz
+PRE_TRIGGER = const(25)  # samples kept from before the activity or the segmenter detection
+TRIGGER_SAMPLES = const(200) # samples in a triggered gesture, pre-trigger samples included
+# True: each gesture is sent as a binary frame, see gestureformat.py
+# False: the old text dump "ax,ay,az,<label>", one line per sample, "end"
+BINARY = True
+# How the gestures are found:
+# TRIGGER_CAPTURE:  fixed length gestures captured with the FIFO in trigger mode, including
+#                   the samples before the activity was detected, see adxl345_trigger.py
+# SEGMENT_CAPTURE:  the segmenter finds start and end in the sample stream from the variance
+#                   of the acceleration, as it would for any accelerometer, see segmenter.py
+# ACTIVITY_CAPTURE: from the activity to the inactivity flag of the adxl345, without the
+#                   very beginning of the gesture
+TRIGGER_CAPTURE = const(0)
+SEGMENT_CAPTURE = const(1)
+ACTIVITY_CAPTURE = const(2)
+CAPTURE = TRIGGER_CAPTURE
+START_THRESHOLD = const(4096) # variance starting a gesture, (0.25 g)**2 at 256 LSB/g
+STOP_THRESHOLD = const(1024)  # variance ending it, (0.125 g)**2
 
 # set low power to 0 to use normal operation
 adxl345.setLowPower(0)
@@ -99,52 +119,122 @@ adxl345.setInactivityIntEnable(True)
 print("Interrupt enable register: 0x{:02x}".format(
     adxl345.getInterruptEnable()))
 
-# adxl345.setDebug(True)
-# while True:
-    # print("activity: ",adxl345.getActivitySource())
-    # print("inactivity: ",adxl345.getInactivitySource())
-# Set the interrupt enable 
-# Read the activity bit in the INT_SOURCE register
+def newGesture():
+    label = random.randint(0,9)
+    print("Waiting for activity")
+    print("Please create gesture for ",LABELS[label])
+    return label
+
+def sendGesture(label,buf,n):
+    # buf: array('h') holding n samples
+    if BINARY:
+        writeFrame(sys.stdout.buffer,label,RATE,buf,n)
+    else:
+        print("ax,ay,az," + LABELS[label])
+        for i in range(0,3*n,3):
+            print("{:4d}, {:4d}, {:4d}".format(buf[i+AX],buf[i+AY],buf[i+AZ]))
+        print("end")
+
+if CAPTURE == TRIGGER_CAPTURE:
+    # The FIFO keeps the latest samples in trigger mode and the activity interrupt triggers
+    # it: the CPU only sleeps until the gesture buffer is complete
+    capture = ADXL345TriggerCapture(adxl345,intPin=INT2_PIN,preTrigger=PRE_TRIGGER,
+                                    samples=TRIGGER_SAMPLES)
+    while True:
+        label = newGesture()
+        capture.arm()
+        while not capture.ready():
+            sleep_ms(100)
+        print("Activity seen")
+        gesture,n = capture.getGesture()
+        if capture.overruns:
+            print("FIFO overrun, samples lost")
+        sendGesture(label,gesture,n)
+        print("Please reposition accelerometer")
+        sleep(3) # time to reposition the accelerometer
+
+# The acquisition engine drains the FIFO on the watermark interrupt and collects the
+# activity and inactivity flags at the same time: the loops below only sleep until the
+# next block of samples is available, without polling the adxl345
+acq = ADXL345Acquisition(adxl345,intPin=INT2_PIN,watermark=BLOCK,events=CAPTURE == ACTIVITY_CAPTURE)
+block = array('h',[0]*3*BLOCK)
+gesture = array('h',[0]*3*MAX_GESTURE)
+
+if CAPTURE == SEGMENT_CAPTURE:
+    # The ring buffer keeps the samples the segmenter may include in the next gesture:
+    # the pre-roll while waiting, everything from the start of the gesture on while it lasts
+    segmenter = Segmenter(startThreshold=START_THRESHOLD,stopThreshold=STOP_THRESHOLD,
+                          preRoll=PRE_TRIGGER,maxLength=MAX_GESTURE)
+    data = RingBuffer(MAX_GESTURE+BLOCK,3)
+    acq.start()
+    label = newGesture()
+    while True:
+        if not acq.readBlock(block):
+            sleep_ms(BLOCK*10 // 2)   # wait for the next watermark interrupt
+            continue
+        data.write_block(block)
+        if not segmenter.feed(block):
+            excess = data.available() - segmenter.preRoll
+            if not segmenter.active and excess > 0:
+                data.discard(excess)
+            continue
+        start,end = segmenter.getSegment()
+        # index of the oldest sample in the ring buffer
+        first = segmenter.index - data.available()
+        if start > first:
+            data.discard(start - first)
+        n = end - max(start,first)
+        data.read_block(gesture,n)
+        print("Gesture seen")
+        sendGesture(label,gesture,n)
+        print("Please reposition accelerometer")
+        sleep(3) # time to reposition the accelerometer
+        acq.discard()
+        data.discard()
+        segmenter.reset()
+        label = newGesture()
+
+# the gesture is collected in a preallocated buffer, nothing is allocated during the capture
+data = RingBuffer(MAX_GESTURE,3)
+acq.start()
+
 activityFlag = False
 nextGesture  = False 
 # Now read the acceleration values
 
-data = []
-
 while True:
 
     if not nextGesture:
-        gtype = types[random.randint(0,9)]
-        print("Waiting for activity")
-        print("Please create gesture for ",gtype)
+        label = newGesture()
         nextGesture = True
-        
+
+    if not acq.readBlock(block):
+        sleep_ms(BLOCK*10 // 2)   # wait for the next watermark interrupt
+        continue
+    events = acq.getEvents()
+
     if activityFlag:
-        accel = adxl345.getAccelerometerData()
-        data.append(accel[AX])
-        data.append(accel[AY])
-        data.append(accel[AZ])
+        data.write_block(block)
 
-        if adxl345.getInactivitySource():  # inactivity seen save the acquired data
+        if events & (1 << INACTIVITY):  # inactivity seen save the acquired data
             activityFlag = False
             print("Inactivity seen")
-            print("ax,ay,az," + gtype)
-            for i in range(0,len(data),3):
-                print("{:4d}, {:4d}, {:4d}".format(data[i+AX],data[i+AY],data[i+AZ]))
-            print("end")
+            if data.overruns:
+                print("Gesture too long, {:d} samples lost".format(data.overruns))
+            n = data.available()
+            data.read_block(gesture,n)
+            sendGesture(label,gesture,n)
             nextGesture = False
             
             print("Please reposition accelerometer")
             sleep(3) # time to reposition the accelerometer
-            adxl345.getActivitySource()
+            acq.discard()
+            acq.getEvents()
             
     else:
-        # print("Interrupt source register: 0x{:02x}".format(adxl345.getInterruptSource()))
-        if adxl345.getActivitySource() :
+        if events & (1 << ACTIVITY) :
             print("Activity seen")
             activityFlag = True           
-            data = []
-
-
-    
-
+            data.discard()
+            data.overruns = 0
+            data.write_block(block)
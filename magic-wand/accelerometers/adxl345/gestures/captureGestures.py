@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+# captureGestures.py: records the gestures sent by gesture.py as binary frames
+# (see common/gestureformat.py) into a single append-only, indexed dataset file
+# (see common/gesturedataset.py, needs NumPy)
+# Replaces getGestures.py: the serial line is read in large chunks, the frames are
+# decoded incrementally, whatever the chunk boundaries, and the prints of the program
+# running on the ESP32 are passed through.
+#
+# usage: captureGestures.py [-p port] [-b baud] [-o dataset] [-j journal] [-s program] [-r seconds] [-q]
+#   -p: serial port, pty or file to read from, "-" for stdin (default /dev/ttyACM0)
+#   -b: baud rate of the serial port (default 115200)
+#   -o: dataset the gestures are appended to, created if needed (default gestures.gsd)
+#   -j: also append the frames as received to a journal, a plain file of frames without index.
+#       It can be imported again with: python3 gesturedataset.py convert dataset journal
+#   -s: program started on the ESP32 with an import (default gesture), "" to start nothing
+#   -r: print the statistics every seconds (default 10)
+#   -q: do not pass through the prints of the ESP32
+#
+# The statistics give the frames and samples received, the sample throughput, the frames
+# dropped because of a CRC error or of an invalid or oversized header, the frames not recorded
+# because their number of channels differs from the dataset's, and the bytes received outside
+# of frames.
+#
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+
+import os
+import sys
+import time
+import getopt
+import select
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),"..","..","common"))
+from gestureformat import FrameDecoder
+from gesturedataset import GestureDataset
+
+CHUNK_SIZE = 65536
+READ_TIMEOUT = 0.1
+
+def usage():
+    print("usage: captureGestures.py [-p port] [-b baud] [-o dataset] [-j journal] [-s program] [-r seconds] [-q]")
+    sys.exit(1)
+
+class Source:
+    '''
+    The byte stream: a serial port (pyserial if installed, termios otherwise), a pty,
+    a file or stdin. read() returns what is available, up to CHUNK_SIZE bytes, b"" at the end
+    of a file or after READ_TIMEOUT s without data on a serial port
+    '''
+    def __init__(self,port,baud):
+        self.serial = None
+        self.fd = None
+        self.eof = True                    # files and stdin end, serial ports do not
+        if port == "-":
+            self.fd = sys.stdin.fileno()
+        elif os.path.isfile(port):
+            self.fd = os.open(port,os.O_RDONLY)
+        else:
+            self.eof = False
+            try:
+                import serial
+                self.serial = serial.Serial(port,baud,timeout=READ_TIMEOUT)
+            except ImportError:
+                self.fd = self.openTTY(port,baud)
+
+    @staticmethod
+    def openTTY(port,baud):
+        import termios
+        import tty
+        fd = os.open(port,os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(fd)
+        speed = getattr(termios,"B{:d}".format(baud),None)
+        if speed is not None:
+            attrs = termios.tcgetattr(fd)
+            attrs[4] = attrs[5] = speed
+            termios.tcsetattr(fd,termios.TCSANOW,attrs)
+        return fd
+
+    def read(self):
+        if self.serial is not None:
+            return self.serial.read(max(1,min(self.serial.in_waiting,CHUNK_SIZE)))
+        if not self.eof and not select.select([self.fd],[],[],READ_TIMEOUT)[0]:
+            return b""
+        return os.read(self.fd,CHUNK_SIZE)
+
+    def write(self,data):
+        if self.serial is not None:
+            self.serial.write(data)
+        elif not self.eof:
+            os.write(self.fd,data)
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+        elif self.fd is not None and self.fd != sys.stdin.fileno():
+            os.close(self.fd)
+
+class Recording:
+    '''
+    The gestures are appended to the dataset, which is created with the number of channels
+    of the first frame. Frames with another number of channels than the dataset are counted
+    in dropped and not recorded. The journal, if any, gets the frames as received
+    '''
+    def __init__(self,filename,journal=None):
+        self.filename = filename
+        self.dataset = None
+        self.journal = None
+        self.dropped = 0
+        if journal is not None:
+            self.journal = open(journal,"ab")
+
+    def append(self,frame):
+        if self.journal is not None:
+            self.journal.write(frame.toBytes())
+            self.journal.flush()
+        if self.dataset is None:
+            self.dataset = GestureDataset.open(self.filename,frame.channels)
+        if frame.channels != self.dataset.channels:
+            self.dropped += 1
+            return False
+        self.dataset.append(frame.data,frame.label,frame.rate)
+        return True
+
+    def close(self):
+        if self.dataset is not None:
+            self.dataset.close()
+        if self.journal is not None:
+            self.journal.close()
+
+class Statistics:
+
+    def __init__(self,decoder,recording):
+        self.decoder = decoder
+        self.recording = recording
+        self.start = time.monotonic()
+        self.last = self.start
+        self.bytes = 0
+        self.samples = 0
+        self.lastSamples = 0
+
+    def frame(self,frame):
+        self.samples += frame.count
+
+    def report(self,final=False):
+        now = time.monotonic()
+        total = now - self.start
+        interval = now - self.last
+        rate = (self.samples - self.lastSamples) / interval if interval > 0 else 0
+        average = self.samples / total if total > 0 else 0
+        print("[{:s}] {:d} frames, {:d} samples, {:.0f} samples/s ({:.0f} average), {:.0f} bytes/s, "
+              "dropped frames (CRC/header/channels): {:d}/{:d}/{:d}, bytes outside of frames: {:d}".format(
+                  "total" if final else "capture",self.decoder.frames,self.samples,rate,average,
+                  self.bytes / total if total > 0 else 0,self.decoder.crcErrors,
+                  self.decoder.badHeaders,self.recording.dropped,self.decoder.skipped),
+              file=sys.stderr)
+        self.last = now
+        self.lastSamples = self.samples
+
+def main(argv):
+    port = "/dev/ttyACM0"
+    baud = 115200
+    filename = "gestures.gsd"
+    journal = None
+    program = "gesture"
+    interval = 10.0
+    quiet = False
+    try:
+        opts,args = getopt.getopt(argv,"p:b:o:j:s:r:q")
+    except getopt.GetoptError:
+        usage()
+    for opt,arg in opts:
+        if opt == "-p":
+            port = arg
+        elif opt == "-b":
+            baud = int(arg)
+        elif opt == "-o":
+            filename = arg
+        elif opt == "-j":
+            journal = arg
+        elif opt == "-s":
+            program = arg
+        elif opt == "-r":
+            interval = float(arg)
+        elif opt == "-q":
+            quiet = True
+
+    try:
+        source = Source(port,baud)
+    except OSError as error:
+        print("Could not open {:s}: {:s}. Is your ESP32 connected?".format(port,str(error)))
+        sys.exit(1)
+
+    if quiet:
+        text = None
+    else:
+        out = sys.stdout.buffer
+        def text(data):
+            out.write(data)
+            out.flush()
+    decoder = FrameDecoder(text=text)
+    recording = Recording(filename,journal)
+    stats = Statistics(decoder,recording)
+
+    # start the program on the ESP32
+    if program and not source.eof:
+        source.write(bytes("\r\nimport {:s}\r\n".format(program),"ascii"))
+
+    try:
+        while True:
+            data = source.read()
+            if not data and source.eof:
+                break
+            stats.bytes += len(data)
+            for frame in decoder.feed(data):
+                if not recording.append(frame):
+                    print("Gesture {:s} dropped: {:d} channels, the dataset has {:d}".format(
+                        frame.name,frame.channels,recording.dataset.channels),file=sys.stderr)
+                    continue
+                stats.frame(frame)
+                if not quiet:
+                    print("Gesture {:s}: {:d} samples at {:d} Hz".format(frame.name,frame.count,frame.rate),
+                          file=sys.stderr)
+            if interval and time.monotonic() - stats.last >= interval:
+                stats.report()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recording.close()
+        source.close()
+    stats.report(True)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -9,9 +9,11 @@ from machine import Pin,I2C
 from micropython import const
 from utime import sleep_ms,ticks_ms
 from micropython import const
+from array import array
 
 from adxl345_const import *
 from adxl345 import ADXL345
+from ringbuffer import RingBuffer
 
 adxl345 = ADXL345(debug=False)
 
@@ -66,22 +68,23 @@ adxl345.setZOffset(offsets[AZ])
 
 # Read accel values for 5s. Do not move the accelerometer during this time
 print("Starting measurement")
-print("Data ready: {}".format(adxl345.getDataReady()))
+print("Data ready: {}".format(adxl345.getDataReadySource()))
 startTime = ticks_ms()
-data = [0]*25*3*5
+# preallocated sample storage: no boxed ints, no list reallocations during the measurement
+data = RingBuffer(25*5,3)
+accel = array('h',[0]*3)
 for i in range(5*25):
-    if adxl345.getDataReady():
-        accel = adxl345.getAccelerometerData()
-        data[3*i+AX] = accel[AX]
-        data[3*i+AY] = accel[AY]
-        data[3*i+AZ] = accel[AZ]
+    while not adxl345.getDataReadySource():   # wait for the next sample
+        pass
+    adxl345.getAccelerometerData(accel)
+    data.write_block(accel)
 
 duration = (ticks_ms() - startTime)/1000
 print("Duration of measurement: {:.2f}s".format(duration))
 print("Ready, saving the data to accel.dat")
 
 f = open("accel.dat","w")
-for i in range(25*5):
-    f.write("{:04x}, {:04x}, {:04x}\n".format(data[3*i+AX],data[3*i+AY],data[3*i+AZ]))
+while data.read_block(accel):
+    f.write("{:04x}, {:04x}, {:04x}\n".format(accel[AX],accel[AY],accel[AZ]))
 f.close()
 print("Done")
@@ -13,7 +13,8 @@ from micropython import const
 from adxl345_const import *
 from adxl345 import ADXL345
 
-adxl345 = ADXL345(debug=False)
+# keep a shadow copy of the configuration registers: the setup below needs no register reads
+adxl345 = ADXL345(debug=False,cache=True)
 
 AX = const(0)
 AY = const(1)
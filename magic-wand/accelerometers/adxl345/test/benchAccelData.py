@@ -0,0 +1,78 @@
+# benchAccelData.py: compares the execution time and the memory allocated by
+# the different ways of reading the acceleration data from the adxl345
+#   - legacy: readfrom_mem, byte swapping and bytesToInt (the original implementation)
+#   - tuple:  readfrom_mem_into a preallocated buffer and unpack_from('<hhh')
+#   - array:  readfrom_mem_into a caller supplied array('h'), no allocation at all
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+#
+
+from micropython import const
+from utime import ticks_us, ticks_diff
+from array import array
+import gc
+
+from adxl345_const import *
+from adxl345 import ADXL345
+
+LOOPS = const(1000)
+# gc.mem_free() only exists on MicroPython: on the host simulator only the time is measured
+MEM_FREE = hasattr(gc,"mem_free")
+
+adxl345 = ADXL345(debug=False)
+adxl345.setDataRate(RATE_800)
+adxl345.setMeasure(1)
+
+# the original decoding, kept here as reference
+def legacyAccelerometerData() :
+    tmp = adxl345.i2c.readfrom_mem(adxl345.adxl345_addr,ADXL345_DATAAX0,6)
+    raw = bytearray(2)
+    raw[0] = tmp[1]
+    raw[1] = tmp[0]
+    ax = adxl345.bytesToInt(raw)
+    raw[0] = tmp[3]
+    raw[1] = tmp[2]
+    ay = adxl345.bytesToInt(raw)
+    raw[0] = tmp[5]
+    raw[1] = tmp[4]
+    az = adxl345.bytesToInt(raw)
+    return(ax,ay,az)
+
+def tupleAccelerometerData() :
+    return adxl345.getAccelerometerData()
+
+out = array('h',[0,0,0])
+def arrayAccelerometerData() :
+    return adxl345.getAccelerometerData(out)
+
+def bench(name,readout) :
+    readout()                      # warm up
+    gc.collect()
+    gc.disable()                   # we want to see the allocated memory, not the GC at work
+    if MEM_FREE :
+        memBefore = gc.mem_free()
+    start = ticks_us()
+    for _ in range(LOOPS) :
+        readout()
+    elapsed = ticks_diff(ticks_us(),start)
+    if MEM_FREE :
+        allocated = memBefore - gc.mem_free()
+    gc.enable()
+    if MEM_FREE :
+        print("{:8s}: {:6.1f} us per call, {:6.1f} bytes allocated per call".format(
+            name,elapsed/LOOPS,allocated/LOOPS))
+    else :
+        print("{:8s}: {:6.1f} us per call".format(name,elapsed/LOOPS))
+
+data = legacyAccelerometerData()
+print("legacy: x: {:d} y: {:d} z: {:d}".format(data[0],data[1],data[2]))
+data = tupleAccelerometerData()
+print("tuple:  x: {:d} y: {:d} z: {:d}".format(data[0],data[1],data[2]))
+data = arrayAccelerometerData()
+print("array:  x: {:d} y: {:d} z: {:d}".format(data[0],data[1],data[2]))
+
+print("Reading the acceleration {:d} times".format(LOOPS))
+bench("legacy",legacyAccelerometerData)
+bench("tuple",tupleAccelerometerData)
+bench("array",arrayAccelerometerData)
@@ -0,0 +1,284 @@
+'''!
+busprofiler.py: bus transaction profiler for the ADXL345, LIS3DH and MPU6050 drivers
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+A BusProfiler is put between a driver and its bus transport. While it is enabled it counts
+- the transfers, bytes and bus time per register address,
+- the calls, transfers, bytes, bus time and call time per public driver method.
+  A transfer is charged to the outermost driver method in progress: setDataRate() gets
+  the register reads and writes of the setBits() it calls,
+- the latency of each transfer and of each method call in ticks_us() histograms with
+  power of 2 buckets: bucket 0 holds 0 us, bucket i the latencies from 2**(i-1) to 2**i - 1 us,
+  the last bucket everything above.
+
+enable() replaces the bus transport of the driver's RegIO object by the profiler and wraps
+the driver's methods in the instance, disable() puts everything back: a disabled profiler
+costs nothing, not even a test of a flag.
+Properties (the LIS3DH driver) are wrapped in the class while the profiler is enabled,
+where the port supports it (property.fget, CPython and the host simulator). Otherwise their
+transfers are charged to the methods they call (read_byte, set_masked, ...).
+
+Typical use:
+<pre>
+  profiler = BusProfiler(adxl345)
+  with profiler:
+      adxl345.setDataRate(RATE_100)
+      ...
+  profiler.report()
+</pre>
+'''
+
+from utime import ticks_us, ticks_diff
+
+HISTOGRAM_BUCKETS = 16
+NO_METHOD = "-"                   # transfers made outside of a driver method
+
+def bucket(us,buckets=HISTOGRAM_BUCKETS):
+    '''!
+    @return the histogram bucket of a latency in us
+    '''
+    i = 0
+    while us and i < buckets - 1:
+        us >>= 1
+        i += 1
+    return i
+
+def bucketLimit(i):
+    '''!
+    @return the upper limit in us of bucket i, as printed by the reports
+    '''
+    return (1 << i) - 1
+
+class BusProfiler:
+
+    def __init__(self,driver,methods=True,buckets=HISTOGRAM_BUCKETS):
+        '''!
+        @param driver: an ADXL345, LIS3DH_I2C, LIS3DH_SPI or MPU6050 object (anything with a
+                       regio attribute)
+        @param methods: also profile per driver method
+        @param buckets: number of histogram buckets
+        '''
+        self.driver = driver
+        self.regio = driver.regio
+        self.bus = None               # the wrapped bus transport while enabled
+        self.profileMethods = methods
+        self.buckets = buckets
+        self.enabled = False
+        self.wrapped = []             # names of the methods wrapped in the driver instance
+        self.properties = []          # (name, original property) wrapped in the driver class
+        self.reset()
+
+    def reset(self):
+        '''!
+        Clear all statistics
+        '''
+        self.registers = {}           # register -> [transfers, bytes, us]
+        self.methods = {}             # method -> [calls, transfers, bytes, bus us, call us, max call us]
+        self.histogram = [0] * self.buckets
+        self.methodHistograms = {}    # method -> histogram of the call latency
+        self.method = None            # outermost driver method in progress
+        self.transfers = 0
+        self.bytes = 0
+        self.busTime = 0
+        self.elapsed = 0              # time spent enabled, up to the last disable()
+        self.start = None
+
+    # enabling and disabling
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.bus = self.regio.bus
+        self.regio.bus = self
+        if self.profileMethods:
+            self.wrapMethods()
+        self.enabled = True
+        self.start = ticks_us()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.elapsed += ticks_diff(ticks_us(),self.start)
+        self.start = None
+        self.regio.bus = self.bus
+        for name in self.wrapped:
+            delattr(self.driver,name)
+        self.wrapped = []
+        cls = type(self.driver)
+        for name,prop in self.properties:
+            setattr(cls,name,prop)
+        self.properties = []
+        self.method = None
+        self.enabled = False
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self,excType,excValue,traceback):
+        self.disable()
+
+    def wrapMethods(self):
+        driver = self.driver
+        cls = type(driver)
+        for name in dir(driver):
+            if name.startswith("_") or name in driver.__dict__:
+                continue
+            attr = getattr(cls,name,None)
+            if isinstance(attr,property):
+                self.wrapProperty(cls,name,attr)
+            elif callable(attr):
+                setattr(driver,name,self.methodWrapper(name,getattr(driver,name)))
+                self.wrapped.append(name)
+
+    def methodWrapper(self,name,method):
+        profiler = self
+        def wrapper(*args,**kwargs):
+            return profiler.call(name,method,args,kwargs)
+        return wrapper
+
+    def wrapProperty(self,cls,name,prop):
+        fget = getattr(prop,"fget",None)
+        fset = getattr(prop,"fset",None)
+        if fget is None and fset is None:
+            return
+        profiler = self
+        driver = self.driver
+        def getter(obj):
+            if obj is not driver:
+                return fget(obj)
+            return profiler.call(name,fget,(obj,),{})
+        def setter(obj,value):
+            if obj is not driver:
+                return fset(obj,value)
+            return profiler.call(name,fset,(obj,value),{})
+        setattr(cls,name,property(getter if fget else None,setter if fset else None))
+        self.properties.append((name,prop))
+
+    def call(self,name,method,args,kwargs):
+        if self.method is not None:               # nested: charged to the outer method
+            return method(*args,**kwargs)
+        self.method = name
+        start = ticks_us()
+        try:
+            return method(*args,**kwargs)
+        finally:
+            us = ticks_diff(ticks_us(),start)
+            self.method = None
+            entry = self.methodEntry(name)
+            entry[0] += 1
+            entry[4] += us
+            if us > entry[5]:
+                entry[5] = us
+            self.methodHistograms[name][bucket(us,self.buckets)] += 1
+
+    def methodEntry(self,name):
+        entry = self.methods.get(name)
+        if entry is None:
+            entry = self.methods[name] = [0,0,0,0,0,0]
+            self.methodHistograms[name] = [0] * self.buckets
+        return entry
+
+    # accounting
+
+    def account(self,register,nbytes,us):
+        self.transfers += 1
+        self.bytes += nbytes
+        self.busTime += us
+        self.histogram[bucket(us,self.buckets)] += 1
+        entry = self.registers.get(register)
+        if entry is None:
+            entry = self.registers[register] = [0,0,0]
+        entry[0] += 1
+        entry[1] += nbytes
+        entry[2] += us
+        name = self.method
+        if name is None:
+            name = NO_METHOD
+        entry = self.methodEntry(name)
+        entry[1] += 1
+        entry[2] += nbytes
+        entry[3] += us
+
+    # bus transport interface, see bustransport.py
+
+    def scan(self):
+        return self.bus.scan()
+
+    def readfrom_mem_into(self,addr,memaddr,buf,*args):
+        start = ticks_us()
+        self.bus.readfrom_mem_into(addr,memaddr,buf,*args)
+        self.account(memaddr,len(buf),ticks_diff(ticks_us(),start))
+
+    def readfrom_mem(self,addr,memaddr,nbytes,*args):
+        start = ticks_us()
+        data = self.bus.readfrom_mem(addr,memaddr,nbytes,*args)
+        self.account(memaddr,nbytes,ticks_diff(ticks_us(),start))
+        return data
+
+    def writeto_mem(self,addr,memaddr,buf,*args):
+        start = ticks_us()
+        self.bus.writeto_mem(addr,memaddr,buf,*args)
+        self.account(memaddr,len(buf),ticks_diff(ticks_us(),start))
+
+    # results
+
+    def summary(self):
+        '''!
+        @return a dictionary with the totals, the per register and per method statistics
+                and the histograms, e.g. to be printed or saved with json.dump()
+        '''
+        elapsed = self.elapsed
+        if self.start is not None:
+            elapsed += ticks_diff(ticks_us(),self.start)
+        registers = {}
+        for register,(transfers,nbytes,us) in self.registers.items():
+            registers[register] = {"transfers": transfers,"bytes": nbytes,"us": us}
+        methods = {}
+        for name,(calls,transfers,nbytes,busUs,callUs,maxUs) in self.methods.items():
+            methods[name] = {"calls": calls,"transfers": transfers,"bytes": nbytes,
+                             "busUs": busUs,"callUs": callUs,"maxCallUs": maxUs,
+                             "histogram": list(self.methodHistograms[name])}
+        return {
+            "transfers": self.transfers,
+            "bytes": self.bytes,
+            "busUs": self.busTime,
+            "elapsedUs": elapsed,
+            "histogram": list(self.histogram),
+            "registers": registers,
+            "methods": methods,
+        }
+
+    def report(self,top=10):
+        '''!
+        Print the registers and the methods taking most bus time and the latency histogram
+        @param top: number of registers and methods printed
+        '''
+        s = self.summary()
+        print("{:d} transfers, {:d} bytes, bus time {:d} us of {:d} us".format(
+            s["transfers"],s["bytes"],s["busUs"],s["elapsedUs"]))
+        print("register  transfers    bytes       us")
+        registers = sorted(self.registers.items(),key=lambda item: -item[1][2])
+        for register,(transfers,nbytes,us) in registers[:top]:
+            print("    0x{:02x} {:10d} {:8d} {:8d}".format(register,transfers,nbytes,us))
+        print("method                       calls  transfers    bytes   bus us  call us   max us")
+        methods = sorted(self.methods.items(),key=lambda item: -item[1][3])
+        for name,(calls,transfers,nbytes,busUs,callUs,maxUs) in methods[:top]:
+            print("{:<26s} {:7d} {:10d} {:8d} {:8d} {:8d} {:8d}".format(
+                name,calls,transfers,nbytes,busUs,callUs,maxUs))
+        print("transfer latency")
+        self.printHistogram(self.histogram)
+
+    @staticmethod
+    def printHistogram(histogram):
+        total = sum(histogram)
+        if not total:
+            return
+        last = len(histogram) - 1
+        for i,count in enumerate(histogram):
+            if count:
+                limit = bucketLimit(last - 1) if i == last else bucketLimit(i)
+                print("  {:s} {:7d} us: {:8d} {:s}".format(">" if i == last else "<=",limit,count,
+                                                          "#" * (40 * count // total)))
@@ -0,0 +1,102 @@
+'''!
+bustransport.py: bus backends shared by the accelerometer drivers
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+The drivers access their registers through the memory API of machine.I2C:
+<pre>
+  readfrom_mem_into(addr,register,buf)    read len(buf) bytes starting at register
+  readfrom_mem(addr,register,n)           read n bytes starting at register, returns bytes
+  writeto_mem(addr,register,buf)          write buf starting at register
+  scan()                                  list of device addresses on the bus
+</pre>
+This is the bus transport interface: any object implementing it can be passed to the
+drivers (ADXL345(i2c=...), MPU6050(i2c=...), LIS3DH_I2C(i2c=...)).
+- i2cBus() creates a hardware I2C bus with a configurable frequency, or a SoftI2C one
+- SPITransport implements the same API on a hardware SPI bus for the ADXL345 and the LIS3DH,
+  which both accept SPI clocks of several MHz, 10 times the 400 kHz of fast mode I2C.
+  Multi-byte accesses set the auto-increment bit in the command byte.
+
+Typical use:
+<pre>
+  adxl345 = ADXL345(i2c=SPITransport(cs=5,address=ADXL345_ADDRESS))
+  mpu = MPU6050(i2c=i2cBus(0,scl=22,sda=21,freq=1000000))
+</pre>
+'''
+
+from machine import Pin,I2C,SoftI2C,SPI
+
+SPI_READ            = 0x80     # command byte: read access
+SPI_MULTI_BYTE      = 0x40     # command byte: register address auto-increment
+SPI_REGISTER_MASK   = 0x3f     # command byte: register address
+
+def i2cBus(bus=None,scl=22,sda=21,freq=400000):
+    '''!
+    Create an I2C bus
+    @param bus: the hardware I2C controller (0 or 1), None selects the bit-banged SoftI2C
+    @param scl: the SCL pin
+    @param sda: the SDA pin
+    @param freq: the bus frequency in Hz
+    @return the I2C object
+    '''
+    if bus is None:
+        return SoftI2C(scl=Pin(scl),sda=Pin(sda),freq=freq)
+    return I2C(bus,scl=Pin(scl),sda=Pin(sda),freq=freq)
+
+class SPITransport:
+
+    def __init__(self,spi=None,cs=26,bus=1,sck=18,mosi=23,miso=19,baudrate=5000000,
+                 polarity=1,phase=1,address=None,readBit=SPI_READ,multiByteBit=SPI_MULTI_BYTE):
+        '''!
+        Register access over a 4 wire SPI bus
+        @param spi: an existing SPI object, if None a hardware SPI bus is created
+        @param cs: the chip select pin
+        @param bus: the hardware SPI controller (1 or 2)
+        @param sck, mosi, miso: the SPI pins
+        @param baudrate: the SPI clock, at most 5 MHz for the ADXL345 and 10 MHz for the LIS3DH
+        @param polarity, phase: the SPI mode, both devices use mode 3
+        @param address: the address reported by scan(). SPI has no device addresses, reporting
+                        the one of the I2C interface lets the drivers find their device
+        @param readBit: bit set in the command byte for read accesses
+        @param multiByteBit: bit set in the command byte for multi-byte accesses
+        '''
+        if spi is None:
+            spi = SPI(bus,baudrate=baudrate,polarity=polarity,phase=phase,
+                      sck=Pin(sck),mosi=Pin(mosi),miso=Pin(miso))
+        self.spi = spi
+        self.cs = Pin(cs,Pin.OUT,value=1)
+        self.address = address
+        self.readBit = readBit
+        self.multiByteBit = multiByteBit
+        self.cmd = bytearray(1)
+
+    def scan(self):
+        if self.address is None:
+            return []
+        return [self.address]
+
+    def readfrom_mem_into(self,addr,register,buf):
+        cmd = (register & SPI_REGISTER_MASK) | self.readBit
+        if len(buf) > 1:
+            cmd |= self.multiByteBit
+        self.cmd[0] = cmd
+        self.cs.value(0)
+        self.spi.write(self.cmd)
+        self.spi.readinto(buf)
+        self.cs.value(1)
+
+    def readfrom_mem(self,addr,register,n):
+        buf = bytearray(n)
+        self.readfrom_mem_into(addr,register,buf)
+        return buf
+
+    def writeto_mem(self,addr,register,buf):
+        cmd = register & SPI_REGISTER_MASK
+        if len(buf) > 1:
+            cmd |= self.multiByteBit
+        self.cmd[0] = cmd
+        self.cs.value(0)
+        self.spi.write(self.cmd)
+        self.spi.write(buf)
+        self.cs.value(1)
@@ -0,0 +1,341 @@
+'''!
+gesturedataset.py: a single file gesture dataset for training, loaded with numpy.memmap
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Runs on the PC and needs NumPy. The file holds, all values little endian:
+<pre>
+  header (64 bytes)
+     0  8  magic "GESTDSET"
+     8  2  version (1)
+    10  2  channels per sample
+    12  4  number of gestures
+    16  4  index capacity (number of entries reserved)
+    20  8  payload offset in bytes
+    28  8  number of samples in the payload
+  index (16 bytes per entry, capacity entries)
+     0  8  offset of the first sample in the payload, in samples
+     8  4  number of samples
+    12  2  sample rate in Hz
+    14  1  label id (see gestureformat.LABELS)
+    15  1  reserved
+  payload
+     the samples of all gestures one after the other, channels int16 values each
+</pre>
+The index and the payload are mapped with numpy.memmap: opening a dataset reads 64 bytes,
+a gesture is a view into the mapped payload, nothing is copied until it is used.
+Gestures are appended in place: the samples at the end of the payload, then the index entry,
+then the header, such that an interrupted append leaves a consistent dataset.
+When the index is full, the payload is moved once to make room for twice as many entries
+(create the dataset with a large capacity to avoid this rewrite).
+
+captureGestures.py writes its gestures straight into a dataset. Conversion from the text
+files written by getGestures.py (<label>_<date>-<time>.dat) and from files of binary frames,
+e.g. the journal of captureGestures.py (see gestureformat.py):
+<pre>
+  python3 gesturedataset.py convert gestures.gsd ../adxl345/gestures/*.dat journal.gst
+  python3 gesturedataset.py info gestures.gsd
+</pre>
+'''
+
+import os
+import struct
+import numpy
+
+from gestureformat import LABELS, labelId, labelName, readFrames
+
+MAGIC = b"GESTDSET"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQ")
+HEADER_SIZE = 64
+INDEX_DTYPE = numpy.dtype([("offset","<u8"),("length","<u4"),("rate","<u2"),("label","u1"),("reserved","u1")])
+INDEX_ENTRY = struct.Struct("<QIHBx")
+INDEX_ENTRY_SIZE = INDEX_ENTRY.size
+SAMPLE_DTYPE = numpy.dtype("<i2")
+DEFAULT_CAPACITY = 1024
+DAT_RATE = 100                   # sample rate of gesture.py, used for the .dat files
+
+class GestureDataset:
+
+    def __init__(self,filename,mode="r"):
+        '''!
+        Open an existing dataset
+        @param filename: the dataset file
+        @param mode: "r" to read, "r+" to read and append
+        '''
+        self.filename = filename
+        self.mode = mode
+        self.file = None              # kept open while appending
+        self.maps = None              # (index, payload), mapped on first use
+        self.load()
+
+    @classmethod
+    def create(cls,filename,channels=3,capacity=DEFAULT_CAPACITY):
+        '''!
+        Create an empty dataset, replacing any existing file
+        @return the dataset, open for appending
+        '''
+        with open(filename,"wb") as f:
+            payloadOffset = HEADER_SIZE + capacity * INDEX_ENTRY_SIZE
+            f.write(HEADER.pack(MAGIC,VERSION,channels,0,capacity,payloadOffset,0).ljust(HEADER_SIZE,b"\0"))
+            f.truncate(payloadOffset)
+        return cls(filename,"r+")
+
+    @classmethod
+    def open(cls,filename,channels=3):
+        '''!
+        Open a dataset for appending, create it if it does not exist
+        '''
+        if os.path.exists(filename):
+            return cls(filename,"r+")
+        return cls.create(filename,channels)
+
+    def load(self):
+        with open(self.filename,"rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("{:s} is not a gesture dataset".format(self.filename))
+        magic,version,channels,count,capacity,payloadOffset,samples = HEADER.unpack_from(header)
+        if version != VERSION:
+            raise ValueError("unsupported dataset version {:d}".format(version))
+        self.channels = channels
+        self.count = count
+        self.capacity = capacity
+        self.payloadOffset = payloadOffset
+        self.samples = samples
+
+    def map(self):
+        if self.maps is not None:
+            return self.maps
+        if self.file is not None:
+            self.file.flush()
+        if self.count:
+            index = numpy.memmap(self.filename,dtype=INDEX_DTYPE,mode="r",
+                                 offset=HEADER_SIZE,shape=(self.count,))
+        else:
+            index = numpy.zeros(0,dtype=INDEX_DTYPE)
+        if self.samples:
+            payload = numpy.memmap(self.filename,dtype=SAMPLE_DTYPE,mode="r",
+                                   offset=self.payloadOffset,shape=(self.samples,self.channels))
+        else:
+            payload = numpy.zeros((0,self.channels),dtype=SAMPLE_DTYPE)
+        self.maps = (index,payload)
+        return self.maps
+
+    @property
+    def index(self):
+        '''!
+        @return the index, a structured array with the fields offset, length, rate and label
+        '''
+        return self.map()[0]
+
+    @property
+    def payload(self):
+        '''!
+        @return all samples, an array of shape (samples, channels)
+        '''
+        return self.map()[1]
+
+    def close(self):
+        self.maps = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,excType,excValue,traceback):
+        self.close()
+
+    # reading
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self,i):
+        '''!
+        @return the samples of gesture i, a (length, channels) view into the mapped payload
+        '''
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("gesture index out of range")
+        entry = self.index[i]
+        offset = int(entry["offset"])
+        return self.payload[offset:offset + int(entry["length"])]
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    @property
+    def labels(self):
+        '''!
+        @return the label ids of all gestures
+        '''
+        return numpy.asarray(self.index["label"])
+
+    @property
+    def lengths(self):
+        return numpy.asarray(self.index["length"])
+
+    @property
+    def rates(self):
+        return numpy.asarray(self.index["rate"])
+
+    def label(self,i):
+        return int(self.index[i]["label"])
+
+    def rate(self,i):
+        return int(self.index[i]["rate"])
+
+    def select(self,label):
+        '''!
+        @param label: label id or name
+        @return the indices of the gestures with this label
+        '''
+        if isinstance(label,str):
+            label = labelId(label)
+        return numpy.nonzero(self.labels == label)[0]
+
+    def toArray(self,length,pad=0):
+        '''!
+        Copy the gestures into a single (count, length, channels) array for training:
+        longer gestures are cut, shorter ones padded with pad
+        '''
+        out = numpy.full((self.count,length,self.channels),pad,dtype=SAMPLE_DTYPE)
+        for i in range(self.count):
+            g = self[i][:length]
+            out[i,:len(g)] = g
+        return out
+
+    # appending
+
+    def append(self,samples,label,rate):
+        '''!
+        Append a gesture
+        @param samples: array like of shape (length, channels) or the raw int16 little endian
+                        bytes of the samples
+        @param label: label id or name
+        @param rate: sample rate in Hz
+        @return the index of the new gesture
+        '''
+        if self.mode == "r":
+            raise ValueError("dataset opened read only")
+        if isinstance(label,str):
+            label = labelId(label)
+        if isinstance(samples,(bytes,bytearray,memoryview)):
+            data = numpy.frombuffer(samples,dtype=SAMPLE_DTYPE)
+        else:
+            data = numpy.ascontiguousarray(samples,dtype=SAMPLE_DTYPE)
+        if data.size % self.channels:
+            raise ValueError("the samples do not have {:d} channels".format(self.channels))
+        length = data.size // self.channels
+        if self.count == self.capacity:
+            self.grow(2 * self.capacity)
+        # the maps no longer cover the whole dataset, views held by the caller stay valid
+        self.maps = None
+        if self.file is None:
+            self.file = open(self.filename,"r+b")
+        f = self.file
+        f.seek(self.payloadOffset + self.samples * self.channels * SAMPLE_DTYPE.itemsize)
+        f.write(data.tobytes())
+        f.seek(HEADER_SIZE + self.count * INDEX_ENTRY_SIZE)
+        f.write(INDEX_ENTRY.pack(self.samples,length,rate,label))
+        self.count += 1
+        self.samples += length
+        self.writeHeader()
+        return self.count - 1
+
+    def writeHeader(self):
+        # written last and flushed: the header only covers samples and entries already written
+        f = self.file
+        f.flush()
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC,VERSION,self.channels,self.count,self.capacity,
+                            self.payloadOffset,self.samples))
+        f.flush()
+
+    def grow(self,capacity):
+        '''!
+        Make room for capacity index entries: the payload is moved towards the end of the file
+        '''
+        self.maps = None
+        payloadOffset = HEADER_SIZE + capacity * INDEX_ENTRY_SIZE
+        size = self.samples * self.channels * SAMPLE_DTYPE.itemsize
+        chunk = 1 << 22
+        if self.file is None:
+            self.file = open(self.filename,"r+b")
+        f = self.file
+        # copy from the end, the source and the destination overlap
+        end = size
+        while end > 0:
+            start = max(0,end - chunk)
+            f.seek(self.payloadOffset + start)
+            data = f.read(end - start)
+            f.seek(payloadOffset + start)
+            f.write(data)
+            end = start
+        f.seek(HEADER_SIZE + self.count * INDEX_ENTRY_SIZE)
+        f.write(bytes((capacity - self.count) * INDEX_ENTRY_SIZE))
+        self.capacity = capacity
+        self.payloadOffset = payloadOffset
+        self.writeHeader()
+
+    # conversion
+
+    def appendDat(self,filename,rate=DAT_RATE):
+        '''!
+        Append a text file written by getGestures.py: "ax,ay,az" then one line per sample,
+        the label is the file name up to the first "_"
+        '''
+        label = os.path.basename(filename).split("_")[0]
+        rows = []
+        with open(filename) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("ax") or line == "end":
+                    continue
+                rows.append([int(v) for v in line.split(",")])
+        return self.append(numpy.array(rows,dtype=SAMPLE_DTYPE).reshape(-1,self.channels),label,rate)
+
+    def appendRecording(self,filename):
+        '''!
+        Append all gestures of a file of frames, e.g. the journal of captureGestures.py
+        @return the number of gestures appended
+        '''
+        n = 0
+        for frame in readFrames(filename):
+            self.append(frame.data,frame.label,frame.rate)
+            n += 1
+        return n
+
+    def info(self):
+        counts = numpy.bincount(self.labels,minlength=len(LABELS)) if self.count else []
+        print("{:s}: {:d} gestures, {:d} samples, {:d} channels, index capacity {:d}".format(
+            self.filename,self.count,self.samples,self.channels,self.capacity))
+        for label,n in enumerate(counts):
+            if n:
+                lengths = self.lengths[self.labels == label]
+                print("  {:<8s} {:6d} gestures, {:5d} to {:5d} samples".format(
+                    labelName(label),n,int(lengths.min()),int(lengths.max())))
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3 or sys.argv[1] not in ("convert","info"):
+        print("usage: python3 gesturedataset.py convert dataset file.dat|recording.gst ...")
+        print("       python3 gesturedataset.py info dataset")
+        sys.exit(1)
+    if sys.argv[1] == "info":
+        with GestureDataset(sys.argv[2]) as dataset:
+            dataset.info()
+        sys.exit(0)
+    with GestureDataset.open(sys.argv[2]) as dataset:
+        for name in sys.argv[3:]:
+            if name.endswith(".dat"):
+                dataset.appendDat(name)
+            else:
+                dataset.appendRecording(name)
+        dataset.info()
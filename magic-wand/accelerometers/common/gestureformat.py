@@ -0,0 +1,235 @@
+'''!
+gestureformat.py: binary frames carrying a recorded gesture from the ESP32 to the host
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+A gesture is sent as a single frame, all values little endian:
+<pre>
+  offset size
+       0    2  magic "GS"
+       2    1  format version (1)
+       3    1  label id, see LABELS
+       4    2  sample rate in Hz
+       6    2  number of samples
+       8    1  number of channels per sample (3: ax, ay, az)
+       9    1  flags, reserved (0)
+      10  2*n  payload: samples * channels int16 values, sample by sample
+    10+2n   4  CRC32 of the header and the payload
+</pre>
+The device writes the frame with sys.stdout.buffer.write(), which bypasses the text
+formatting, between the usual prints: the host decoder looks for the magic, checks the
+CRC and hands the bytes outside of frames back as text.
+A file of concatenated frames is a valid recording: frames can be appended at any time.
+
+On the ESP32 only writeFrame() is used, it does not allocate memory for the payload.
+On the host FrameDecoder, readFrames() and the NumPy helpers decode the frames,
+NumPy is imported only when needed.
+
+On the host, a recording is converted to one .npy file per gesture with
+<pre>
+  python3 gestureformat.py recording.gst [output directory]
+</pre>
+'''
+
+from struct import pack_into, unpack_from
+from binascii import crc32
+
+MAGIC = b"GS"
+VERSION = 1
+HEADER_SIZE = 10
+CRC_SIZE = 4
+MAX_SAMPLES = 0xffff
+
+# the gestures of the magic wand, the label id is the index
+LABELS = ("zero","one","two","three","four","five","six","seven","eight","nine")
+
+_header = bytearray(HEADER_SIZE)
+_crc = bytearray(CRC_SIZE)
+
+def writeFrame(stream,label,rate,samples,count=None,channels=3):
+    '''!
+    Send a gesture
+    @param stream: the binary output, sys.stdout.buffer on the ESP32
+    @param label: label id (0..255)
+    @param rate: sample rate in Hz
+    @param samples: array('h') holding the samples, channels values each
+    @param count: number of samples to send, by default all samples in the array
+    @param channels: number of values per sample
+    '''
+    if count is None:
+        count = len(samples) // channels
+    if count > MAX_SAMPLES:
+        raise ValueError("at most {:d} samples per frame".format(MAX_SAMPLES))
+    pack_into("<2sBBHHBB",_header,0,MAGIC,VERSION,label,rate,count,channels,0)
+    payload = memoryview(samples)[:count*channels]
+    crc = crc32(payload,crc32(_header))
+    pack_into("<I",_crc,0,crc & 0xffffffff)
+    stream.write(_header)
+    stream.write(payload)
+    stream.write(_crc)
+
+def frameSize(count,channels=3):
+    '''!
+    @return the size in bytes of a frame of count samples
+    '''
+    return HEADER_SIZE + 2 * count * channels + CRC_SIZE
+
+def labelName(label):
+    if label < len(LABELS):
+        return LABELS[label]
+    return str(label)
+
+def labelId(name):
+    '''!
+    @return the label id of a label name or of a number given as text
+    '''
+    if name in LABELS:
+        return LABELS.index(name)
+    return int(name)
+
+class Frame:
+    '''
+    A decoded gesture. data holds the raw payload bytes (int16 little endian)
+    '''
+    def __init__(self,label,rate,count,channels,data):
+        self.label = label
+        self.rate = rate
+        self.count = count
+        self.channels = channels
+        self.data = data
+
+    @property
+    def name(self):
+        return labelName(self.label)
+
+    def toArray(self):
+        '''!
+        @return the samples as a NumPy int16 array of shape (count, channels)
+        '''
+        import numpy
+        return numpy.frombuffer(self.data,dtype="<i2").reshape(self.count,self.channels)
+
+    def toBytes(self):
+        '''!
+        @return the complete frame, e.g. to append it to a recording
+        '''
+        header = bytearray(HEADER_SIZE)
+        pack_into("<2sBBHHBB",header,0,MAGIC,VERSION,self.label,self.rate,self.count,self.channels,0)
+        crc = crc32(self.data,crc32(header)) & 0xffffffff
+        return bytes(header) + bytes(self.data) + crc.to_bytes(4,"little")
+
+class FrameDecoder:
+    '''
+    Incremental decoder: feed it the bytes as they come from the serial line
+    in chunks of any size, it returns the complete frames
+    '''
+    def __init__(self,text=None,maxSamples=MAX_SAMPLES,maxChannels=8):
+        '''!
+        @param text: called with the bytes found outside of frames (the prints of the program)
+        @param maxSamples, maxChannels: larger headers are taken for text that happens to
+                                        contain the magic, instead of waiting for their payload.
+                                        By default any frame writeFrame() can send is accepted
+        '''
+        self.buf = bytearray()
+        self.text = text
+        self.maxSamples = maxSamples
+        self.maxChannels = maxChannels
+        self.frames = 0               # statistics
+        self.crcErrors = 0
+        self.badHeaders = 0           # headers rejected: bad version or flags, too large
+        self.skipped = 0              # bytes outside of frames
+
+    def feed(self,data):
+        '''!
+        @param data: the next bytes of the stream
+        @return a list of the frames completed by data
+        '''
+        buf = self.buf
+        buf.extend(data)
+        frames = []
+        pos = 0
+        while True:
+            start = buf.find(MAGIC,pos)
+            if start < 0:
+                # keep a trailing "G", it may be the start of the next magic
+                end = len(buf) - 1 if buf.endswith(MAGIC[:1]) else len(buf)
+                self.skip(buf[pos:end])
+                pos = end
+                break
+            self.skip(buf[pos:start])
+            pos = start
+            if len(buf) - start < HEADER_SIZE:
+                break
+            version,label,rate,count,channels,flags = unpack_from("<BBHHBB",buf,start + 2)
+            if version != VERSION or flags or not 0 < channels <= self.maxChannels or \
+               count > self.maxSamples:
+                self.badHeaders += 1
+                self.skip(buf[start:start + 1])
+                pos = start + 1
+                continue
+            size = frameSize(count,channels)
+            if len(buf) - start < size:
+                break
+            end = start + size - CRC_SIZE
+            crc = unpack_from("<I",buf,end)[0]
+            if crc32(memoryview(buf)[start:end]) & 0xffffffff != crc:
+                # not a frame after all, or a corrupted one: resynchronize after the magic
+                self.crcErrors += 1
+                self.skip(buf[start:start + 1])
+                pos = start + 1
+                continue
+            frames.append(Frame(label,rate,count,channels,bytes(buf[start + HEADER_SIZE:end])))
+            self.frames += 1
+            pos = start + size
+        del buf[:pos]
+        return frames
+
+    def skip(self,data):
+        if not data:
+            return
+        self.skipped += len(data)
+        if self.text is not None:
+            self.text(bytes(data))
+
+    def pending(self):
+        '''!
+        @return number of bytes waiting for the rest of a frame
+        '''
+        return len(self.buf)
+
+def readFrames(filename,chunkSize=65536):
+    '''!
+    Read a recording: a file of concatenated frames
+    @return a generator of the frames
+    '''
+    decoder = FrameDecoder()
+    with open(filename,"rb") as f:
+        while True:
+            data = f.read(chunkSize)
+            if not data:
+                break
+            for frame in decoder.feed(data):
+                yield frame
+
+def saveNpy(frame,filename):
+    '''!
+    Save the samples of a frame as a NumPy .npy file of shape (count, channels)
+    '''
+    import numpy
+    numpy.save(filename,frame.toArray())
+
+if __name__ == "__main__":
+    import sys
+    import os
+    if len(sys.argv) < 2:
+        print("usage: python3 gestureformat.py recording [output directory]")
+        sys.exit(1)
+    outDir = sys.argv[2] if len(sys.argv) > 2 else "."
+    counts = {}
+    for frame in readFrames(sys.argv[1]):
+        n = counts.get(frame.name,0)
+        counts[frame.name] = n + 1
+        filename = os.path.join(outDir,"{:s}_{:04d}.npy".format(frame.name,n))
+        saveNpy(frame,filename)
+        print("{:s}: {:d} samples at {:d} Hz".format(filename,frame.count,frame.rate))
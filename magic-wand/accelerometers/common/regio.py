@@ -0,0 +1,168 @@
+'''!
+regio.py: register level access shared by the ADXL345, LIS3DH and MPU6050 drivers
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+A RegIO object accesses the registers of one device on a bus transport (machine.I2C,
+SoftI2C or bustransport.SPITransport):
+- single register reads and writes go through preallocated buffers (readfrom_mem_into),
+- burst helpers read or write several consecutive registers in a single transfer,
+- the bus transfers are counted, see counters().
+
+Bit fields are described by their most significant bit and their size, as in the
+data sheets and in the drivers. field() turns this into a descriptor (register, shift, mask)
+computed once at import time. The drivers define one for each multi bit field their setters
+and getters touch, e.g. in adxl345.py:
+<pre>
+  RANGE_FIELD = field(ADXL345_DATA_FORMAT,RANGE,RANGE_SIZE)
+  rangeCode = regio.readField(RANGE_FIELD)
+</pre>
+extract() and insert() apply a descriptor's shift and mask to a register value already read,
+which is what the drivers use on top of their register caches.
+'''
+
+# FIELD_MASKS[n]: mask of a field n bits wide, replaces the loop building the mask bit by bit
+FIELD_MASKS = (0x00,0x01,0x03,0x07,0x0f,0x1f,0x3f,0x7f,0xff)
+
+def field(register,position,size=1):
+    '''!
+    Bit field descriptor
+    @param register: the register address
+    @param position: the most significant bit of the field
+    @param size: the number of bits in the field
+    @return (register, shift, mask)
+    '''
+    shift = position - size + 1
+    return (register,shift,FIELD_MASKS[size] << shift)
+
+def extract(value,shift,mask):
+    '''!
+    @return the field value contained in the register value
+    '''
+    return (value & mask) >> shift
+
+def insert(value,shift,mask,fieldValue):
+    '''!
+    @return the register value with the field replaced by fieldValue, which is cut to the field size
+    '''
+    return ((value & ~mask) | ((fieldValue << shift) & mask)) & 0xff
+
+class RegIO:
+
+    def __init__(self,bus,address,autoIncrement=0):
+        '''!
+        @param bus: the bus transport
+        @param address: the device address on the bus
+        @param autoIncrement: bit set in the register address for multi-byte accesses,
+                              0x80 for the lis3dh on I2C, 0 if the device or the transport
+                              handles it
+        '''
+        self.bus = bus
+        self.address = address
+        self.autoIncrement = autoIncrement
+        self.byteBuf = bytearray(1)
+        self.wordBuf = bytearray(2)
+        self.resetCounters()
+
+    def resetCounters(self):
+        self.reads = 0              # read transfers
+        self.writes = 0             # write transfers
+
+    def counters(self):
+        '''!
+        @return the number of read and write transfers since the last resetCounters()
+        '''
+        return self.reads,self.writes
+
+    def readByte(self,register):
+        '''!
+        Read a single register
+        @return the register contents
+        '''
+        self.reads += 1
+        self.bus.readfrom_mem_into(self.address,register,self.byteBuf)
+        return self.byteBuf[0]
+
+    def writeByte(self,register,value):
+        '''!
+        Write a single register
+        '''
+        self.writes += 1
+        self.byteBuf[0] = value & 0xff
+        self.bus.writeto_mem(self.address,register,self.byteBuf)
+
+    def readInto(self,register,buf):
+        '''!
+        Burst read of consecutive registers into buf
+        @param buf: bytearray, array or memoryview, filled completely
+        '''
+        self.reads += 1
+        self.bus.readfrom_mem_into(self.address,register | self.autoIncrement,buf)
+
+    def read(self,register,n):
+        '''!
+        Burst read of n consecutive registers into a new buffer.
+        Prefer readInto() in loops, it does not allocate memory
+        @return the register contents
+        '''
+        self.reads += 1
+        return self.bus.readfrom_mem(self.address,register | self.autoIncrement,n)
+
+    def write(self,register,buf):
+        '''!
+        Burst write of consecutive registers
+        '''
+        self.writes += 1
+        if len(buf) > 1:
+            register |= self.autoIncrement
+        self.bus.writeto_mem(self.address,register,buf)
+
+    def readWord(self,register,bigEndian=True):
+        '''!
+        Read a signed 16 bit value from 2 consecutive registers
+        @param bigEndian: True if the high byte is at the lower address (MPU6050),
+                          False for the ADXL345 and the LIS3DH
+        @return the value
+        '''
+        buf = self.wordBuf
+        self.reads += 1
+        self.bus.readfrom_mem_into(self.address,register | self.autoIncrement,buf)
+        if bigEndian:
+            value = buf[0] << 8 | buf[1]
+        else:
+            value = buf[1] << 8 | buf[0]
+        if value & 0x8000:
+            value -= 0x10000
+        return value
+
+    def writeWord(self,register,value,bigEndian=True):
+        '''!
+        Write a 16 bit value to 2 consecutive registers
+        '''
+        buf = self.wordBuf
+        if bigEndian:
+            buf[0] = (value >> 8) & 0xff
+            buf[1] = value & 0xff
+        else:
+            buf[0] = value & 0xff
+            buf[1] = (value >> 8) & 0xff
+        self.writes += 1
+        self.bus.writeto_mem(self.address,register | self.autoIncrement,buf)
+
+    def readField(self,descriptor):
+        '''!
+        @param descriptor: the bit field descriptor returned by field()
+        @return the field value
+        '''
+        register,shift,mask = descriptor
+        return (self.readByte(register) & mask) >> shift
+
+    def writeField(self,descriptor,value):
+        '''!
+        Read-modify-write of a bit field
+        @param descriptor: the bit field descriptor returned by field()
+        @param value: the new field value
+        '''
+        register,shift,mask = descriptor
+        self.writeByte(register,insert(self.readByte(register),shift,mask,value))
@@ -0,0 +1,165 @@
+'''!
+ringbuffer.py: a fixed size ring buffer of 16 bit samples shared by the accelerometer drivers
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+A sample consists of width 16 bit values, e.g. ax, ay, az for an accelerometer.
+The samples are kept in a single array('h') allocated when the ring buffer is created.
+A block is copied in at most two contiguous segments with memoryview slice assignment, the
+only allocations are the few memoryview slices per block, whatever its size. Lists are
+copied value by value.
+
+The ring buffer is safe between one producer and one consumer, typically a drain function
+scheduled by an interrupt handler with micropython.schedule and the main loop:
+only the producer changes head, only the consumer changes tail, and the producer copies
+the samples before it advances head.
+When the ring buffer is full, the newest samples are dropped and counted in overruns.
+
+Optionally, each sample gets a ticks_us() timestamp.
+
+Typical use:
+<pre>
+  ring = RingBuffer(512,width=3)
+  # producer
+  ring.write_block(chunk,n)
+  # consumer
+  block = array('h',[0]*3*16)
+  if ring.read_block(block):
+      ...
+</pre>
+'''
+
+from array import array
+from utime import ticks_us, ticks_add
+
+class RingBuffer:
+
+    def __init__(self,capacity,width=3,timestamps=False):
+        '''!
+        Create a ring buffer
+        @param capacity: number of samples
+        @param width: number of 16 bit values per sample
+        @param timestamps: keep a ticks_us() timestamp for each sample
+        '''
+        self.capacity = capacity
+        self.width = width
+        self.size = capacity * width
+        self.buf = array('h',[0]*self.size)
+        self.view = memoryview(self.buf)
+        self.stamps = None
+        if timestamps:
+            self.stamps = array('l',[0]*capacity)
+        # head and tail count modulo 2*capacity: they stay small ints and a full ring buffer
+        # can be told from an empty one
+        self.wrap = 2 * capacity
+        self.head = 0                 # samples written, only changed by the producer
+        self.tail = 0                 # samples read, only changed by the consumer
+        self.overruns = 0             # samples dropped because the ring buffer was full
+
+    def available(self):
+        '''!
+        @return number of samples in the ring buffer
+        '''
+        return (self.head - self.tail) % self.wrap
+
+    def free(self):
+        '''!
+        @return number of samples that can be written before the ring buffer is full
+        '''
+        return self.capacity - (self.head - self.tail) % self.wrap
+
+    def write_block(self,src,n=None,timestamp=None,period=0):
+        '''!
+        Append samples to the ring buffer. Called by the producer only.
+        @param src: array('h'), memoryview or list holding the samples, width values each
+        @param n: number of samples to copy, by default all samples in src
+        @param timestamp: ticks_us() of the last sample, the time of the call by default
+        @param period: time between two samples in us, used to timestamp the other samples
+        @return number of samples written, less than n if the ring buffer is full
+        '''
+        width = self.width
+        if n is None:
+            n = len(src) // width
+        free = self.capacity - (self.head - self.tail) % self.wrap
+        if n > free:
+            self.overruns += n - free
+            n = free
+        if not n:
+            return 0
+        self.copy(src,(self.head % self.capacity) * width,n * width,True)
+        stamps = self.stamps
+        if stamps is not None:
+            if timestamp is None:
+                timestamp = ticks_us()
+            slot = self.head % self.capacity
+            for i in range(n):
+                stamps[slot] = ticks_add(timestamp,(i - n + 1) * period)
+                slot += 1
+                if slot == self.capacity:
+                    slot = 0
+        self.head = (self.head + n) % self.wrap   # publish the samples only once they are copied
+        return n
+
+    def read_block(self,dst,n=None,stamps=None):
+        '''!
+        Copy the n oldest samples out of the ring buffer. Called by the consumer only.
+        Nothing is consumed if fewer than n samples are available.
+        @param dst: array('h'), memoryview or list receiving the samples, width values each
+        @param n: number of samples, by default as many as dst can hold
+        @param stamps: array('l') receiving the timestamps, if timestamps are kept
+        @return True if n samples were copied, False otherwise
+        '''
+        width = self.width
+        if n is None:
+            n = len(dst) // width
+        if (self.head - self.tail) % self.wrap < n:
+            return False
+        self.copy(dst,(self.tail % self.capacity) * width,n * width,False)
+        if stamps is not None and self.stamps is not None:
+            slot = self.tail % self.capacity
+            for i in range(n):
+                stamps[i] = self.stamps[slot]
+                slot += 1
+                if slot == self.capacity:
+                    slot = 0
+        self.tail = (self.tail + n) % self.wrap   # release the slots only once they are copied
+        return True
+
+    def copy(self,other,pos,count,write):
+        # copy the first count values of other to or from the ring buffer, from index pos on,
+        # wrapping around at the end of the ring buffer: one or two block copies
+        size = self.size
+        if type(other) is list or type(other) is tuple:
+            buf = self.buf
+            for i in range(count):
+                if write:
+                    buf[pos] = other[i]
+                else:
+                    other[i] = buf[pos]
+                pos += 1
+                if pos == size:
+                    pos = 0
+            return
+        view = self.view
+        other = memoryview(other)
+        first = size - pos
+        if first > count:
+            first = count
+        if write:
+            view[pos:pos + first] = other[:first]
+            if first < count:
+                view[0:count - first] = other[first:count]
+        else:
+            other[:first] = view[pos:pos + first]
+            if first < count:
+                other[first:count] = view[0:count - first]
+
+    def discard(self,n=None):
+        '''!
+        Throw away the n oldest samples, all samples by default. Called by the consumer only.
+        '''
+        if n is None or n >= (self.head - self.tail) % self.wrap:
+            self.tail = self.head
+        else:
+            self.tail = (self.tail + n) % self.wrap
@@ -0,0 +1,203 @@
+'''!
+segmenter.py: streaming gesture segmentation on the signal energy, for any accelerometer
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+The segmenter is fed the blocks of samples the drivers deliver (adxl345 drainFIFO() or the
+acquisition engine, lis3dh read_fifo(), the mpu6050 FIFO, ...) and finds the gestures in the
+sample stream itself: no activity or inactivity register is read, no threshold of a particular
+chip is involved, and the same segmentation runs on the ADXL345, LIS3DH and MPU6050.
+
+For each sample it updates, in constant time whatever the window length,
+- the energy: the sum over the channels of the mean square value in the window,
+- the variance: the sum over the channels of the variance in the window. Gravity and any
+  other constant offset do not contribute, the variance measures the movement only.
+A gesture starts when the variance rises above startThreshold and ends when it has stayed
+below stopThreshold (< startThreshold: hysteresis) for hangover samples. Gestures ending
+less than minLength samples after their detection are dropped, gestures reaching maxLength samples are ended, and a new
+gesture can only start once the variance has dropped below stopThreshold again.
+The variance only rises once the movement has filled part of the window: the start index
+is moved back by preRoll samples to include the onset of the gesture.
+
+Sample indices count the samples fed since the creation or the last reset(). The completed
+gestures are queued as (start, end) index pairs, end excluded.
+
+The values are shifted right by shift bits before they are squared. With values of at most
++-1024 after the shift and a window of at most 16 samples all sums stay small ints and
+feed() does not allocate memory. Typical shifts: ADXL345 (256 LSB/g): 0, LIS3DH (16 bit left
+justified, 16000 LSB/g at +-2 g): 5, MPU6050 (16384 LSB/g at +-2 g): 5.
+The thresholds are in (LSB after the shift)**2: at 256 LSB/g, (0.25 g)**2 is 4096.
+
+Typical use:
+<pre>
+  segmenter = Segmenter(startThreshold=4096,stopThreshold=1024)
+  while True:
+      if acq.readBlock(block):
+          if segmenter.feed(block):
+              start,end = segmenter.getSegment()
+              ...
+</pre>
+'''
+
+from array import array
+
+class Segmenter:
+
+    def __init__(self,channels=3,window=16,startThreshold=4096,stopThreshold=1024,
+                 hangover=8,minLength=20,maxLength=0,preRoll=None,shift=0,queue=4):
+        '''!
+        @param channels: number of values per sample
+        @param window: number of samples in the energy and variance window
+        @param startThreshold: variance starting a gesture
+        @param stopThreshold: variance below which a gesture ends, at most startThreshold
+        @param hangover: number of samples below stopThreshold ending a gesture
+        @param minLength: gestures ending fewer samples after the detection are dropped
+        @param maxLength: longer gestures are ended, 0: no limit
+        @param preRoll: samples added before the detected start, by default the window length
+        @param shift: the values are shifted right by shift bits
+        @param queue: number of completed gestures kept until getSegment() is called
+        '''
+        if stopThreshold > startThreshold:
+            raise ValueError("stopThreshold must not exceed startThreshold")
+        self.channels = channels
+        self.window = window
+        self.startThreshold = startThreshold
+        self.stopThreshold = stopThreshold
+        self.hangover = hangover
+        self.minLength = minLength
+        self.maxLength = maxLength
+        self.preRoll = window if preRoll is None else preRoll
+        self.shift = shift
+        self.values = array('h',[0]*(window*channels))  # the window, shifted values
+        self.sums = array('l',[0]*channels)             # sum of the values per channel
+        self.queueSize = queue
+        self.queue = array('l',[0]*(2*queue))           # (start, end) pairs
+        self.reset()
+
+    def reset(self):
+        '''!
+        Forget the window, the current gesture and the queued gestures, restart the indices at 0
+        '''
+        for i in range(len(self.values)):
+            self.values[i] = 0
+        for i in range(self.channels):
+            self.sums[i] = 0
+        self.squares = 0              # sum of the squared values of all channels
+        self.pos = 0                  # next slot in the window
+        self.index = 0                # number of samples fed
+        self.energy = 0
+        self.variance = 0
+        self.active = False           # inside a gesture
+        self.blocked = False          # maxLength reached: wait for the variance to drop
+        self.start = 0                # start of the current gesture, pre-roll included
+        self.detected = 0             # index at which the current gesture was detected
+        self.end = 0                  # end of the last gesture
+        self.quiet = 0                # consecutive samples below stopThreshold
+        self.head = 0                 # queue: gestures completed
+        self.tail = 0                 # queue: gestures fetched
+        # statistics
+        self.gestures = 0
+        self.dropped = 0              # shorter than minLength
+        self.lost = 0                 # the queue was full
+
+    def feed(self,block,n=None):
+        '''!
+        Process a block of samples
+        @param block: array('h'), memoryview or list holding the samples, channels values each
+        @param n: number of samples, by default all samples in block
+        @return number of completed gestures waiting in the queue
+        '''
+        channels = self.channels
+        if n is None:
+            n = len(block) // channels
+        values = self.values
+        sums = self.sums
+        window = self.window
+        shift = self.shift
+        i = 0
+        for _ in range(n):
+            # slide the window: replace the oldest sample by the new one
+            slot = self.pos * channels
+            squares = self.squares
+            for c in range(channels):
+                new = block[i] >> shift
+                old = values[slot]
+                values[slot] = new
+                sums[c] += new - old
+                squares += new * new - old * old
+                slot += 1
+                i += 1
+            self.squares = squares
+            self.pos += 1
+            if self.pos == window:
+                self.pos = 0
+            self.index += 1
+            if self.index < window:
+                continue                  # the window is not filled yet
+            spread = 0
+            for c in range(channels):
+                spread += sums[c] * sums[c]
+            self.energy = squares // window
+            self.variance = (window * squares - spread) // (window * window)
+            self.update()
+        return self.available()
+
+    def update(self):
+        # the state machine, called once per sample with index and variance up to date
+        variance = self.variance
+        if self.blocked:
+            if variance < self.stopThreshold:
+                self.blocked = False
+            return
+        if not self.active:
+            if variance > self.startThreshold:
+                self.active = True
+                self.quiet = 0
+                self.detected = self.index - 1
+                # the pre-roll does not reach back into the previous gesture
+                start = self.index - 1 - self.preRoll
+                self.start = start if start > self.end else self.end
+            return
+        if variance < self.stopThreshold:
+            self.quiet += 1
+            if self.quiet >= self.hangover:
+                self.finish(self.index - self.quiet)
+                return
+        else:
+            self.quiet = 0
+        if self.maxLength and self.index - self.start >= self.maxLength:
+            self.finish(self.index)
+            self.blocked = True
+
+    def finish(self,end):
+        self.active = False
+        self.end = end
+        if end - self.detected < self.minLength:
+            self.dropped += 1
+            return
+        self.gestures += 1
+        size = self.queueSize
+        if (self.head - self.tail) % (2 * size) == size:
+            self.tail = (self.tail + 1) % (2 * size)      # full: drop the oldest gesture
+            self.lost += 1
+        slot = 2 * (self.head % size)
+        self.queue[slot] = self.start
+        self.queue[slot+1] = end
+        self.head = (self.head + 1) % (2 * size)
+
+    def available(self):
+        '''!
+        @return number of completed gestures waiting in the queue
+        '''
+        return (self.head - self.tail) % (2 * self.queueSize)
+
+    def getSegment(self):
+        '''!
+        @return the start and end index of the oldest completed gesture, None if there is none
+        '''
+        if self.head == self.tail:
+            return None
+        slot = 2 * (self.tail % self.queueSize)
+        self.tail = (self.tail + 1) % (2 * self.queueSize)
+        return self.queue[slot],self.queue[slot+1]
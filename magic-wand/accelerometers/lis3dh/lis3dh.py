@@ -3,77 +3,177 @@ from machine import SPI,SoftSPI,Pin,Signal
 import sys
 import ustruct as struct
 from utime import sleep_ms
+from regio import FIELD_MASKS, field, extract, insert
+
+# bit field descriptors (register, shift, mask) of the multi bit fields, computed once at import
+RATE_FIELD               = field(LIS3DH_CTRL_REG1,RATE_POS,RATE_SIZE)
+ALL_AXIS_EN_FIELD        = field(LIS3DH_CTRL_REG1,ALL_AXIS_EN_POS,ALL_AXIS_EN_SIZE)
+HP_FILTER_MODE_FIELD     = field(LIS3DH_CTRL_REG2,HP_FILTER_MODE_POS,HP_FILTER_MODE_SIZE)
+HP_FILTER_CUTOFF_FIELD   = field(LIS3DH_CTRL_REG2,HP_FILTER_CUTOFF_POS,HP_FILTER_CUTOFF_SIZE)
+FULL_SCALE_FIELD         = field(LIS3DH_CTRL_REG4,FULL_SCALE_POS,FULL_SCALE_SIZE)
+SELF_TEST_FIELD          = field(LIS3DH_CTRL_REG4,SELF_TEST_POS,SELF_TEST_SIZE)
+FIFO_MODE_FIELD          = field(LIS3DH_FIFO_CTRL_REG,FIFO_MODE_POS,FIFO_MODE_SIZE)
+FIFO_THRESHOLD_FIELD     = field(LIS3DH_FIFO_CTRL_REG,FIFO_THRESHOLD_POS,FIFO_THRESHOLD_SIZE)
+FIFO_NO_OF_SAMPLES_FIELD = field(LIS3DH_FIFO_SRC_REG,FIFO_NO_OF_SAMPLES_POS,FIFO_NO_OF_SAMPLES_SIZE)
+CLICK_THRESHOLD_FIELD    = field(LIS3DH_CLICK_THS,CLICK_THRESHOLD_POS,CLICK_THRESHOLD_SIZE)
 
 class LIS3DH:
     def __init__(self,sck=18,mosi=23,miso=19,cs=26,debug=False) :
         self.debug = debug
         self.bus = None
+        self.regio = None           # RegIO object, created by the sub class for its bus
         self.temperature_calib = 37 # read 0xf4 = -13 when at 24°C. Therefore the offset is 37
+        # batched configuration, see configure()
+        self.batch = 0
+        self.shadow = bytearray(LIS3DH_NO_OF_REGISTERS)
+        self.shadow_valid = bytearray(LIS3DH_NO_OF_REGISTERS)
+        self.dirty = bytearray(LIS3DH_NO_OF_REGISTERS)
+        self.batchable = bytearray(LIS3DH_NO_OF_REGISTERS)
+        for reg in LIS3DH_CONFIG_REGISTERS :
+            self.batchable[reg] = 1
 
     @property
     def debugging(self) :
-        self.debug = onOff
+        return self.debug
     @debugging.setter
     def debugging(self,onOff) :
         self.debug = onOff
         
-    def read_byte(self, reg_addr) :     # dummy read_byte, must be overridden by sub class
-        raise Exception("read_byte must be implemented by the sub class")
+    # bus access through the RegIO object of the sub class
+    def read_byte(self, reg_addr) :
+        return self.regio.readByte(reg_addr)
 
-    def write_byte(self, reg_addr, value) :     # dummy read_byte, must be overridden by sub class
-        print("write_byte must be implemented by the sub class")
+    def write_byte(self, reg_addr, value) :
+        if self.debug :
+            print("Debug: Writing 0x{:02x} to register 0x{:02x}".format(value,reg_addr))
+        self.regio.writeByte(reg_addr,value)
 
     def read_bytes(self,reg_addr,no_of_bytes) :
-        print("read_bytes must be implemented by the sub class")
+        tmp = self.regio.read(reg_addr,no_of_bytes)
+        if self.debug :
+            print("Read {:d} bytes from 0x{:02x}".format(no_of_bytes,reg_addr & 0x7f))
+            print("Returned {:d} bytes: ".format(len(tmp)),end="")
+            for i in range(len(tmp)) :
+                print("0x{:02x} ".format(tmp[i]),end="")
+            print("")
+        return tmp
+
+    def read_word(self, reg_addr) :
+        return self.regio.readWord(reg_addr,False)
+
+    def write_bytes(self,reg_addr,buf) : # multi byte write with address auto increment
+        if self.debug :
+            print("Debug: Writing {:d} bytes starting at register 0x{:02x}".format(len(buf),reg_addr))
+        self.regio.write(reg_addr,buf)
+
+    def read_into(self,reg_addr,buf) : # multi byte read with address auto increment into buf
+        self.regio.readInto(reg_addr,buf)
+
+    # register access used by all properties
+    # inside a configure() block the configuration registers are only changed in a shadow copy
+    def read_reg(self,reg_addr) :
+        if self.batch and self.batchable[reg_addr] :
+            if not self.shadow_valid[reg_addr] :
+                self.shadow[reg_addr] = self.read_byte(reg_addr)
+                self.shadow_valid[reg_addr] = 1
+            return self.shadow[reg_addr]
+        return self.read_byte(reg_addr)
 
-    def read_word(self, reg_addr) : # dummy read_byte, must be overridden by sub class
-        raise Exception("read_word must be implemented by the sub class")
+    def write_reg(self,reg_addr,value) :
+        if self.batch and self.batchable[reg_addr] :
+            self.shadow[reg_addr] = value & 0xff
+            self.shadow_valid[reg_addr] = 1
+            self.dirty[reg_addr] = 1
+            return
+        self.write_byte(reg_addr,value & 0xff)
 
+    # Batched configuration
+    #     with lis3dh.configure() :
+    #         lis3dh.data_rate = RATE_100HZ
+    #         lis3dh.fifo_enable = True
+    #         ...
+    # writes each modified register once when the block is left, contiguous registers
+    # in a single auto-increment transfer
+    def configure(self) :
+        return self
+
+    def __enter__(self) :
+        self.batch += 1
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback) :
+        self.batch -= 1
+        if self.batch :                   # nested block, the outermost one flushes
+            return False
+        if exc_type is None :
+            self.flush()
+        for reg in range(LIS3DH_NO_OF_REGISTERS) :
+            self.shadow_valid[reg] = 0
+            self.dirty[reg] = 0
+        return False
+
+    def flush(self) :
+        shadow = memoryview(self.shadow)
+        transfers = 0
+        reg = 0
+        while reg < LIS3DH_NO_OF_REGISTERS :
+            if not self.dirty[reg] :
+                reg += 1
+                continue
+            # bridge registers with known contents if more modified registers follow
+            end = reg + 1
+            next_reg = end
+            while next_reg < LIS3DH_NO_OF_REGISTERS and self.batchable[next_reg] and \
+                  self.shadow_valid[next_reg] :
+                next_reg += 1
+                if self.dirty[next_reg-1] :
+                    end = next_reg
+            if end - reg == 1 :
+                self.write_byte(reg,self.shadow[reg])
+            else :
+                self.write_bytes(reg,shadow[reg:end])
+            transfers += 1
+            if self.debug :
+                print("Debug: flushed {:d} bytes to register 0x{:02x}".format(end-reg,reg))
+            for r in range(reg,end) :
+                self.dirty[r] = 0
+            reg = end
+        return transfers
+
+    # bit field helpers: the field starts at bitfield_pos (its most significant bit) and is
+    # bitfield_size bits wide. Masks are taken from regio.FIELD_MASKS, field values are cut
+    # to the field size. get_field/set_field take a descriptor made by regio.field(), the
+    # properties of the multi bit fields use the descriptors defined at the top of this file
     def get_bit(self,reg_addr,bit_no) :
-        mask = 1 << bit_no
-        return (self.read_byte(reg_addr) & mask) >> bit_no
+        return self.get_masked(reg_addr,bit_no,1 << bit_no)
     
     def set_bit(self,reg_addr,bit_no,on_off) :
-        mask = 1 << bit_no
-        current_value = self.read_byte(reg_addr)
-        if self.debug :
-            print("Current value in register 0x{:02x}: 0x{:02x}".format(reg_addr,current_value))
-        if on_off :
-            new_value = current_value | mask
-        else :
-            new_value = current_value & ~mask
-        if self.debug :
-            print("New value in register 0x{:02x}: 0x{:02x}".format(reg_addr,new_value))            
-        self.write_byte(reg_addr,new_value)
+        self.set_masked(reg_addr,bit_no,1 << bit_no,1 if on_off else 0)
 
     def set_bits(self,reg_addr,bitfield_pos,bitfield_size,value) :
         shift = bitfield_pos - bitfield_size +1
-        if self.debug :
-            print("Debug: shift = ",shift)
-        mask = 1
-        for i in range(bitfield_size-1):
-            mask <<= 1
-            mask |= 1
-        mask <<= shift
-        if self.debug :
-            print("Debug: mask: {:02x}".format(mask))
-        mask = ~ mask
-        current_value = self.read_byte(reg_addr)
-        new_value = current_value & mask
-        new_value |= (value << shift)
-        if self.debug:
-            print("Debug: old value: 0x{:02x}, new value: 0x{:02x}".format(
-                current_value,new_value))
-        self.write_byte(reg_addr,new_value)
-            
+        self.set_masked(reg_addr,shift,FIELD_MASKS[bitfield_size] << shift,value)
+
     def get_bits(self,reg_addr,bitfield_pos,bitfield_size) :
-        mask = 1
-        for _ in range(bitfield_size-1):
-            mask <<= 1
-            mask |= 1
         shift = bitfield_pos - bitfield_size + 1
-        mask <<= shift
-        value = (self.read_byte(reg_addr) & mask) >> shift
+        return self.get_masked(reg_addr,shift,FIELD_MASKS[bitfield_size] << shift)
+
+    def set_field(self,descriptor,value) :
+        self.set_masked(descriptor[0],descriptor[1],descriptor[2],value)
+
+    def get_field(self,descriptor) :
+        return self.get_masked(descriptor[0],descriptor[1],descriptor[2])
+
+    def set_masked(self,reg_addr,shift,mask,value) :
+        current_value = self.read_reg(reg_addr)
+        new_value = insert(current_value,shift,mask,value)
+        if self.debug:
+            print("Debug: mask: 0x{:02x}, old value: 0x{:02x}, new value: 0x{:02x}".format(
+                mask,current_value,new_value))
+        self.write_reg(reg_addr,new_value)
+
+    def get_masked(self,reg_addr,shift,mask) :
+        value = extract(self.read_reg(reg_addr),shift,mask)
         if self.debug:
             print("Debug: bitfield value: 0x{:02x}".format(value))
         return value
@@ -81,7 +181,7 @@ class LIS3DH:
     # STATUS_REG_AUX
     @property
     def status_aux(self) :
-        return self.read_byte(LIS3DH_STATUS_REG_AUX)
+        return self.read_reg(LIS3DH_STATUS_REG_AUX)
     @property
     def overrun_321(self):
         return self.get_bit(LIS3DH_STATUS_REG_AUX, OVERRUN_123)    
@@ -111,16 +211,16 @@ class LIS3DH:
     # WHO_AM_I register
     
     def getID(self) :
-        return self.read_byte(LIS3DH_WHO_AM_I)
+        return self.read_reg(LIS3DH_WHO_AM_I)
 
     # CTRL_REG0
 
     @property
     def ctrl0(self) :
-        return self.read_byte(LIS3DH_CTRL_REG0)
+        return self.read_reg(LIS3DH_CTRL_REG0)
     @ctrl0.setter
     def ctrl0(self,value) :
-        self.write_byte(LIS3DH_CTRL_REG0,value)
+        self.write_reg(LIS3DH_CTRL_REG0,value)
     @property
     def SD0_pullup(self) :
         return self.get_bit(LIS3DH_CTRL_REG0,SD0_PU_DISC)
@@ -132,10 +232,10 @@ class LIS3DH:
 
     @property
     def temp_cfg(self) :
-        return self.read_byte(LIS3DH_TEMP_CFG_REG)
+        return self.read_reg(LIS3DH_TEMP_CFG_REG)
     @temp_cfg.setter
     def temp_cfg(self, value) :
-        self.write_byte(LIS3DH_TEMP_CFG_REG,value)
+        self.write_reg(LIS3DH_TEMP_CFG_REG,value)
     @property
     def adc_enable(self,value) :
         self.get_bit(LIS3DH_TEMP_CFG_REG,ADC_PD)
@@ -152,18 +252,18 @@ class LIS3DH:
     # CTRL_REG1
     @property
     def ctrl_reg1(self) :
-        return self.read_byte(LIS3DH_CTRL_REG1)
+        return self.read_reg(LIS3DH_CTRL_REG1)
     @ctrl_reg1.setter
     def ctrl_reg1(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG1,value)
+        self.write_reg(LIS3DH_CTRL_REG1,value)
 
     @property
     def data_rate(self) :
-        return self.get_bits(LIS3DH_CTRL_REG1,RATE_POS,RATE_SIZE)
+        return self.get_field(RATE_FIELD)
 
     @data_rate.setter
     def data_rate(self,rate) :
-        self.set_bits(LIS3DH_CTRL_REG1,RATE_POS,RATE_SIZE,rate)
+        self.set_field(RATE_FIELD,rate)
 
     def print_rate(self,rate) :
         rate_signification = {RATE_POWER_DOWN: "power down",
@@ -206,7 +306,7 @@ class LIS3DH:
         return self.set_bit(LIS3DH_CTRL_REG1,Z_EN,value)
     @property
     def all_axis_enable(self) :       
-        en = self.get_bits(LIS3DH_CTRL_REG1, ALL_AXIS_EN_POS, ALL_AXIS_EN_SIZE)[0]
+        en = self.get_field(ALL_AXIS_EN_FIELD)
         if en == 1 << X_EN | 1 << Y_EN | 1 << Z_EN :
             return True
         else:
@@ -217,28 +317,28 @@ class LIS3DH:
             en = 1 << X_EN | 1 << Y_EN | 1 << Z_EN
         else :
             en = 0
-        return self.set_bits(LIS3DH_CTRL_REG1, ALL_AXIS_EN_POS, ALL_AXIS_EN_SIZE,en)
+        return self.set_field(ALL_AXIS_EN_FIELD,en)
 
 
     # CTRL_REG2
     @property
     def ctrl_reg2(self) :
-        return self.read_byte(LIS3DH_CTRL_REG2)
+        return self.read_reg(LIS3DH_CTRL_REG2)
     @ctrl_reg2.setter
     def ctrl_reg2(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG2,value)
+        self.write_reg(LIS3DH_CTRL_REG2,value)
     @property
     def high_pass_mode(self) :
-        return self.get_bits(LIS3DH_CTRL_REG2, HP_FILTER_MODE_POS, HP_FILTER_MODE_SIZE)
+        return self.get_field(HP_FILTER_MODE_FIELD)
     @high_pass_mode.setter
     def high_pass_mode(self,value) :
-        self.set_bits(LIS3DH_CTRL_REG2, HP_FILTER_MODE_POS, HP_FILTER_MODE_SIZE,value)
+        self.set_field(HP_FILTER_MODE_FIELD,value)
     @property
     def high_pass_cutoff(self) :
-        return self.get_bits(LIS3DH_CTRL_REG2, HP_FILTER_CUTOFF_POS, HP_FILTER_CUTOFF_SIZE)
+        return self.get_field(HP_FILTER_CUTOFF_FIELD)
     @high_pass_cutoff.setter
     def high_pass_cutoff(self,value) :
-        self.set_bits(LIS3DH_CTRL_REG2, HP_FILTER_CUTOFF_POS, HP_FILTER_CUTOFF_SIZE,value)
+        self.set_field(HP_FILTER_CUTOFF_FIELD,value)
     @property
     def filtered_selection(self) :
         return self.get_bit(LIS3DH_CTRL_REG2,FILTER_DATA_SEl)
@@ -249,10 +349,10 @@ class LIS3DH:
     # CTRL_REG 3
     @property
     def ctrl_reg3(self) :
-        return self.read_byte(LIS3DH_CTRL_REG3)
+        return self.read_reg(LIS3DH_CTRL_REG3)
     @ctrl_reg3.setter
     def ctrl_reg3(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG3,value)
+        self.write_reg(LIS3DH_CTRL_REG3,value)
     @property
     def i1_click(self) :
         return self.get_bit(LIS3DH_CTRL_REG3, I1_CLICK)
@@ -300,10 +400,10 @@ class LIS3DH:
     # CTRL_REG4
     @property
     def ctrl_reg4(self) :
-        return self.read_byte(LIS3DH_CTRL_REG4)
+        return self.read_reg(LIS3DH_CTRL_REG4)
     @ctrl_reg4.setter
     def ctrl_reg4(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG4,value)
+        self.write_reg(LIS3DH_CTRL_REG4,value)
     @property
     def block_data_update(self) :
         return self.get_bit(LIS3DH_CTRL_REG4, BDU)
@@ -332,16 +432,16 @@ class LIS3DH:
         self.set_bit(LIS3DH_CTRL_REG4, HIGH_RES, value)
     @property
     def full_scale(self) :
-        return self.get_bits(LIS3DH_CTRL_REG4, FULL_SCALE_POS, FULL_SCALE_SIZE)    
+        return self.get_field(FULL_SCALE_FIELD)    
     @full_scale.setter
     def full_scale(self,value) :
-        return self.set_bits(LIS3DH_CTRL_REG4, FULL_SCALE_POS, FULL_SCALE_SIZE,value)
+        return self.set_field(FULL_SCALE_FIELD,value)
     @property
     def self_test_enable(self) :
-        return self.get_bits(LIS3DH_CTRL_REG4, SELF_TEST_POS, SELF_TEST_SIZE)    
+        return self.get_field(SELF_TEST_FIELD)    
     @self_test_enable.setter
     def self_test_enable(self,value) :
-        return self.set_bits(LIS3DH_CTRL_REG4, SELF_TEST_POS, SELF_TEST_SIZE,value)    
+        return self.set_field(SELF_TEST_FIELD,value)    
     @property
     def spi_mode_3_wire(self) :
         return self.get_bit(LIS3DH_CTRL_REG4, SERIAL_INTERFACE_MODE)
@@ -352,10 +452,10 @@ class LIS3DH:
     # CTRL_REG5
     @property
     def ctrl_reg5(self) :
-        return self.read_byte(LIS3DH_CTRL_REG5)
+        return self.read_reg(LIS3DH_CTRL_REG5)
     @ctrl_reg5.setter
     def ctrl_reg5(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG5,value)
+        self.write_reg(LIS3DH_CTRL_REG5,value)
     @property
     def boot(self) :
         return self.get_bit(LIS3DH_CTRL_REG5, BOOT)    
@@ -396,10 +496,10 @@ class LIS3DH:
     # CTRL_REG6
     @property
     def ctrl_reg6(self) :
-        return self.read_byte(LIS3DH_CTRL_REG6)
+        return self.read_reg(LIS3DH_CTRL_REG6)
     @ctrl_reg6.setter
     def ctrl_reg6(self, value) :
-        self.write_byte(LIS3DH_CTRL_REG6,value)
+        self.write_reg(LIS3DH_CTRL_REG6,value)
     @property
     def i2_click(self) :
         return self.get_bit(LIS3DH_CTRL_REG5, I2_CLICK)    
@@ -440,15 +540,15 @@ class LIS3DH:
     # REFERENCE
     @property
     def reference(self) :
-        return self.read_byte(LIS3DH_CTRL_REFERENCE)
+        return self.read_reg(LIS3DH_CTRL_REFERENCE)
     @reference.setter
     def reference(self, value) :
-        self.write_byte(LIS3DH_CTRL_REFERENCE,value)
+        self.write_reg(LIS3DH_CTRL_REFERENCE,value)
 
     # STATUS_REG
     @property
     def status(self) :
-        return self.read_byte(LIS3DH_STATUS_REG)
+        return self.read_reg(LIS3DH_STATUS_REG)
     @property
     def zyx_overrun(self):
         return self.get_bit(LIS3DH_STATUS_REG, ZYX_OVERRUN)    
@@ -510,23 +610,23 @@ class LIS3DH:
     def get_ADC1_raw(self):
         #return self.read_word(LIS3DH_OUT_ADC1_L)
         tmp = bytearray(2)
-        tmp[0] = self.read_byte(LIS3DH_OUT_ADC1_L)
-        tmp[1] = self.read_byte(LIS3DH_OUT_ADC1_H)
+        tmp[0] = self.read_reg(LIS3DH_OUT_ADC1_L)
+        tmp[1] = self.read_reg(LIS3DH_OUT_ADC1_H)
         print("ADC1: high 0x{:02x}, low 0x{:02x}".format(tmp[1],tmp[0]))
         return struct.unpack('<h',tmp)[0]
     @property    
     def get_ADC2_raw(self):
         tmp = bytearray(2)
-        tmp[0] = self.read_byte(LIS3DH_OUT_ADC2_L)
-        tmp[1] = self.read_byte(LIS3DH_OUT_ADC2_H)
+        tmp[0] = self.read_reg(LIS3DH_OUT_ADC2_L)
+        tmp[1] = self.read_reg(LIS3DH_OUT_ADC2_H)
         print("ADC2: high 0x{:02x}, low 0x{:02x}".format(tmp[1],tmp[0]))
         return struct.unpack('<h',tmp)[0]
         #return self.read_word(LIS3DH_OUT_ADC2_L)
     @property
     def get_ADC3_raw(self):
         tmp = bytearray(2)
-        tmp[0] = self.read_byte(LIS3DH_OUT_ADC3_L)
-        tmp[1] = self.read_byte(LIS3DH_OUT_ADC3_H)
+        tmp[0] = self.read_reg(LIS3DH_OUT_ADC3_L)
+        tmp[1] = self.read_reg(LIS3DH_OUT_ADC3_H)
         print("ADC3: high 0x{:02x}, low 0x{:02x}".format(tmp[1],tmp[0]))
         return struct.unpack('<h',tmp)[0]
         #return self.read_word(LIS3DH_OUT_ADC3_L)
@@ -542,8 +642,8 @@ class LIS3DH:
     @property
     def raw_temperature(self):       
         tmp = bytearray(2)
-        tmp[0] = self.read_byte(LIS3DH_OUT_ADC3_L)
-        tmp[1] = self.read_byte(LIS3DH_OUT_ADC3_H)
+        tmp[0] = self.read_reg(LIS3DH_OUT_ADC3_L)
+        tmp[1] = self.read_reg(LIS3DH_OUT_ADC3_H)
         # print("temperature: high 0x{:02x}, low 0x{:02x}".format(tmp[1],tmp[0]))
         
         # print("temp 10 bits: 0x{:02x}{:02x}".format(tmp[1],tmp[0]))
@@ -564,28 +664,28 @@ class LIS3DH:
     # FIFO_CTRL_REG
     @property
     def fifo_ctrl_reg(self) :
-        return self.read_byte(LIS3DH_FIFO_CTRL_REG)
+        return self.read_reg(LIS3DH_FIFO_CTRL_REG)
     @fifo_ctrl_reg.setter
     def fifo_ctrl_reg(self, value) :
-        self.write_byte(LIS3DH_FIFO_CTRL_REG,value)
+        self.write_reg(LIS3DH_FIFO_CTRL_REG,value)
     @property
     def fifo_mode(self) :
-        return self.get_bits(LIS3DH_FIFO_CTRL_REG, FIFO_MODE_POS, FIFO_MODE_SIZE)
+        return self.get_field(FIFO_MODE_FIELD)
     @fifo_mode.setter
     def fifo_mode(self,value) :
-        self.set_bits(LIS3DH_FIFO_CTRL_REG, FIFO_MODE_POS, FIFO_MODE_SIZE,value)
+        self.set_field(FIFO_MODE_FIELD,value)
     @property
     def fifo_trigger(self) :
-        return self.get_bit(LIS3DH_FIFO_CTRL_REG, FIFO_TRIGGER_SELECT)
+        return self.get_bit(LIS3DH_FIFO_CTRL_REG, TRIGGER_SELECT)
     @fifo_trigger.setter
-    def fifo_trigger(self) :
-        self.set_bit(LIS3DH_FIFO_CTRL_REG, FIFO_TRIGGER_SELECT)
+    def fifo_trigger(self,value) :    # 0: the INT1 interrupt generator triggers stream-to-FIFO, 1: INT2
+        self.set_bit(LIS3DH_FIFO_CTRL_REG, TRIGGER_SELECT, value)
     @property
     def fifo_threshold(self) :
-        return self.get_bits(LIS3DH_FIFO_CTRL_REG, FIFO_THRESHOLD_POS, FIFO_THRESHOLD_SIZE)
+        return self.get_field(FIFO_THRESHOLD_FIELD)
     @fifo_threshold.setter
     def fifo_threshold(self,value) :
-         self.set_bits(LIS3DH_FIFO_CTRL_REG, FIFO_THRESHOLD_POS, FIFO_MODE_THRESHOLD,value)
+        self.set_field(FIFO_THRESHOLD_FIELD,value)
 
     def print_fifo_mode(self,fifo_mode) :
         fifo_modes = {FIFO_BYPASS : "Bypass",
@@ -602,10 +702,35 @@ class LIS3DH:
             tmp = self.accel_raw
         self.fifo_mode = current_fifo_mode
             
+    # reads all samples in the FIFO into buf, an array('h') with 3 values per sample
+    # FIFO_SRC_REG is read once, then all samples are read in a single burst starting at OUT_X_L:
+    # in FIFO and stream mode the register address rolls back from OUT_Z_H to OUT_X_L, and each
+    # roll over pops the next sample from the FIFO.
+    # The lis3dh delivers little endian 16 bit values (BLE = 0), the native byte order of the
+    # ESP32: the bytes read into buf are the decoded values, nothing is allocated for them
+    # The samples are stored from sample number start on, such that successive reads can fill
+    # one contiguous buffer
+    # returns the number of samples read and the FIFO overrun flag
+    def read_fifo(self,buf,start=0) :
+        src = self.read_byte(LIS3DH_FIFO_SRC_REG)
+        overrun = bool(src & (1 << FIFO_OVERRUN))
+        if overrun :
+            samples = LIS3DH_FIFO_SIZE      # the FIFO is full, older samples have been overwritten
+        else :
+            samples = src & FIFO_NO_OF_SAMPLES_MASK
+        if samples > len(buf) // 3 - start :
+            samples = len(buf) // 3 - start
+        if samples :
+            self.read_into(LIS3DH_OUT_X_L,memoryview(buf)[3*start:3*(start+samples)])
+        if self.debug :
+            print("read_fifo: FIFO_SRC_REG: 0x{:02x}, {:d} samples read, overrun: {}".format(
+                src,samples,overrun))
+        return samples,overrun
+
     # FIFO_SRC_REG
     @property
     def fifo_src_reg(self) :
-        return self.read_byte(LIS3DH_FIFO_SRC_REG)
+        return self.read_reg(LIS3DH_FIFO_SRC_REG)
     @property
     def fifo_watermark(self) :
         return self.get_bit(LIS3DH_FIFO_SRC_REG, FIFO_WATERMARK)
@@ -617,15 +742,15 @@ class LIS3DH:
         return self.get_bit(LIS3DH_FIFO_SRC_REG, FIFO_EMPTY)
     @property
     def fifo_no_of_samples(self) :
-        return self.get_bits(LIS3DH_FIFO_SRC_REG, FIFO_NO_OF_SAMPLES_POS,FIFO_NO_OF_SAMPLES_SIZE)
+        return self.get_field(FIFO_NO_OF_SAMPLES_FIELD)
 
     # INT1_CFG
     @property
     def int1_cfg(self) :
-        return self.read_byte(LIS3DH_INT1_CFG)
+        return self.read_reg(LIS3DH_INT1_CFG)
     @int1_cfg.setter
     def int1_cfg(self, value) :
-        self.write_byte(LIS3DH_FIFO_INT1_CFG,value)
+        self.write_reg(LIS3DH_INT1_CFG,value)
     @property
     def int1_aoi(self) :
         return self.get_bit(LIS3DH_INT1_CFG, INT1_AOI)
@@ -642,8 +767,8 @@ class LIS3DH:
     def int1_zhie(self) :
         return self.get_bit(LIS3DH_INT1_CFG, INT1_ZHIE)
     @int1_zhie.setter
-    def set_int1_zhie(self,value) :
-        set_bit(LIS3DH_INT1_CFG, INT1_ZHIE, value)
+    def int1_zhie(self,value) :
+        self.set_bit(LIS3DH_INT1_CFG, INT1_ZHIE, value)
     @property
     def int1_zlie(self) :
         return self.get_bit(LIS3DH_INT1_CFG, INT1_ZLIE)
@@ -667,7 +792,7 @@ class LIS3DH:
         return self.get_bit(LIS3DH_INT1_CFG, INT1_XHIE)
     @int1_xhie.setter
     def int1_xhie(self,value) :
-        self.set_bit(LIS3DH_INT1_CFG, INT1_YHIE, value)
+        self.set_bit(LIS3DH_INT1_CFG, INT1_XHIE, value)
     @property
     def int1_xlie(self) :
         return self.get_bit(LIS3DH_INT1_CFG, INT1_XLIE)
@@ -678,52 +803,52 @@ class LIS3DH:
     # INT1_SRC
     @property
     def int1_src(self) :
-        return self.read_byte(LIS3DH_INT1_SRC)
+        return self.read_reg(LIS3DH_INT1_SRC)
     @property
     def int1_src_ia(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_IA)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_IA)
     @property
     def int1_src_zh(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_ZH)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_ZH)
     @property
     def int1_src_zl(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_ZL)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_ZL)
     @property    
     def int1_src_yh(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_YH)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_YH)
     @property    
     def int1_src_yl(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_YL)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_YL)
     @property    
     def int1_src_xh(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_XH)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_XH)
     @property    
     def int1_src_xl(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_XL)
+        return self.get_bit(LIS3DH_INT1_SRC, INT1_SRC_XL)
     
     # INT1_THS 
     @property
     def int1_ths(self) :
-        return self.read_byte(LIS3DH_INT1_THS)
+        return self.read_reg(LIS3DH_INT1_THS)
     @int1_ths.setter
     def int1_ths(self,value) :
-        self.write_byte(LIS3DH_INT1_THS,value)
+        self.write_reg(LIS3DH_INT1_THS,value)
 
     # INT1_DURATION
     @property
     def int1_duration(self) :
-        return self.read_byte(LIS3DH_INT1_DURATION)
+        return self.read_reg(LIS3DH_INT1_DURATION)
     @int1_duration.setter
     def int1_duration(self,value) :
-        self.write_byte(LIS3DH_INT1_DURATION,value)
+        self.write_reg(LIS3DH_INT1_DURATION,value)
 
     # INT2_CFG
     @property
     def int2_cfg(self) :
-        return self.read_byte(LIS3DH_INT2_CFG)
+        return self.read_reg(LIS3DH_INT2_CFG)
     @int2_cfg.setter
     def int2_cfg(self, value) :
-        self.write_byte(LIS3DH_FIFO_INT2_CFG,value)
+        self.write_reg(LIS3DH_INT2_CFG,value)
     @property
     def int2_aoi(self) :
         return self.get_bit(LIS3DH_INT2_CFG, INT2_AOI)
@@ -740,7 +865,7 @@ class LIS3DH:
     def int2_zhie(self) :
         return self.get_bit(LIS3DH_INT2_CFG, INT2_ZHIE)
     @int2_zhie.setter
-    def set_int2_zhie(self,value) :
+    def int2_zhie(self,value) :
         self.set_bit(LIS3DH_INT2_CFG, INT2_ZHIE, value)
     @property     
     def int2_zlie(self) :
@@ -765,63 +890,63 @@ class LIS3DH:
         return self.get_bit(LIS3DH_INT2_CFG, INT2_XHIE)
     @int2_xhie.setter
     def int2_xhie(self,value) :
-        self.set_bit(LIS3DH_INT2_CFG, INT2_YHIE, value)
+        self.set_bit(LIS3DH_INT2_CFG, INT2_XHIE, value)
     @property
     def int2_xlie(self) :
         return self.get_bit(LIS3DH_INT2_CFG, INT2_XLIE)
-    int2_xlie.setter
+    @int2_xlie.setter
     def int2_xlie(self,value) :
         self.set_bit(LIS3DH_INT2_CFG, INT2_XLIE, value)
          
     # INT2_SRC
     @property
     def int2_src(self) :
-        return self.read_byte(LIS3DH_INT2_SRC)
+        return self.read_reg(LIS3DH_INT2_SRC)
     @property
     def int2_src_ia(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_IA)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_IA)
     @property
     def int2_src_zh(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_ZH)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_ZH)
     @property    
     def int2_src_zl(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_ZL)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_ZL)
     @property    
     def int2_src_yh(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_YH)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_YH)
     @property    
     def int2_src_yl(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_YL)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_YL)
     @property    
     def int2_src_xh(self) :
-        return self.get_bit(LIS3DH_INT2_CFG, INT2_SRC_XH)
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_XH)
     @property    
-    def int1_src_xl(self) :
-        return self.get_bit(LIS3DH_INT1_CFG, INT1_SRC_XL)
+    def int2_src_xl(self) :
+        return self.get_bit(LIS3DH_INT2_SRC, INT2_SRC_XL)
 
     # INT2_THS 
     @property    
     def int2_ths(self) :
-        return self.read_byte(LIS3DH_INT2_THS)
+        return self.read_reg(LIS3DH_INT2_THS)
     @int2_ths.setter
     def int2_ths(self,value) :
-        self.write_byte(LIS3DH_INT2_THS,value)
+        self.write_reg(LIS3DH_INT2_THS,value)
 
     # INT1_DURATION
     @property
     def int2_duration(self) :
-        return self.read_byte(LIS3DH_INT2_DURATION)
+        return self.read_reg(LIS3DH_INT2_DURATION)
     @int2_duration.setter
     def int2_duration(self,value) :
-        self.write_byte(LIS3DH_INT2_DURATION,value)
+        self.write_reg(LIS3DH_INT2_DURATION,value)
 
     # CLICK_CFG
     @property
     def click_cfg(self) :
-        return self.read_byte(LIS3DH_CLICK_CFG)
+        return self.read_reg(LIS3DH_CLICK_CFG)
     @click_cfg.setter
     def click_cfg(self,value) :
-        self.write_byte(LIS3DH_CLICK_CFG,value)   
+        self.write_reg(LIS3DH_CLICK_CFG,value)   
     @property
     def click_zd(self) :
         return self.get_bit(LIS3DH_CLICK_CFG, CLICK_ZD)
@@ -862,10 +987,10 @@ class LIS3DH:
     # CLICK_SRC
     @property
     def click_src(self) :
-        return self.read_byte(LIS3DH_CLICK_SRC)
+        return self.read_reg(LIS3DH_CLICK_SRC)
     @click_src.setter
     def click_src(self,value) :
-        self.write_byte(LIS3DH_CLICK_SRC,value)   
+        self.write_reg(LIS3DH_CLICK_SRC,value)   
     @property
     def click_src_ia(self) :
         return self.get_bit(LIS3DH_CLICK_SRC, CLICK_SRC_IA)
@@ -912,10 +1037,10 @@ class LIS3DH:
     # CLICK_THS
     @property
     def click_ths(self) :
-        return self.read_byte(LIS3DH_CLICK_THS)
+        return self.read_reg(LIS3DH_CLICK_THS)
     @click_ths.setter
     def click_ths(self,value) :
-        self.write_byte(LIS3DH_CLICK_THS,value)          
+        self.write_reg(LIS3DH_CLICK_THS,value)          
     @property
     def lir_click(self) :
          return self.get_bit(LIS3DH_CLICK_THS, LIR_CLICK)
@@ -924,7 +1049,7 @@ class LIS3DH:
          self.set_bit(LIS3DH_CLICK_SRC, LIR_CLICK, value)
     @property
     def click_threshold(self) :
-         return self.get_bits(LIS3DH_CLICK_THS, CLICK_THRESHOLD_POS, CLICK_THRESHOLD_SIZE)
+         return self.get_field(CLICK_THRESHOLD_FIELD)
     @click_threshold.setter
     def click_threshold(self,value) :
          self.set_bit(LIS3DH_CLICK_THS, CLICK_THRESHOLD_POS, CLICK_THRESHOLD_SIZE, value)
@@ -932,42 +1057,42 @@ class LIS3DH:
     # TIME_LIMIT
     @property
     def time_limit(self) :
-        return self.read_byte(LIS3DH_TIME_LIMIT)
+        return self.read_reg(LIS3DH_TIME_LIMIT)
     @time_limit.setter
     def time_limit(self,value) :
-        self.write_byte(LIS3DH_TIME_LIMIT,value)     
+        self.write_reg(LIS3DH_TIME_LIMIT,value)     
 
     # TIME_LATENCY
     @property
     def time_latency(self) :
-        return self.read_byte(LIS3DH_TIME_LATENCY)
+        return self.read_reg(LIS3DH_TIME_LATENCY)
     @time_latency.setter
     def time_latency(self,value) :
-        self.write_byte(LIS3DH_TIME_LATENCY,value)     
+        self.write_reg(LIS3DH_TIME_LATENCY,value)     
 
     # TIME_WINDOW
     @property
     def time_window(self) :
-        return self.read_byte(LIS3DH_TIME_WINDOW)
+        return self.read_reg(LIS3DH_TIME_WINDOW)
     @time_window.setter
     def time_window(self,value) :
-        self.write_byte(LIS3DH_TIME_WINDOW,value)
+        self.write_reg(LIS3DH_TIME_WINDOW,value)
         
     # ACT_THS
     @property
     def activation_threshold(self) :
-        return self.read_byte(LIS3DH_ACT_THS)
+        return self.read_reg(LIS3DH_ACT_THS)
     @activation_threshold.setter
     def activation_threshold(self,value) :
-        self.write_byte(LIS3DH_ACT_THS,value)
+        self.write_reg(LIS3DH_ACT_THS,value)
         
     # ACT_DUR
     @property
     def activation_duration(self) :
-        return self.read_byte(LIS3DH_ACT_DUR)
+        return self.read_reg(LIS3DH_ACT_DUR)
     @activation_duration.setter
     def activation_duration(self,value) :
-        self.write_byte(LIS3DH_ACT_DUR,value)
+        self.write_reg(LIS3DH_ACT_DUR,value)
         
 
     
@@ -54,6 +54,16 @@ LIS3DH_TIME_WINDOW              = const(0x3d)
 LIS3DH_ACT_THS                  = const(0x3e)
 LIS3DH_ACT_DUR                  = const(0x3f)
 
+LIS3DH_NO_OF_REGISTERS          = const(0x40)
+LIS3DH_FIFO_SIZE                = const(32)    # FIFO levels
+LIS3DH_SAMPLE_SIZE              = const(6)     # bytes per sample: x, y, z, 16 bits each
+# registers only changed by the user, these can be collected in a configure() block
+LIS3DH_CONFIG_REGISTERS         = tuple(range(LIS3DH_CTRL_REG0,LIS3DH_REFERENCE+1)) + \
+                                  (LIS3DH_FIFO_CTRL_REG,LIS3DH_INT1_CFG,LIS3DH_INT1_THS,
+                                   LIS3DH_INT1_DURATION,LIS3DH_INT2_CFG,LIS3DH_INT2_THS,
+                                   LIS3DH_INT2_DURATION,LIS3DH_CLICK_CFG) + \
+                                  tuple(range(LIS3DH_CLICK_THS,LIS3DH_ACT_DUR+1))
+
 # Status register aux
 DATA_AVAILABLE_1                = 0 # data available
 DATA_AVAILABLE_2                = 1
@@ -195,6 +205,7 @@ FIFO_EMPTY                      = 5
 
 FIFO_NO_OF_SAMPLES_POS          = 4
 FIFO_NO_OF_SAMPLES_SIZE         = 5
+FIFO_NO_OF_SAMPLES_MASK         = 0x1f
 
 # INT1_CFG
 
@@ -217,8 +228,8 @@ INT1_SRC_ZH                     = 5
 INT1_SRC_ZL                     = 4
 INT1_SRC_YH                     = 3
 INT1_SRC_YL                     = 2
-INT1_SRC_ZH                     = 1
-INT1_SRC_ZL                     = 0
+INT1_SRC_XH                     = 1
+INT1_SRC_XL                     = 0
 
 # INT2_CFG
 INT2_AOI                        = 7
@@ -237,8 +248,8 @@ INT2_SRC_ZH                     = 5
 INT2_SRC_ZL                     = 4
 INT2_SRC_YH                     = 3
 INT2_SRC_YL                     = 2
-INT2_SRC_ZH                     = 1
-INT2_SRC_ZL                     = 0
+INT2_SRC_XH                     = 1
+INT2_SRC_XL                     = 0
 
 # CLICK_CFG
 
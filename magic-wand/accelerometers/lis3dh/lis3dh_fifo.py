@@ -1,11 +1,14 @@
 # lis3dh_fifo.py: Reads the accelerometer data from the fifo
+# The FIFO runs in stream mode at 400 Hz and is emptied with a single burst read
+# per call to read_fifo
 # Copyright (c) U. Raich, March 2022
 # This program is part of the course on TinyML at the University of Cape Coast, Ghana
 # It is released under the MIT license
 
 from lis3dh_i2c import LIS3DH_I2C
 from lis3dh_const import *
-from utime import sleep_ms
+from utime import sleep_ms, ticks_ms, ticks_diff
+from array import array
 
 # Create a LIS3DH onject running on the I2C bus
 lis3dh = LIS3DH_I2C()
@@ -18,20 +21,22 @@ sleep_ms(5)
 # ctrl5 = lis3dh.ctrl_reg5
 print("CTRL_REG_5 after boot: 0x{:02x}".format(lis3dh.ctrl_reg5))
 
-# set the data rate to 100 Hz
-print("Set data rate to 100 Hz")
-lis3dh.data_rate = RATE_100HZ
+# collect the configuration and write it in as few bus transfers as possible
+with lis3dh.configure() :
+    # set the data rate to 400 Hz
+    print("Set data rate to 400 Hz")
+    lis3dh.data_rate = RATE_400HZ
 
-# enable high resolution
-print("Set to high resolution")
-lis3dh.high_res = True
+    # enable high resolution
+    print("Set to high resolution")
+    lis3dh.high_res = True
 
-# set FIFO to FIFO mode
-print("Seting FIFO to FIFO mode")
-lis3dh.fifo_mode = FIFO_MODE_FIFO
+    # set FIFO to stream mode, the FIFO keeps the latest 32 samples
+    print("Seting FIFO to stream mode")
+    lis3dh.fifo_mode = FIFO_MODE_STREAM
+    #enable the FIFO
+    lis3dh.fifo_enable = True
 print("FIFO mode is now " + lis3dh.print_fifo_mode(lis3dh.fifo_mode))
-#enable the FIFO
-lis3dh.fifo_enable = True
 
 print("CTRL_REG1: 0x{:02x}".format(lis3dh.ctrl_reg1))
 
@@ -48,13 +53,21 @@ print("status_reg: 0x{:02x}".format(lis3dh.status))
 #  enable all axes, normal mode
 lis3dh.all_axis_enable = True
 
+# room for a full FIFO, 3 values per sample
+samples = array('h',[0]*3*LIS3DH_FIFO_SIZE)
+
+total = 0
+overruns = 0
+startTime = ticks_ms()
 while True:
-    if not lis3dh.fifo_empty :
-        if lis3dh.zyx_overrun :
-            print("Overrun error")
-            lis3dh.clear_fifo()    
-        else:
-            accel=lis3dh.accel_raw
-            print("accel_x: {:d}, accel_y: {:d}, accel_z: {:d}".format(accel[0],accel[1],accel[2]))
-    else :
-        sleep_ms(1)
+    n,overrun = lis3dh.read_fifo(samples)
+    total += n
+    if overrun :
+        overruns += 1
+    if ticks_diff(ticks_ms(),startTime) >= 1000 :
+        print("{:d} samples/s, overruns: {:d}, last: accel_x: {:d}, accel_y: {:d}, accel_z: {:d}".format(
+            total,overruns,samples[0],samples[1],samples[2]))
+        total = 0
+        overruns = 0
+        startTime = ticks_ms()
+    sleep_ms(40)                  # the FIFO holds 80 ms of data at 400 Hz
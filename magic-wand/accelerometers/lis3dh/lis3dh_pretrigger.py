@@ -0,0 +1,46 @@
+# lis3dh_pretrigger.py: captures complete gestures, including the 32 samples preceding
+# the movement, with the FIFO in stream-to-FIFO mode triggered by the INT1 interrupt generator
+# Between two gestures the program only sleeps, the lis3dh watches for the movement
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of the course on TinyML at the University of Cape Coast, Ghana
+# It is released under the MIT license
+
+from lis3dh_i2c import LIS3DH_I2C
+from lis3dh_const import *
+from lis3dh_trigger import LIS3DH_TriggerCapture
+from utime import sleep_ms, sleep
+
+INT1_PIN = 5             # the ESP32 pin connected to the lis3dh INT1 line
+SAMPLES = 200            # samples per gesture, 2 s at 100 Hz
+THRESHOLD = 80           # 1.28 g at +-2 g, 16 mg per LSB
+
+# Create a LIS3DH onject running on the I2C bus
+lis3dh = LIS3DH_I2C()
+
+print("Reboot the device")
+lis3dh.boot = True
+sleep_ms(5)
+
+with lis3dh.configure() :
+    lis3dh.data_rate = RATE_100HZ
+    lis3dh.high_res = True
+    lis3dh.all_axis_enable = True
+
+capture = LIS3DH_TriggerCapture(lis3dh,int_pin=INT1_PIN,samples=SAMPLES,threshold=THRESHOLD)
+
+while True:
+    print("Waiting for a gesture")
+    capture.arm()
+    while not capture.ready() :
+        sleep_ms(100)
+    gesture,n = capture.get_gesture()
+    peak = [0,0,0]
+    for i in range(0,3*n,3) :
+        for axis in range(3) :
+            if abs(gesture[i+axis]) > abs(peak[axis]) :
+                peak[axis] = gesture[i+axis]
+    print("Gesture: {:d} samples, {:d} before the trigger, overruns: {:d}".format(
+        n,LIS3DH_FIFO_SIZE,capture.overruns))
+    print("first: accel_x: {:d}, accel_y: {:d}, accel_z: {:d}".format(gesture[0],gesture[1],gesture[2]))
+    print("peak:  accel_x: {:d}, accel_y: {:d}, accel_z: {:d}".format(peak[0],peak[1],peak[2]))
+    sleep(1)
@@ -0,0 +1,32 @@
+# lis3dh_spi.py: the subclass of lis3dh using the SPI interface.
+#                use this if you want to access the lis3dh with SPI
+# The class only implements the class initialization, which creates the RegIO object
+# for the SPI interface
+# All other methods are implemented in the lis3dh super class
+# The lis3dh accepts SPI clocks up to 10 MHz in mode 3 (CPOL = 1, CPHA = 1).
+# The command byte holds the register address in bits 0..5, the multi-byte (address
+# auto increment) flag in bit 6 and the read flag in bit 7. SPITransport sets these bits,
+# the register addresses passed in are masked to 6 bits.
+# The pins are the ones of the I2C wiring: SCL/SPC = sck, SDA/SDI = mosi, SA0/SDO = miso
+# Copyright (c) U. Raich, Oct. 2026
+# This program is part of the course on TinyML at the University of Cape Coast, Ghana
+# It is released under the MIT license
+
+from lis3dh import LIS3DH
+from bustransport import SPITransport
+from regio import RegIO
+from lis3dh_const import *
+import sys
+
+class LIS3DH_SPI(LIS3DH) :
+    def __init__(self,sck=18,mosi=23,miso=19,cs=26,bus=1,baudrate=5000000,spi=None,debug=False) :
+        super().__init__(sck=sck,mosi=mosi,miso=miso,cs=cs,debug=debug)
+        self.bus = SPITransport(spi=spi,cs=cs,bus=bus,sck=sck,mosi=mosi,miso=miso,
+                                baudrate=baudrate)
+        self.regio = RegIO(self.bus,None)
+        who_am_i = self.getID()
+        if self.debug :
+            print("who am i: 0x{:02x}".format(who_am_i))
+        if who_am_i != LIS3DH_ID :
+            print("lis3dh is not connected to the SPI bus. Giving up...")
+            sys.exit(-1)
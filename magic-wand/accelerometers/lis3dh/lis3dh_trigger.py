@@ -0,0 +1,187 @@
+# lis3dh_trigger.py: pre-trigger gesture capture with the lis3dh FIFO in stream-to-FIFO mode
+# While armed, the FIFO runs in stream-to-FIFO mode and the INT1 interrupt generator
+# (int1_cfg, int1_ths, int1_duration) watches for activity: the high events of the enabled
+# axes in OR combination. The FIFO keeps the latest 32 samples like in stream mode until the
+# generator fires, then continues in FIFO mode and stops collecting once it is full: it
+# holds the 32 samples up to the event. The generator is routed to the INT1 pin and latched,
+# until then the CPU does nothing at all: no polling, no bus transfer.
+# On the event the FIFO is switched to stream mode with the watermark interrupt on INT1, the
+# 32 pre-event samples and the samples following them are read into one contiguous gesture
+# buffer until it holds the requested number of samples.
+# The FIFO stops while the event is serviced, switching to stream mode lets it continue: a
+# sample arriving before the pre-event samples are read replaces the oldest of them, such that
+# the gesture stays contiguous.
+#
+# Typical use:
+#     capture = LIS3DH_TriggerCapture(lis3dh,int_pin=5,samples=200)
+#     capture.arm()
+#     while not capture.ready() :
+#         sleep_ms(100)
+#     gesture,n = capture.get_gesture()
+#
+# The data rate, the full scale and the resolution are set up by the caller, the capture uses
+# INT1 and CTRL_REG3 (the interrupts routed to INT1) on its own.
+#
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of the course on TinyML at the University of Cape Coast, Ghana
+# It is released under the MIT license
+
+from machine import Pin
+from micropython import const, schedule
+from array import array
+
+from lis3dh_const import *
+
+IDLE      = const(0)
+ARMED     = const(1)              # waiting for the trigger event
+CAPTURING = const(2)              # reading the post-trigger samples
+DONE      = const(3)              # the gesture buffer is complete
+
+MAX_READS = const(4)              # max FIFO reads per scheduled service
+
+# high events on all 3 axes in OR combination
+INT1_ACTIVITY = (1 << INT1_XHIE) | (1 << INT1_YHIE) | (1 << INT1_ZHIE)
+
+class LIS3DH_TriggerCapture(object) :
+
+    def __init__(self,lis3dh,int_pin=5,samples=200,watermark=16,threshold=80,duration=0,axes=INT1_ACTIVITY) :
+        # lis3dh:    the LIS3DH_I2C or LIS3DH_SPI object
+        # int_pin:   the ESP32 pin connected to the lis3dh INT1 line
+        # samples:   number of samples in a gesture, the 32 pre-event samples included
+        # watermark: FIFO samples raising the watermark interrupt after the event (1..31)
+        # threshold: int1_ths, 16 mg per LSB at +-2 g, 32 at +-4 g, 62 at +-8 g, 186 at +-16 g
+        # duration:  int1_duration, number of samples the threshold must be exceeded
+        # axes:      int1_cfg, the events of the interrupt generator
+        if watermark < 1 or watermark >= LIS3DH_FIFO_SIZE :
+            raise ValueError("watermark must be between 1 and {:d}".format(LIS3DH_FIFO_SIZE-1))
+        if samples <= LIS3DH_FIFO_SIZE :
+            raise ValueError("samples must be larger than {:d}".format(LIS3DH_FIFO_SIZE))
+        self.lis3dh = lis3dh
+        self.pin = Pin(int_pin,Pin.IN)
+        self.samples = samples
+        self.watermark = watermark
+        self.threshold = threshold
+        self.duration = duration
+        self.axes = axes
+        self.gesture = array('h',[0]*3*samples)
+        self.count = 0                # samples in the gesture buffer
+        self.state = IDLE
+        self.pending = False          # a service call has been scheduled
+        # statistics
+        self.triggers = 0
+        self.overruns = 0             # samples were lost, the gesture is not contiguous
+        # allocate the bound methods once: the interrupt handler must not allocate memory
+        self.service_ref = self.service
+        self.irq_ref = self.irq
+
+    def arm(self) :
+        # prepare the capture of the next gesture
+        lis = self.lis3dh
+        self.state = IDLE
+        # going through bypass mode empties the FIFO and re-arms the trigger
+        lis.fifo_mode = FIFO_BYPASS
+        with lis.configure() :
+            lis.ctrl_reg3 = 1 << I1_IA1
+            lis.fifo_enable = True
+            lis.lir_int1 = True
+            lis.fifo_ctrl_reg = FIFO_MODE_STREAM_TO_FIFO << (FIFO_MODE_POS-1) | self.watermark
+            lis.int1_cfg = self.axes
+            lis.int1_ths = self.threshold
+            lis.int1_duration = self.duration
+        lis.int1_src                      # clear the latched interrupt
+        self.count = 0
+        self.overruns = 0
+        self.pending = False
+        self.state = ARMED
+        self.pin.irq(trigger=Pin.IRQ_RISING,handler=self.irq_ref)
+
+    def disarm(self) :
+        self.state = IDLE
+        self.pin.irq(handler=None)
+        self.stop()
+
+    def stop(self) :
+        lis = self.lis3dh
+        with lis.configure() :
+            lis.ctrl_reg3 = 0
+            lis.int1_cfg = 0
+        lis.fifo_mode = FIFO_BYPASS
+
+    def irq(self,pin) :
+        # runs in interrupt context: no bus transfer, no memory allocation, just schedule the service
+        if self.pending :
+            return
+        self.pending = True
+        try :
+            schedule(self.service_ref,0)
+        except RuntimeError :             # the schedule queue is full, ready() polls the line
+            self.pending = False
+
+    def service(self,arg=None) :
+        # scheduled by the interrupt handler, runs in the main thread between two bytecodes
+        self.pending = False
+        first = False
+        if self.state == ARMED :
+            if not self.trigger_event() :
+                return
+            first = True
+        if self.state != CAPTURING :
+            return
+        lis = self.lis3dh
+        for _ in range(MAX_READS) :
+            n,overrun = lis.read_fifo(self.gesture,self.count)
+            # the FIFO is always full when the pre-event samples are read
+            if overrun and not first :
+                self.overruns += 1
+            first = False
+            self.count += n
+            if self.count >= self.samples :
+                self.finish()
+                return
+            # the watermark interrupt is a level: if the FIFO filled up above the watermark
+            # again while we were reading, there will be no new rising edge
+            if not self.pin.value() :
+                break
+        # still above the watermark after MAX_READS reads: INT1 stays high and there will be
+        # no rising edge, schedule the next service now
+        if self.pin.value() :
+            self.irq(self.pin)
+
+    def trigger_event(self) :
+        # INT1 went up while armed: check the interrupt generator, then let the FIFO continue
+        # in stream mode and route its watermark to INT1 instead of the generator
+        lis = self.lis3dh
+        if not lis.int1_src & (1 << INT1_SRC_IA) :
+            return False
+        lis.fifo_ctrl_reg = FIFO_MODE_STREAM << (FIFO_MODE_POS-1) | self.watermark
+        with lis.configure() :
+            lis.ctrl_reg3 = 1 << I1_WTM
+            lis.int1_cfg = 0
+        lis.int1_src                      # release the latched interrupt
+        self.triggers += 1
+        self.state = CAPTURING
+        return True
+
+    def finish(self) :
+        # the gesture buffer is complete: stop the FIFO until the next arm()
+        self.state = DONE
+        self.pin.irq(handler=None)
+        self.stop()
+
+    def ready(self) :
+        # True once a complete gesture has been captured
+        # If INT1 is high without a service pending, the service could not be scheduled:
+        # run it here, otherwise the capture would stop for good
+        if (self.state == ARMED or self.state == CAPTURING) and not self.pending and self.pin.value() :
+            self.service()
+        return self.state == DONE
+
+    def triggered(self) :
+        # True once the trigger event has been seen
+        return self.state >= CAPTURING
+
+    def get_gesture(self) :
+        # returns the gesture buffer, an array('h') with 3 values per sample, and the number
+        # of samples in it. The first 32 samples precede the event (fewer if the event came
+        # less than 32 samples after arm())
+        return self.gesture,self.count
@@ -0,0 +1,40 @@
+# MPU6050_fifo.py: streams accelerometer and gyroscope data at 1 kHz through the
+# hardware FIFO of the MPU6050
+# The program sleeps between FIFO drains and prints the number of frames received,
+# the number of FIFO overflows and the last frame once per second
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+
+import sys
+from utime import sleep_ms, ticks_ms, ticks_diff
+from array import array
+from MPU6050_const import *
+from MPU6050 import MPU6050
+from MPU6050_fifo import FIFOStream
+
+accelgyro = MPU6050()
+if not accelgyro.testConnection():
+    print("MPU6050 connection failed")
+    sys.exit()
+
+with accelgyro.configure():
+    accelgyro.setDLPFMode(MPU6050_DLPF_BW_188)     # gyro output rate: 1 kHz
+    accelgyro.setRate(0)                           # sample rate: 1 kHz / (1 + 0)
+
+stream = FIFOStream(accelgyro,accel=True,gyro=True)
+stream.start()
+
+frame = array('h',[0]*stream.words)
+received = 0
+startTime = ticks_ms()
+while True:
+    stream.drain()
+    while stream.read(frame):
+        received += 1
+    if ticks_diff(ticks_ms(),startTime) >= 1000:
+        print("{:d} frames/s, overflows: {:d}, ax: {:d} ay: {:d} az: {:d} gx: {:d} gy: {:d} gz: {:d}".format(
+            received,stream.overflows,frame[0],frame[1],frame[2],frame[3],frame[4],frame[5]))
+        received = 0
+        startTime = ticks_ms()
+    sleep_ms(40)
@@ -0,0 +1,111 @@
+# currentFIFOPacketTest.py: checks GetCurrentFIFOPacket against a simulated FIFO
+# The MPU6050 is created as usual, then its I2C bus is replaced by a simulation of the
+# FIFO registers, which lets us put any number of packets, partial packets or an
+# overflowed FIFO in front of GetCurrentFIFOPacket
+# Copyright (c) U. Raich Oct. 2026
+# This program is part of a course on machine learning at the University of Cape Coast,Ghana
+# It is released under the MIT license
+
+import sys
+from MPU6050_const import *
+from MPU6050 import MPU6050
+
+class SimulatedFIFOBus:
+    '''
+    Emulates FIFO_COUNTH/L, FIFO_R_W and the FIFO reset bit in USER_CTRL
+    Each packet is filled with its sequence number
+    '''
+    def __init__(self,length):
+        self.length = length
+        self.fifo = bytearray()
+        self.sequence = 0
+        self.reads = 0                    # number of I2C transfers
+        self.afterReset = 0               # packets arriving after a FIFO reset
+
+    def push(self,packets,partial=0):
+        for _ in range(packets):
+            self.sequence += 1
+            self.fifo.extend(bytes([self.sequence & 0xff])*self.length)
+        self.fifo.extend(bytes(partial))
+
+    def readfrom_mem_into(self,addr,register,buf):
+        self.reads += 1
+        if register == MPU6050_RA_FIFO_COUNTH:
+            if not self.fifo and self.afterReset:
+                self.push(self.afterReset)
+                self.afterReset = 0
+            buf[0] = len(self.fifo) >> 8
+            buf[1] = len(self.fifo) & 0xff
+        elif register == MPU6050_RA_FIFO_R_W:
+            n = len(buf)
+            buf[:] = self.fifo[:n]
+            self.fifo = self.fifo[n:]
+        else:
+            for i in range(len(buf)):
+                buf[i] = 0
+
+    def readfrom_mem(self,addr,register,length):
+        buf = bytearray(length)
+        self.readfrom_mem_into(addr,register,buf)
+        return buf
+
+    def writeto_mem(self,addr,register,buf):
+        if register == MPU6050_RA_USER_CTRL and buf[0] & (1 << MPU6050_USERCTRL_FIFO_RESET_BIT):
+            self.fifo = bytearray()
+
+errors = 0
+def check(name,result,expected):
+    global errors
+    if result == expected:
+        print("{:40s} ok".format(name))
+    else:
+        print("{:40s} failed: {:s} expected {:s}".format(name,str(result),str(expected)))
+        errors += 1
+
+mpu = MPU6050()
+sim = SimulatedFIFOBus(MPU6050_DMP_PACKET_SIZE)
+mpu.i2c = sim
+mpu.regio.bus = sim
+
+status,packet = mpu.GetCurrentFIFOPacket()
+check("empty FIFO",(status,packet),(0,None))
+
+sim.reads = 0
+sim.push(1)
+status,packet = mpu.GetCurrentFIFOPacket()
+check("single packet",(status,packet[0],len(packet)),(1,1,MPU6050_DMP_PACKET_SIZE))
+check("single packet, bus transfers",sim.reads,2)
+
+sim.reads = 0
+sim.push(4)                               # 168 bytes: below the reset threshold
+status,packet = mpu.GetCurrentFIFOPacket()
+check("stale packets discarded",(status,packet[0]),(2,5))
+check("stale packets, bytes left in FIFO",len(sim.fifo),0)
+print("stale packets, bus transfers: {:d}".format(sim.reads))
+
+sim.push(10)                              # 420 bytes: reset and wait for the next packet
+sim.afterReset = 1
+status,packet = mpu.GetCurrentFIFOPacket()
+check("overflow recovery",(status,packet[0]),(2,16))
+
+sim.push(10)                              # reset, but no new packet arrives in time
+status,packet = mpu.GetCurrentFIFOPacket()
+check("overflow, timeout",(status,packet),(0,None))
+
+sim.push(0,partial=10)                    # a packet is being written
+status,packet = mpu.GetCurrentFIFOPacket()
+check("partial packet, timeout",(status,packet),(0,None))
+sim.fifo = bytearray()
+
+sim.push(3,partial=10)                    # a new packet is being written behind the old ones
+status,packet = mpu.GetCurrentFIFOPacket()
+check("partial packet after stale ones",(status,packet[0]),(2,29))
+check("partial packet stays in the FIFO",len(sim.fifo),10)
+sim.fifo = bytearray()
+
+print("packets: {:d}, FIFO resets: {:d}, bytes discarded: {:d}, timeouts: {:d}".format(
+    *mpu.getFIFOPacketStats()))
+if errors:
+    print("{:d} tests failed".format(errors))
+    sys.exit()
+print("All tests passed")
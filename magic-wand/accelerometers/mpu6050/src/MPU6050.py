@@ -41,13 +41,33 @@ THE SOFTWARE.
 '''
 
 from machine import Pin,I2C,SoftI2C
-from struct import pack
+from struct import pack, unpack_from
 from MPU6050_const import *
-from time import sleep_ms, sleep_us, time
+from time import sleep_ms, sleep_us, ticks_us, ticks_diff
+from binascii import crc32
+from regio import RegIO, FIELD_MASKS, field, extract, insert
+
+# bit field descriptors (register, shift, mask) of the multi bit fields, computed once at import
+MPU6050_WHO_AM_I_FIELD              = field(MPU6050_RA_WHO_AM_I,MPU6050_WHO_AM_I_BIT,MPU6050_WHO_AM_I_LENGTH)
+MPU6050_PWR1_CLKSEL_FIELD           = field(MPU6050_RA_PWR_MGMT_1,MPU6050_PWR1_CLKSEL_BIT,MPU6050_PWR1_CLKSEL_LENGTH)
+MPU6050_PWR2_LP_WAKE_CTRL_FIELD     = field(MPU6050_RA_PWR_MGMT_2,MPU6050_PWR2_LP_WAKE_CTRL_BIT,MPU6050_PWR2_LP_WAKE_CTRL_LENGTH)
+MPU6050_CFG_EXT_SYNC_SET_FIELD      = field(MPU6050_RA_CONFIG,MPU6050_CFG_EXT_SYNC_SET_BIT,MPU6050_CFG_EXT_SYNC_SET_LENGTH)
+MPU6050_CFG_DLPF_CFG_FIELD          = field(MPU6050_RA_CONFIG,MPU6050_CFG_DLPF_CFG_BIT,MPU6050_CFG_DLPF_CFG_LENGTH)
+MPU6050_GCONFIG_FS_SEL_FIELD        = field(MPU6050_RA_GYRO_CONFIG,MPU6050_GCONFIG_FS_SEL_BIT,MPU6050_GCONFIG_FS_SEL_LENGTH)
+MPU6050_ACONFIG_AFS_SEL_FIELD       = field(MPU6050_RA_ACCEL_CONFIG,MPU6050_ACONFIG_AFS_SEL_BIT,MPU6050_ACONFIG_AFS_SEL_LENGTH)
+MPU6050_ACONFIG_ACCEL_HPF_FIELD     = field(MPU6050_RA_ACCEL_CONFIG,MPU6050_ACONFIG_ACCEL_HPF_BIT,MPU6050_ACONFIG_ACCEL_HPF_LENGTH)
+MPU6050_I2C_MST_CLK_FIELD           = field(MPU6050_RA_I2C_MST_CTRL,MPU6050_I2C_MST_CLK_BIT,MPU6050_I2C_MST_CLK_LENGTH)
+MPU6050_I2C_SLV4_MST_DLY_FIELD      = field(MPU6050_RA_I2C_SLV4_CTRL,MPU6050_I2C_SLV4_MST_DLY_BIT,MPU6050_I2C_SLV4_MST_DLY_LENGTH)
+MPU6050_DETECT_ACCEL_ON_DELAY_FIELD = field(MPU6050_RA_MOT_DETECT_CTRL,MPU6050_DETECT_ACCEL_ON_DELAY_BIT,MPU6050_DETECT_ACCEL_ON_DELAY_LENGTH)
+MPU6050_DETECT_FF_COUNT_FIELD       = field(MPU6050_RA_MOT_DETECT_CTRL,MPU6050_DETECT_FF_COUNT_BIT,MPU6050_DETECT_FF_COUNT_LENGTH)
+MPU6050_DETECT_MOT_COUNT_FIELD      = field(MPU6050_RA_MOT_DETECT_CTRL,MPU6050_DETECT_MOT_COUNT_BIT,MPU6050_DETECT_MOT_COUNT_LENGTH)
+MPU6050_XG_OFFS_OFFSET_FIELD        = field(MPU6050_RA_XG_OFFS_TC,MPU6050_TC_OFFSET_BIT,MPU6050_TC_OFFSET_LENGTH)
+MPU6050_YG_OFFS_OFFSET_FIELD        = field(MPU6050_RA_YG_OFFS_TC,MPU6050_TC_OFFSET_BIT,MPU6050_TC_OFFSET_LENGTH)
+MPU6050_ZG_OFFS_OFFSET_FIELD        = field(MPU6050_RA_ZG_OFFS_TC,MPU6050_TC_OFFSET_BIT,MPU6050_TC_OFFSET_LENGTH)
 
 class MPU6050:
     
-    def __init__(self,address=MPU6050_ADDRESS_AD0_LOW,bus=1,scl=22,sda=21,debug=False):
+    def __init__(self,address=MPU6050_ADDRESS_AD0_LOW,bus=1,scl=22,sda=21,debug=False,freq=400000,i2c=None):
 
         '''
         Power on and prepare for general usage.
@@ -60,27 +80,51 @@ class MPU6050:
         self.mpu6050_address = address
         print("debug set to ",debug)
         self.debug=debug                         # default: no debugging print-outs
+        self.motionBuf = bytearray(MPU6050_MOTION_FRAME_SIZE)
+        self.fifoCountBuf = bytearray(2)
+        self.memAddrBuf = bytearray(2)
+        # GetCurrentFIFOPacket() buffers
+        self.fifoTrash = bytearray(I2CDEVLIB_WIRE_BUFFER_LENGTH)
+        self.fifoTrashView = memoryview(self.fifoTrash)
+        self.fifoPacket = bytearray(MPU6050_DMP_PACKET_SIZE)
+        self.fifoPacketView = memoryview(self.fifoPacket)
+        self.resetFIFOPacketStats()
+
+        # batched configuration, see configure()
+        self.batch = 0
+        self.shadow = bytearray(MPU6050_NO_OF_REGISTERS)
+        self.shadowValid = bytearray(MPU6050_NO_OF_REGISTERS)
+        self.dirty = bytearray(MPU6050_NO_OF_REGISTERS)
+        self.batchable = bytearray(MPU6050_NO_OF_REGISTERS)
+        for reg in MPU6050_BATCHABLE_REGISTERS:
+            self.batchable[reg] = 1
 
         if self.debug:
             print("I2C address of MPU6050: 0x{:02x}".format(self.mpu6050_address))
             
-        # Create an I2C object
+        # Create an I2C object, unless a bus transport (see bustransport.py) is passed in
         # Check if can use the hardware I2C interface, if not, create a software I2C interface
-        if bus == 1:
+        if i2c is not None:
+            if self.debug:
+                print("Running on the bus transport passed in")
+            self.i2c = i2c
+        elif bus == 1:
             if self.debug:
                 print("Running on I2C hardware interface with bus = ",bus, "scl = ",scl, " sda = ",sda)
-            self.i2c = I2C(bus,scl=Pin(scl),sda=Pin(sda))
+            self.i2c = I2C(bus,scl=Pin(scl),sda=Pin(sda),freq=freq)
         else:
             if self.debug:
                 print("Running on I2C bus ",bus, "scl = ",scl, " sda = ",sda)
-            self.i2c = SoftI2C(scl,sda)
+            self.i2c = SoftI2C(scl=Pin(scl),sda=Pin(sda),freq=freq)
+        # all register accesses go through regio, which counts the bus transfers
+        self.regio = RegIO(self.i2c,self.mpu6050_address)
         # Check if an MPU6050 is connected to the I2C bus
         try:
             i2c_slaves = self.i2c.scan()
         except:
             raise Exception("MPU6050: Cannot access the I2C bus")
         
-        self.fifoTimeout = 0
+        self.fifoTimeout = MPU6050_FIFO_DEFAULT_TIMEOUT
         
         # Check if there is an MPU6050 on the I2C bus
         if self.mpu6050_address not in i2c_slaves:
@@ -96,6 +140,100 @@ class MPU6050:
         @param onOff: sets the debug flag
         '''
         self.debug = onOff
+
+    def readByte(self,register):
+        '''!
+        Read a single register.
+        Inside a configure() block configuration registers are read only once and then
+        taken from the shadow copy
+        @param register: the register address
+        @return the register contents
+        '''
+        if self.batch and self.batchable[register]:
+            if not self.shadowValid[register]:
+                self.shadow[register] = self.regio.readByte(register)
+                self.shadowValid[register] = 1
+            return self.shadow[register]
+        return self.regio.readByte(register)
+
+    def writeByte(self,register,value):
+        '''!
+        Write a single register.
+        Inside a configure() block writes to configuration registers are only kept in the
+        shadow copy until the block is left. Registers with self clearing bits
+        (USER_CTRL, PWR_MGMT_1, SIGNAL_PATH_RESET ...) are written immediately, after all
+        pending writes, such that the order of the operations is kept.
+        @param register: the register address
+        @param value: the value to be written
+        '''
+        if self.batch:
+            if self.batchable[register]:
+                self.shadow[register] = value & 0xff
+                self.shadowValid[register] = 1
+                self.dirty[register] = 1
+                return
+            self.flush()
+        self.regio.writeByte(register,value)
+
+    def configure(self):
+        '''!
+        Collect configuration writes and write each modified register once.
+        <pre>
+        with mpu.configure():
+            mpu.setRate(4)
+            mpu.setDLPFMode(MPU6050_DLPF_BW_42)
+            mpu.setIntEnabled(0x40)
+        </pre>
+        When the with block is left, contiguous modified registers are written
+        in a single auto-increment transfer.
+        @return self, used as context manager
+        '''
+        return self
+
+    def __enter__(self):
+        self.batch += 1
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.batch -= 1
+        if self.batch:                   # nested block, the outermost one flushes
+            return False
+        if exc_type is None:
+            self.flush()
+        for reg in range(MPU6050_NO_OF_REGISTERS):
+            self.shadowValid[reg] = 0
+            self.dirty[reg] = 0
+        return False
+
+    def flush(self):
+        '''!
+        Write all registers modified inside a configure() block.
+        Registers with known contents between two modified registers are rewritten
+        to merge both into a single transfer.
+        @return the number of I2C transfers
+        '''
+        shadow = memoryview(self.shadow)
+        transfers = 0
+        reg = 0
+        while reg < MPU6050_NO_OF_REGISTERS:
+            if not self.dirty[reg]:
+                reg += 1
+                continue
+            end = reg + 1
+            nextReg = end
+            while nextReg < MPU6050_NO_OF_REGISTERS and self.batchable[nextReg] and \
+                  self.shadowValid[nextReg]:
+                nextReg += 1
+                if self.dirty[nextReg-1]:
+                    end = nextReg
+            self.regio.write(reg,shadow[reg:end])
+            transfers += 1
+            if self.debug:
+                print("flush: {:d} bytes to register 0x{:02x}".format(end-reg,reg))
+            for r in range(reg,end):
+                self.dirty[r] = 0
+            reg = end
+        return transfers
         
     def readBits(self, register, bit_position, no_of_bits):
         '''!
@@ -103,16 +241,8 @@ class MPU6050:
         @param bit_position: the left most position of the bit field
         @param no_of_bits: the number of bits in the bit field
         '''
-        tmp = self.i2c.readfrom_mem(self.mpu6050_address,register,1)[0]
-        # print("Who am I register unshifted raw: 0x{:02x}".format(tmp))
-        mask = 1
-        for i in range(1,no_of_bits):
-            mask = mask << 1 | 1
         shift = bit_position - no_of_bits + 1
-        mask <<= shift        
-        # print("mask: 0x{:02x}".format(mask))
-        tmp &= mask
-        return tmp >> shift
+        return extract(self.readByte(register),shift,FIELD_MASKS[no_of_bits] << shift)
 
     def readBit(self,register,bit_position) :
         '''!
@@ -120,52 +250,58 @@ class MPU6050:
         @param register: reguster address from which the bit is read
         @param bit_position: the left most position of the bit field
         '''
-        tmp = self.i2c.readfrom_mem(self.mpu6050_address,register,1)[0]
-        if tmp & (1 << bit_position) :
-            return True
-        else:
-            return False
+        return bool(self.readByte(register) & (1 << bit_position))
         
     def writeBits(self, register, bit_position, no_of_bits, value):
         '''!
         Writes a number of bits to the register
         @param bit_position: the left most position of the bit field
         @param no_of_bits: the number of bits in the bit field
-        @param value: the value to be written
+        @param value: the value to be written, cut to the field size
         '''        
-        tmp = bytearray(self.i2c.readfrom_mem(self.mpu6050_address,register,1))
-        if self.debug:
-            print("Register 0x{:02x} raw: 0x{:02x}".format(register,tmp[0]))
-        mask = 1
-        for i in range(1,no_of_bits):
-            mask = mask << 1 | 1
         shift = bit_position - no_of_bits + 1
-        mask <<= shift        
-        # print("mask: 0x{:02x}".format(mask))
-        mask = ~ mask
-        tmp[0] &= mask
-        tmp[0] |= value <<shift
-        if self.debug:
-            print("Writing 0x{:02x} to register 0x{:02x}".format(tmp[0],register))
-        self.i2c.writeto_mem(self.mpu6050_address,register,tmp)
+        self.writeMasked(register,shift,FIELD_MASKS[no_of_bits] << shift,value)
 
     def writeBit(self,register,bit_position,value):
         '''!
         Writes single bit to the register
-        @param bit_position: the left most position of the bit field
-        @param no_of_bits: the number of bits in the bit field
+        @param bit_position: the position of the bit
         @param value: the value to be written
         '''               
-        tmp = bytearray(self.i2c.readfrom_mem(self.mpu6050_address,register,1))
+        self.writeMasked(register,bit_position,1 << bit_position,1 if value else 0)
+
+    def readField(self,descriptor):
+        '''!
+        Reads a bit field
+        @param descriptor: (register, shift, mask) as returned by regio.field()
+        @return the field value
+        '''
+        register,shift,mask = descriptor
+        return extract(self.readByte(register),shift,mask)
+
+    def writeField(self,descriptor,value):
+        '''!
+        Writes a bit field
+        @param descriptor: (register, shift, mask) as returned by regio.field()
+        @param value: the value to be written, cut to the field size
+        '''
+        self.writeMasked(descriptor[0],descriptor[1],descriptor[2],value)
+
+    def writeMasked(self,register,shift,mask,value):
+        '''!
+        Read-modify-write of the bits selected by mask
+        @param register: the register address
+        @param shift: position of the least significant bit of the field
+        @param mask: the field mask, already shifted
+        @param value: the field value
+        '''
+        tmp = self.readByte(register)
         if self.debug:
-            print("writeBit: Original content of register 0x{:02x} : 0x{:02x}".format(register,tmp[0]))
-        if value:
-            tmp[0] |= (1 << bit_position)
-        else:
-            tmp[0] &= ~(1 << bit_position)
+            print("Register 0x{:02x} raw: 0x{:02x}".format(register,tmp))
+        tmp = insert(tmp,shift,mask,value)
         if self.debug:
-            print("writeBit: New content of register 0x{:02x} : 0x{:02x}".format(register,tmp[0]))
-        self.i2c.writeto_mem(self.mpu6050_address,register,tmp)
+            print("Writing 0x{:02x} to register 0x{:02x}".format(tmp,register))
+        self.writeByte(register,tmp)
         
     # WHO_AM_I register
     def getDeviceID(self) :
@@ -178,7 +314,7 @@ class MPU6050:
         @see MPU6050_WHO_AM_I_LENGTH
         '''
 
-        tmp = self.readBits(MPU6050_RA_WHO_AM_I, MPU6050_WHO_AM_I_BIT, MPU6050_WHO_AM_I_LENGTH)
+        tmp = self.readField(MPU6050_WHO_AM_I_FIELD)
         # print("Who am I = 0x{:02x}".format(tmp))
         return tmp
     
@@ -222,7 +358,7 @@ class MPU6050:
         @see MPU6050_PWR1_CLKSEL_BIT
         @see MPU6050_PWR1_CLKSEL_LENGTH
         '''
-        self.writeBits(MPU6050_RA_PWR_MGMT_1, MPU6050_PWR1_CLKSEL_BIT, MPU6050_PWR1_CLKSEL_LENGTH, source)
+        self.writeField(MPU6050_PWR1_CLKSEL_FIELD,source)
         
     def getClockSource(self) :
         '''!
@@ -232,7 +368,7 @@ class MPU6050:
         @see MPU6050_PWR1_CLKSEL_BIT
         @see MPU6050_PWR1_CLKSEL_LENGTH
         '''
-        return self.readBits(MPU6050_RA_PWR_MGMT_1, MPU6050_PWR1_CLKSEL_BIT, MPU6050_PWR1_CLKSEL_LENGTH)
+        return self.readField(MPU6050_PWR1_CLKSEL_FIELD)
 
     # GYRO_CONFIG register
     def getFullScaleGyroRange(self) :
@@ -254,7 +390,7 @@ class MPU6050:
         @see MPU6050_GCONFIG_FS_SEL_BIT
         @see MPU6050_GCONFIG_FS_SEL_LENGTH
         '''
-        return self.readBits(MPU6050_RA_GYRO_CONFIG, MPU6050_GCONFIG_FS_SEL_BIT, MPU6050_GCONFIG_FS_SEL_LENGTH)
+        return self.readField(MPU6050_GCONFIG_FS_SEL_FIELD)
 
     def setFullScaleGyroRange(self,range):
         '''!
@@ -266,7 +402,7 @@ class MPU6050:
         @see MPU6050_GCONFIG_FS_SEL_BIT
         @see MPU6050_GCONFIG_FS_SEL_LENGTH
         '''
-        self.writeBits(MPU6050_RA_GYRO_CONFIG, MPU6050_GCONFIG_FS_SEL_BIT, MPU6050_GCONFIG_FS_SEL_LENGTH, range)
+        self.writeField(MPU6050_GCONFIG_FS_SEL_FIELD,range)
 
     # ACCEL_CONFIG register
 
@@ -276,16 +412,14 @@ class MPU6050:
         @return contents of the accel config register
         @see MPU6050_RA_ACCEL_CONFIG
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_CONFIG,1)[0]
+        return self.readByte(MPU6050_RA_ACCEL_CONFIG)
                                      
     def setAccelConfig(self,config):
         '''!
         Write the accelerometer configuration register
         @see MPU6050_RA_ACCEL_CONFIG
         '''
-        tmp = bytearray(1)
-        tmp[0] = config
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_ACCEL_CONFIG,tmp)
+        self.writeByte(MPU6050_RA_ACCEL_CONFIG,config)
                                                                           
     def getAccelXSelfTest(self) :
         '''!
@@ -355,14 +489,14 @@ class MPU6050:
         @see MPU6050_ACONFIG_AFS_SEL_LENGTH
         '''
 
-        return self.readBits(MPU6050_RA_ACCEL_CONFIG, MPU6050_ACONFIG_AFS_SEL_BIT, MPU6050_ACONFIG_AFS_SEL_LENGTH)
+        return self.readField(MPU6050_ACONFIG_AFS_SEL_FIELD)
 
     def setFullScaleAccelRange(self,range) : # Set full-scale accelerometer range.
         '''!
         @param range New full-scale accelerometer range setting
         @see getFullScaleAccelRange()
         '''
-        self.writeBits(MPU6050_RA_ACCEL_CONFIG, MPU6050_ACONFIG_AFS_SEL_BIT, MPU6050_ACONFIG_AFS_SEL_LENGTH, range)
+        self.writeField(MPU6050_ACONFIG_AFS_SEL_FIELD,range)
 
     def getDHPFMode(self) :
         '''!
@@ -401,7 +535,7 @@ class MPU6050:
         @see MPU6050_DHPF_RESET
         @see MPU6050_RA_ACCEL_CONFIG
         '''
-        return self.readBits(MPU6050_RA_ACCEL_CONFIG, MPU6050_ACONFIG_ACCEL_HPF_BIT, MPU6050_ACONFIG_ACCEL_HPF_LENGTH)
+        return self.readField(MPU6050_ACONFIG_ACCEL_HPF_FIELD)
 
     def setDHPFMode(self,bandwidth) :
         '''!
@@ -411,7 +545,7 @@ class MPU6050:
         @see MPU6050_DHPF_RESET
         @see MPU6050_RA_ACCEL_CONFIG
         '''
-        self.writeBits(MPU6050_RA_ACCEL_CONFIG, MPU6050_ACONFIG_ACCEL_HPF_BIT, MPU6050_ACONFIG_ACCEL_HPF_LENGTH, bandwidth)
+        self.writeField(MPU6050_ACONFIG_ACCEL_HPF_FIELD,bandwidth)
 
 
     def setSleepEnabled(self,enabled) :
@@ -471,7 +605,7 @@ class MPU6050:
         @return Current sample rate
         @see MPU6050_RA_SMPLRT_DIV
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SMPLRT_DIV,1)[0]
+        return self.readByte(MPU6050_RA_SMPLRT_DIV)
 
     def setRate(self,rate) :
         '''!
@@ -480,9 +614,7 @@ class MPU6050:
         @see getRate()
         @see MPU6050_RA_SMPLRT_DIV
         '''
-        tmp = bytearray(1)
-        tmp[0] = rate
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_SMPLRT_DIV, tmp)
+        self.writeByte(MPU6050_RA_SMPLRT_DIV,rate)
 
     # CONFIG register
     
@@ -515,7 +647,7 @@ class MPU6050:
  
         @return FSYNC configuration value
         '''
-        return self.readBits(MPU6050_RA_CONFIG, MPU6050_CFG_EXT_SYNC_SET_BIT, MPU6050_CFG_EXT_SYNC_SET_LENGTH)
+        return self.readField(MPU6050_CFG_EXT_SYNC_SET_FIELD)
 
     def setExternalFrameSync(self,sync) :
         '''!
@@ -524,7 +656,7 @@ class MPU6050:
         @see MPU6050_RA_CONFIG
         @param sync New FSYNC configuration value
         '''
-        self.writeBits(MPU6050_RA_CONFIG, MPU6050_CFG_EXT_SYNC_SET_BIT, MPU6050_CFG_EXT_SYNC_SET_LENGTH, sync)
+        self.writeField(MPU6050_CFG_EXT_SYNC_SET_FIELD,sync)
 
     def getDLPFMode(self) :
         '''!
@@ -557,7 +689,7 @@ class MPU6050:
         @see MPU6050_CFG_DLPF_CFG_LENGTH
         '''
 
-        return self.readBits(MPU6050_RA_CONFIG, MPU6050_CFG_DLPF_CFG_BIT, MPU6050_CFG_DLPF_CFG_LENGTH)
+        return self.readField(MPU6050_CFG_DLPF_CFG_FIELD)
 
     def setDLPFMode(self, mode) :
         '''!
@@ -569,7 +701,7 @@ class MPU6050:
         @see MPU6050_CFG_DLPF_CFG_BIT
         @see MPU6050_CFG_DLPF_CFG_LENGTH
         '''
-        self.writeBits(MPU6050_RA_CONFIG, MPU6050_CFG_DLPF_CFG_BIT, MPU6050_CFG_DLPF_CFG_LENGTH,mode)
+        self.writeField(MPU6050_CFG_DLPF_CFG_FIELD,mode)
 
 
     # SELF TEST FACTORY TRIM VALUES
@@ -580,8 +712,8 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_X
         '''
-        tmp1 = self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_X,1)[0]
-        tmp2 = self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_A,1)[0]
+        tmp1 = self.readByte(MPU6050_RA_SELF_TEST_X)
+        tmp2 = self.readByte(MPU6050_RA_SELF_TEST_A)
         return (tmp1 >>3) | ((tmp2 >>4) & 0x03)
                              
     def getAccelYSelfTestFactoryTrim(self) :
@@ -590,8 +722,8 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_Y
         '''
-        tmp1 = self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_Y,1)[0]
-        tmp2 = self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_A,1)[0]
+        tmp1 = self.readByte(MPU6050_RA_SELF_TEST_Y)
+        tmp2 = self.readByte(MPU6050_RA_SELF_TEST_A)
         return (tmp1 >>3) | ((tmp2 >>4) & 0x03)
 
 
@@ -601,7 +733,7 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_Z
         '''
-        tmp = self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_Z,2)
+        tmp = self.regio.read(MPU6050_RA_SELF_TEST_Z,2)
         return (tmp[0]>>3) | (tmp[1] & 0x03);        
 
     def getGyroXSelfTestFactoryTrim(self) :
@@ -610,7 +742,7 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_X
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_X,1)[0] &0x1f
+        return self.readByte(MPU6050_RA_SELF_TEST_X) &0x1f
 
     def getGyroYSelfTestFactoryTrim(self) :
         '''!
@@ -618,7 +750,7 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_Y
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_Y,1)[0] &0x1f
+        return self.readByte(MPU6050_RA_SELF_TEST_Y) &0x1f
 
     def getGyroZSelfTestFactoryTrim(self) :
         '''!
@@ -626,7 +758,7 @@ class MPU6050:
         @return factory trim value
         @see MPU6050_RA_SELF_TEST_Z
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_SELF_TEST_Z,1)[0] &0x1f
+        return self.readByte(MPU6050_RA_SELF_TEST_Z) &0x1f
     
     # FF_THR register
     def getFreefallDetectionThreshold(self) :
@@ -646,7 +778,7 @@ class MPU6050:
         @return Current free-fall acceleration threshold value (LSB = 2mg)
         @see MPU6050_RA_FF_THR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_FF_THR,1)[0]
+        return self.readByte(MPU6050_RA_FF_THR)
 
     def setFreefallDetectionThreshold(self,threshold) :
         '''
@@ -655,7 +787,7 @@ class MPU6050:
         @see getFreefallDetectionThreshold()
         @see MPU6050_RA_FF_THR
         '''
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_FF_THR, threshold)
+        self.regio.write(MPU6050_RA_FF_THR, threshold)
 
     # FF_DUR register
 
@@ -678,7 +810,7 @@ class MPU6050:
         @return Current free-fall duration threshold value (LSB = 1ms)
         @see MPU6050_RA_FF_DUR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_FF_DUR,1)[0]
+        return self.readByte(MPU6050_RA_FF_DUR)
 
     def setFreefallDetectionDuration(self,duration) :
         '''
@@ -687,9 +819,7 @@ class MPU6050:
         @see getFreefallDetectionDuration()
         @see MPU6050_RA_FF_DUR
         '''
-        tmp = bytearray(1)
-        tmp[0] = duration
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_FF_DUR, tmp)
+        self.writeByte(MPU6050_RA_FF_DUR,duration)
 
     # MOT_THR register
     def getMotionDetectionThreshold(self) :
@@ -713,7 +843,7 @@ class MPU6050:
         @return Current motion detection acceleration threshold value (LSB = 2mg)
         @see MPU6050_RA_MOT_THR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_MOT_THR,1)[0]
+        return self.readByte(MPU6050_RA_MOT_THR)
 
     def setMotionDetectionThreshold(self,threshold) :
         '''!
@@ -722,9 +852,7 @@ class MPU6050:
         @see getMotionDetectionThreshold()
         @see MPU6050_RA_MOT_THR
         '''
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_MOT_THR, tmp)
+        self.writeByte(MPU6050_RA_MOT_THR,threshold)
 
     #  MOT_DUR register
 
@@ -745,7 +873,7 @@ class MPU6050:
         @return Current motion detection duration threshold value (LSB = 1ms)
         @see MPU6050_RA_MOT_DUR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_MOT_DUR,1)[0]
+        return self.readByte(MPU6050_RA_MOT_DUR)
         
     def setMotionDetectionDuration(self,duration) :
         '''!
@@ -754,9 +882,7 @@ class MPU6050:
         @see getMotionDetectionDuration()
         @see MPU6050_RA_MOT_DUR
         '''
-        tmp = bytearray(1)
-        tmp[0] = duration
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_MOT_DUR, tmp)
+        self.writeByte(MPU6050_RA_MOT_DUR,duration)
 
         
     # ZRMOT_THR register
@@ -787,7 +913,7 @@ class MPU6050:
         @return Current zero motion detection acceleration threshold value (LSB = 2mg)
         @see MPU6050_RA_ZRMOT_THR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ZRMOT_THR,1)[0]
+        return self.readByte(MPU6050_RA_ZRMOT_THR)
 
     def setZeroMotionDetectionThreshold(self,threshold) :
         '''!
@@ -796,9 +922,7 @@ class MPU6050:
         @see getZeroMotionDetectionThreshold()
         @see MPU6050_RA_ZRMOT_THR
         '''
-        tmp = bytearray(1)
-        tmp[0] = threshold
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_ZRMOT_THR, tmp)
+        self.writeByte(MPU6050_RA_ZRMOT_THR,threshold)
         
     # ZRMOT_DUR register
     def getZeroMotionDetectionDuration(self) :
@@ -819,7 +943,7 @@ class MPU6050:
         @return Current zero motion detection duration threshold value (LSB = 64ms)
         @see MPU6050_RA_ZRMOT_DUR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ZRMOT_DUR,1)[0]
+        return self.readByte(MPU6050_RA_ZRMOT_DUR)
 
     def setZeroMotionDetectionDuration(self,duration) :
         '''!
@@ -828,9 +952,7 @@ class MPU6050:
         @see getZeroMotionDetectionDuration()
         @see MPU6050_RA_ZRMOT_DUR
         '''
-        tmp = bytearray(1)
-        tmp[0] = duration
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_ZRMOT_DUR, tmp)
+        self.writeByte(MPU6050_RA_ZRMOT_DUR,duration)
 
     # FIFO_EN register
     
@@ -853,15 +975,15 @@ class MPU6050:
         '''
         self.writeBit(MPU6050_RA_FIFO_EN, MPU6050_TEMP_FIFO_EN_BIT, enabled)
 
-        def getXGyroFIFOEnabled(self) :
-            '''!
-            Get gyroscope X-axis FIFO enabled value.
-            When set to 1, this bit enables GYRO_XOUT_H and GYRO_XOUT_L (Registers 67 and
-            68) to be written into the FIFO buffer.
-            @return Current gyroscope X-axis FIFO enabled value
-            @see MPU6050_RA_FIFO_EN
-            '''
-            return self.readBit(MPU6050_RA_FIFO_EN, MPU6050_XG_FIFO_EN_BIT)
+    def getXGyroFIFOEnabled(self) :
+        '''!
+        Get gyroscope X-axis FIFO enabled value.
+        When set to 1, this bit enables GYRO_XOUT_H and GYRO_XOUT_L (Registers 67 and
+        68) to be written into the FIFO buffer.
+        @return Current gyroscope X-axis FIFO enabled value
+        @see MPU6050_RA_FIFO_EN
+        '''
+        return self.readBit(MPU6050_RA_FIFO_EN, MPU6050_XG_FIFO_EN_BIT)
 
     def setXGyroFIFOEnabled(self,enabled) :
         '''! 
@@ -1115,7 +1237,7 @@ class MPU6050:
         @return Current I2C master clock speed
         @see MPU6050_RA_I2C_MST_CTRL
         '''
-        return self.readBits(MPU6050_RA_I2C_MST_CTRL, MPU6050_I2C_MST_CLK_BIT, MPU6050_I2C_MST_CLK_LENGTH)
+        return self.readField(MPU6050_I2C_MST_CLK_FIELD)
 
     def setMasterClockSpeed(self,speed) :
         '''!
@@ -1123,7 +1245,7 @@ class MPU6050:
         @reparam speed Current I2C master clock speed
         @see MPU6050_RA_I2C_MST_CTRL
         '''
-        self.writeBits(MPU6050_RA_I2C_MST_CTRL, MPU6050_I2C_MST_CLK_BIT, MPU6050_I2C_MST_CLK_LENGTH, speed)
+        self.writeField(MPU6050_I2C_MST_CLK_FIELD,speed)
 
 
     #I2C_SLV* registers (Slave 0-3)
@@ -1173,7 +1295,7 @@ class MPU6050:
         '''
         if num > 3:
             return 0
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_I2C_SLV0_ADDR + num*3,1)[0]
+        return self.readByte(MPU6050_RA_I2C_SLV0_ADDR + num*3)
 
     def setSlaveAddress(self,num, address) :
         '''!
@@ -1185,9 +1307,7 @@ class MPU6050:
         '''
         if (num > 3) :
             return
-        tmp = bytearray(1)
-        tmp[0] = address
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_I2C_SLV0_ADDR + num*3,tmp)
+        self.writeByte(MPU6050_RA_I2C_SLV0_ADDR + num*3,address)
 
     def getSlaveRegister(self,num) :
         '''
@@ -1204,7 +1324,7 @@ class MPU6050:
         '''
         if (num > 3) :
             return 0
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_I2C_SLV0_REG + num*3,1)[0]
+        return self.readByte(MPU6050_RA_I2C_SLV0_REG + num*3)
 
     def setSlaveRegister(self,num,reg) :
         '''!
@@ -1218,7 +1338,7 @@ class MPU6050:
             return
         tmp = bytearray(1)
         tmp[0] = address
-        self.i2c.writeto_mem(self.mpu6050_,MPU6050_RA_I2C_SLV0_REG + num*3,tmp)
+        self.regio.write(MPU6050_RA_I2C_SLV0_REG + num*3,tmp)
 
     def getSlaveEnabled(self,num) :
         '''
@@ -1355,7 +1475,7 @@ class MPU6050:
         '''
         if (num > 3) :
             return
-        self.writeBits(MPU6050_RA_I2C_SLV0_CTRL + num*3, MPU6050_I2C_SLV_LEN_BIT, MPU6050_I2C_SLV_LEN_LENGTH)
+        self.writeBits(MPU6050_RA_I2C_SLV0_CTRL + num*3, MPU6050_I2C_SLV_LEN_BIT, MPU6050_I2C_SLV_LEN_LENGTH, length)
 
 
     # I2C_SLV* registers (Slave 4)
@@ -1371,7 +1491,7 @@ class MPU6050:
         @see getSlaveAddress()
         @see MPU6050_RA_I2C_SLV4_ADDR
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_I2C_SLV4_ADDR, 1)[0]
+        return self.readByte(MPU6050_RA_I2C_SLV4_ADDR)
 
     def setSlave4Address(self,address) :
         '''!
@@ -1380,9 +1500,7 @@ class MPU6050:
         @see getSlave4Address()
         @see MPU6050_RA_I2C_SLV4_ADDR
         '''
-        tmp = bytearray(1)
-        tmp[0] = address
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_I2C_SLV4_ADDR, tmp)
+        self.writeByte(MPU6050_RA_I2C_SLV4_ADDR,address)
 
     def getSlave4Register(self) :
         '''!
@@ -1393,7 +1511,7 @@ class MPU6050:
         @return Current active register for Slave 4
         @see MPU6050_RA_I2C_SLV4_REG
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_I2C_SLV4_REG, 1)[0]
+        return self.readByte(MPU6050_RA_I2C_SLV4_REG)
 
     def setSlave4Register(self,reg) :
         '''!
@@ -1402,9 +1520,7 @@ class MPU6050:
         @see getSlave4Register()
         @see MPU6050_RA_I2C_SLV4_REG
         '''
-        tmp = bytearray(1)
-        tmp[0] = reg
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_I2C_SLV4_REG, tmp)
+        self.writeByte(MPU6050_RA_I2C_SLV4_REG,reg)
 
     def setSlave4OutputByte(self,data) :
         '''!
@@ -1414,9 +1530,7 @@ class MPU6050:
         @param data New byte to write to Slave 4
         @see MPU6050_RA_I2C_SLV4_DO
         '''
-        tmp = bytearray(1)
-        tmp[0] = data
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_I2C_SLV4_DO, tmp)
+        self.writeByte(MPU6050_RA_I2C_SLV4_DO,data)
 
     def getSlave4Enabled(self) :
         '''!
@@ -1499,7 +1613,7 @@ class MPU6050:
         @return Current Slave 4 master delay value
         @see MPU6050_RA_I2C_SLV4_CTRL
         '''
-        return self.readBits(MPU6050_RA_I2C_SLV4_CTRL, MPU6050_I2C_SLV4_MST_DLY_BIT, MPU6050_I2C_SLV4_MST_DLY_LENGTH)
+        return self.readField(MPU6050_I2C_SLV4_MST_DLY_FIELD)
 
     def setSlave4MasterDelay(self,delay) :
         '''!
@@ -1508,7 +1622,7 @@ class MPU6050:
         @see getSlave4MasterDelay()
         @see MPU6050_RA_I2C_SLV4_CTRL
         '''
-        self.writeBits(MPU6050_RA_I2C_SLV4_CTRL, MPU6050_I2C_SLV4_MST_DLY_BIT, MPU6050_I2C_SLV4_MST_DLY_LENGTH, delay)
+        self.writeField(MPU6050_I2C_SLV4_MST_DLY_FIELD,delay)
 
     def getSlave4InputByte(self) :
         '''!
@@ -1518,7 +1632,7 @@ class MPU6050:
         @return Last available byte read from to Slave 4
         @see MPU6050_RA_I2C_SLV4_DI
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_I2C_SLV4_DI, 1)[0]
+        return self.readByte(MPU6050_RA_I2C_SLV4_DI)
 
     # I2C_MST_STATUS register
 
@@ -1622,7 +1736,7 @@ class MPU6050:
         @return Current state of the interrupt config register
         @see MPU6050_RA_INT_PIN_CFG
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_INT_PIN_CFG, 1)[0]
+        return self.readByte(MPU6050_RA_INT_PIN_CFG)
     
     def getInterruptMode(self) :
         '''!
@@ -1811,7 +1925,7 @@ class MPU6050:
         @see MPU6050_RA_INT_ENABLE
         @see MPU6050_INTERRUPT_FF_BIT
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_INT_ENABLE, 1)[0]
+        return self.readByte(MPU6050_RA_INT_ENABLE)
 
     def setIntEnabled(self,enabled) :
         '''!
@@ -1823,9 +1937,7 @@ class MPU6050:
         @see MPU6050_RA_INT_ENABLE
         @see MPU6050_INTERRUPT_FF_BIT
         '''
-        tmp = bytearray(1)
-        tmp[0] = enabled
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_INT_ENABLE,tmp)
+        self.writeByte(MPU6050_RA_INT_ENABLE,enabled)
 
     def getIntFreefallEnabled(self) :
         '''!
@@ -1960,7 +2072,7 @@ class MPU6050:
         @return Current interrupt status
         @see MPU6050_RA_INT_STATUS
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_INT_STATUS, 1)[0]
+        return self.readByte(MPU6050_RA_INT_STATUS)
 
     def getIntFreefallStatus(self) :
         '''!
@@ -2099,7 +2211,7 @@ class MPU6050:
         my = None # unused parameter
         mz = None # unused parameter
     
-        motion6 = getMotion6(ax, ay, az, gx, gy, gz)
+        motion6 = self.getMotion6()
         tmp = list(motion6)
         tmp += [mx,my,mz]
         # TODO: magnetometer integration
@@ -2115,19 +2227,35 @@ class MPU6050:
         @param gx 16-bit signed integer container for gyroscope X-axis value
         @param gy 16-bit signed integer container for gyroscope Y-axis value
         @param gz 16-bit signed integer container for gyroscope Z-axis value
+        @see getMotion7()
         @see getAcceleration()
         @see getRotation()
         @see MPU6050_RA_ACCEL_XOUT_H
         '''
-        ax = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_XOUT_H,2))
-        ay = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_YOUT_H,2))
-        az = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_ZOUT_H,2))
+        self.readMotionFrame()
+        return unpack_from('>hhhxxhhh',self.motionBuf)
 
-        gx = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_XOUT_H,2))
-        gy = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_YOUT_H,2))
-        gz = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_ZOUT_H,2))
+    def getMotion7(self) :
+        '''!
+        Get raw 6-axis motion sensor readings and the raw temperature.
+        All 14 bytes from ACCEL_XOUT_H to GYRO_ZOUT_L are read in a single burst, which
+        guarantees that all values come from the same sampling instant.
+        @return tuple (ax,ay,az,temp,gx,gy,gz), temp is the raw temperature value,
+                temp/340 + 36.53 gives degrees C
+        @see getMotion6()
+        @see MPU6050_RA_ACCEL_XOUT_H
+        '''
+        self.readMotionFrame()
+        return unpack_from('>hhhhhhh',self.motionBuf)
 
-        return(ax,ay,az,gx,gy,gz)
+    def readMotionFrame(self) :
+        '''!
+        Burst read of the accelerometer, temperature and gyroscope registers into the
+        preallocated motion buffer
+        @return the motion buffer (big endian 16 bit values)
+        '''
+        self.regio.readInto(MPU6050_RA_ACCEL_XOUT_H,self.motionBuf)
+        return self.motionBuf
     
     def getAcceleration(self) :
         '''!
@@ -2166,13 +2294,11 @@ class MPU6050:
         @param y 16-bit signed integer container for Y-axis acceleration
         @param z 16-bit signed integer container for Z-axis acceleration
         @return tuple (ax,ay,az)
-        @see MPU6050_RA_GYRO_XOUT_H
+        @see getMotion7()
+        @see MPU6050_RA_ACCEL_XOUT_H
         '''
-        ax = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_XOUT_H,2))
-        ay = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_YOUT_H,2))
-        az = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_ZOUT_H,2))
-
-        return (ax,ay,az)
+        self.readMotionFrame()
+        return unpack_from('>hhh',self.motionBuf)
 
     def getAccelerationX(self) :
         '''!
@@ -2181,7 +2307,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_ACCEL_XOUT_H
         '''
-        ax = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_XOUT_H,2))
+        ax = self.regio.readWord(MPU6050_RA_ACCEL_XOUT_H)
 
         return ax
 
@@ -2192,7 +2318,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_ACCEL_YOUT_H
         '''
-        ay = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_YOUT_H,2))
+        ay = self.regio.readWord(MPU6050_RA_ACCEL_YOUT_H)
 
         return ay
 
@@ -2203,7 +2329,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_ACCEL_ZOUT_H
         '''
-        az = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_ACCEL_ZOUT_H,2))
+        az = self.regio.readWord(MPU6050_RA_ACCEL_ZOUT_H)
 
         return az
 
@@ -2215,7 +2341,7 @@ class MPU6050:
         @return Temperature reading in 16-bit 2's complement format
         @see MPU6050_RA_TEMP_OUT_H
         '''
-        temp = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_TEMP_OUT_H,2))
+        temp = self.regio.readWord(MPU6050_RA_TEMP_OUT_H)
 
         if self.debug:
             print("Raw temperature value: {:d}".format(temp))
@@ -2257,14 +2383,13 @@ class MPU6050:
         @param x 16-bit signed integer container for X-axis rotation
         @param y 16-bit signed integer container for Y-axis rotation
         @param z 16-bit signed integer container for Z-axis rotation
+        @return tuple (gx,gy,gz)
         @see getMotion6()
+        @see getMotion7()
         @see MPU6050_RA_GYRO_XOUT_H
         '''
-        gx = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_XOUT_H,2))
-        gy = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_YOUT_H,2))
-        gz = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_ZOUT_H,2))
-
-        return(gx,gy,gz)
+        self.readMotionFrame()
+        return unpack_from('>hhh',self.motionBuf,MPU6050_RA_GYRO_XOUT_H-MPU6050_RA_ACCEL_XOUT_H)
 
     def getRotationX(self) :
         '''!
@@ -2273,7 +2398,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_GYRO_XOUT_H
         '''
-        gx = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_XOUT_H,2))
+        gx = self.regio.readWord(MPU6050_RA_GYRO_XOUT_H)
 
         return gx
                             
@@ -2284,7 +2409,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_GYRO_YOUT_H
         '''
-        gy = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_YOUT_H,2))
+        gy = self.regio.readWord(MPU6050_RA_GYRO_YOUT_H)
 
         return gy
 
@@ -2295,7 +2420,7 @@ class MPU6050:
         @see getMotion6()
         @see MPU6050_RA_GYRO_YOUT_H
         '''
-        gz = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_GYRO_ZOUT_H,2))
+        gz = self.regio.readWord(MPU6050_RA_GYRO_ZOUT_H)
 
         return gz
 
@@ -2377,7 +2502,7 @@ class MPU6050:
         @param position Starting position (0-23)
         @return Byte read from register
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_EXT_SENS_DATA_00 + position,1)[0]
+        return self.readByte(MPU6050_RA_EXT_SENS_DATA_00 + position)
     
 
     def getExternalSensorWord(self,position) :
@@ -2387,7 +2512,7 @@ class MPU6050:
         @return Word read from register
         @see getExternalSensorByte()
         '''
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_EXT_SENS_DATA_00 + position,2))
+        return self.regio.readWord(MPU6050_RA_EXT_SENS_DATA_00 + position)
 
     def getExternalSensorDWord(self,position) :
         '''!
@@ -2396,7 +2521,7 @@ class MPU6050:
         @return Double word read from registers
         @see getExternalSensorByte()
         '''
-        return self.bytesToDoubleInt(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_EXT_SENS_DATA_00 + position,4))
+        return self.bytesToDoubleInt(self.regio.read(MPU6050_RA_EXT_SENS_DATA_00 + position,4))
 
     # MOT_DETECT_STATUS register
     
@@ -2406,7 +2531,7 @@ class MPU6050:
         @return Motion detection status byte
         @see MPU6050_RA_MOT_DETECT_STATUS
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_MOT_DETECT_STATUS,1)[0]
+        return self.readByte(MPU6050_RA_MOT_DETECT_STATUS)
 
     def getXNegMotionDetected(self) :
         '''!
@@ -2486,9 +2611,7 @@ class MPU6050:
 
         if (num > 3) :
             return
-        tmp = bytearray(1)
-        tmp[0] = data
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_I2C_SLV0_DO + num, tmp)       
+        self.writeByte(MPU6050_RA_I2C_SLV0_DO + num,data)       
 
     # I2C_MST_DELAY_CTRL register
 
@@ -2553,9 +2676,7 @@ class MPU6050:
     # SIGNAL_PATH_RESET register
 
     def resetSignalPath(self):
-        tmp = bytearray(1)
-        tmp[0] = 0x7
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_SIGNAL_PATH_RESET, tmp)       
+        self.writeByte(MPU6050_RA_SIGNAL_PATH_RESET,0x7)       
         
     def resetGyroscopePath(self) :
         '''!
@@ -2590,12 +2711,10 @@ class MPU6050:
     # MOT_DETECT_CTRL register
 
     def getMotionDetectionControl(self):
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_MOT_DETECT_CTRL,1)[0]
+        return self.readByte(MPU6050_RA_MOT_DETECT_CTRL)
 
     def setMotionDetectionControl(self,value):
-        tmp = bytearray(1)
-        tmp[0]=value
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_MOT_DETECT_CTRL, tmp)               
+        self.writeByte(MPU6050_RA_MOT_DETECT_CTRL,value)               
 
     def getAccelerometerPowerOnDelay(self) :
         '''!
@@ -2613,7 +2732,7 @@ class MPU6050:
         @see MPU6050_RA_MOT_DETECT_CTRL
         @see MPU6050_DETECT_ACCEL_ON_DELAY_BIT
         '''
-        return self.readBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_ACCEL_ON_DELAY_BIT, MPU6050_DETECT_ACCEL_ON_DELAY_LENGTH)
+        return self.readField(MPU6050_DETECT_ACCEL_ON_DELAY_FIELD)
 
     def setAccelerometerPowerOnDelay(self,delay) :
         '''!
@@ -2623,7 +2742,7 @@ class MPU6050:
         @see MPU6050_RA_MOT_DETECT_CTRL
         @see MPU6050_DETECT_ACCEL_ON_DELAY_BIT
         '''
-        self.writeBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_ACCEL_ON_DELAY_BIT, MPU6050_DETECT_ACCEL_ON_DELAY_LENGTH, delay)
+        self.writeField(MPU6050_DETECT_ACCEL_ON_DELAY_FIELD,delay)
 
     def getFreefallDetectionCounterDecrement(self) :
         '''!
@@ -2653,7 +2772,7 @@ class MPU6050:
         @see MPU6050_RA_MOT_DETECT_CTRL
         @see MPU6050_DETECT_FF_COUNT_BIT
         '''
-        return self.readBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_FF_COUNT_BIT, MPU6050_DETECT_FF_COUNT_LENGTH)
+        return self.readField(MPU6050_DETECT_FF_COUNT_FIELD)
 
     def setFreefallDetectionCounterDecrement(self,decrement) :
         '''!
@@ -2663,7 +2782,7 @@ class MPU6050:
         @see MPU6050_RA_MOT_DETECT_CTRL
         @see MPU6050_DETECT_FF_COUNT_BIT
         '''
-        self.writeBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_FF_COUNT_BIT, MPU6050_DETECT_FF_COUNT_LENGTH, decrement)
+        self.writeField(MPU6050_DETECT_FF_COUNT_FIELD,decrement)
 
     def getMotionDetectionCounterDecrement(self) :
         '''!
@@ -2689,7 +2808,7 @@ class MPU6050:
          reset the counter to 0. For further information on Motion detection,
          please refer to Registers 29 to 32.
         '''
-        return self.readBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_MOT_COUNT_BIT, MPU6050_DETECT_MOT_COUNT_LENGTH)
+        return self.readField(MPU6050_DETECT_MOT_COUNT_FIELD)
 
     def setMotionDetectionCounterDecrement(self,decrement) :
         '''
@@ -2699,7 +2818,7 @@ class MPU6050:
         @see MPU6050_RA_MOT_DETECT_CTRL
         @see MPU6050_DETECT_MOT_COUNT_BIT
         '''
-        self.writeBits(MPU6050_RA_MOT_DETECT_CTRL, MPU6050_DETECT_MOT_COUNT_BIT, MPU6050_DETECT_MOT_COUNT_LENGTH, decrement)
+        self.writeField(MPU6050_DETECT_MOT_COUNT_FIELD,decrement)
 
     # EXT_SENS_DATA_* registers
 
@@ -2779,7 +2898,7 @@ class MPU6050:
         @param position Starting position (0-23)
         @return Byte read from register
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_EXT_SENS_DATA_00 + position,1)[0]
+        return self.readByte(MPU6050_RA_EXT_SENS_DATA_00 + position)
 
 
     # USER_CTRL register
@@ -2879,12 +2998,10 @@ class MPU6050:
     # PWR_MGMT_1 register
 
     def getPowerManagement_1(self):
-        return self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_PWR_MGMT_1,1)[0]
+        return self.readByte(MPU6050_RA_PWR_MGMT_1)
                              
     def setPowerManagement_1(self,value):
-        tmp = bytearray(1)
-        tmp[0]=value
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_PWR_MGMT_1, tmp)       
+        self.writeByte(MPU6050_RA_PWR_MGMT_1,value)       
         
     def reset(self) :
         '''!
@@ -2983,7 +3100,7 @@ class MPU6050:
         @see MPU6050_PWR1_CLKSEL_LENGTH
         '''
 
-        return self.readBits(MPU6050_RA_PWR_MGMT_1, MPU6050_PWR1_CLKSEL_BIT, MPU6050_PWR1_CLKSEL_LENGTH)
+        return self.readField(MPU6050_PWR1_CLKSEL_FIELD)
 
     def setClockSource(self,source) :
         '''!
@@ -3017,7 +3134,7 @@ class MPU6050:
         @see MPU6050_PWR1_CLKSEL_BIT
         @see MPU6050_PWR1_CLKSEL_LENGTH
         '''
-        self.writeBits(MPU6050_RA_PWR_MGMT_1, MPU6050_PWR1_CLKSEL_BIT, MPU6050_PWR1_CLKSEL_LENGTH, source)
+        self.writeField(MPU6050_PWR1_CLKSEL_FIELD,source)
 
     # PWR_MGMT_2 register
 
@@ -3046,7 +3163,7 @@ class MPU6050:
         @return Current wake frequency
         @see MPU6050_RA_PWR_MGMT_2
         '''
-        return self.readBits(MPU6050_RA_PWR_MGMT_2, MPU6050_PWR2_LP_WAKE_CTRL_BIT, MPU6050_PWR2_LP_WAKE_CTRL_LENGTH)
+        return self.readField(MPU6050_PWR2_LP_WAKE_CTRL_FIELD)
 
     def setWakeFrequency(self,frequency) :
         '''!
@@ -3054,7 +3171,7 @@ class MPU6050:
         @param frequency New wake frequency
         @see MPU6050_RA_PWR_MGMT_2
         '''
-        self.writeBits(MPU6050_RA_PWR_MGMT_2, MPU6050_PWR2_LP_WAKE_CTRL_BIT, MPU6050_PWR2_LP_WAKE_CTRL_LENGTH, frequency)
+        self.writeField(MPU6050_PWR2_LP_WAKE_CTRL_FIELD,frequency)
 
     def getStandbyXAccelEnabled(self) :
         '''!
@@ -3187,7 +3304,8 @@ class MPU6050:
         set of sensor data bound to be stored in the FIFO (register 35 and 36).
         @return Current FIFO buffer size
         '''
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_FIFO_COUNTH,2))
+        self.regio.readInto(MPU6050_RA_FIFO_COUNTH,self.fifoCountBuf)
+        return unpack_from('>H',self.fifoCountBuf)[0]
 
     # FIFO_R_W register
 
@@ -3218,87 +3336,119 @@ class MPU6050:
 
         @return Byte from FIFO buffer
         '''
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_FIFO_COUNTH,1)[0]
+        return self.readByte(MPU6050_RA_FIFO_R_W)
 
-    
-    def getFIFOBytes(length) :
+    def getFIFOBytes(self,length) :
+        '''!
+        Get a number of bytes from the FIFO buffer.
+        @param length: number of bytes to read
+        @return the bytes read, None if length is 0
+        @see getFIFOCount()
+        '''
         if length > 0:
-            return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_FIFO_R_W,length)
+            return self.regio.read(MPU6050_RA_FIFO_R_W,length)
         else :
-    	    return None
+            return None
+
+    def getFIFOBytesInto(self,buf) :
+        '''!
+        Read len(buf) bytes from the FIFO buffer into a preallocated buffer.
+        @param buf: bytearray or memoryview receiving the data
+        @see getFIFOCount()
+        '''
+        self.regio.readInto(MPU6050_RA_FIFO_R_W,buf)
 
     def getFIFOTimeout(self) :
         '''!
         Get timeout to get a packet from FIFO buffer.
-        @return Current timeout to get a packet from FIFO buffer
+        @return Current timeout to get a packet from FIFO buffer in us
         @see MPU6050_FIFO_DEFAULT_TIMEOUT
         '''
-	return self.fifoTimeout;
+        return self.fifoTimeout
 
     def setFIFOTimeout(self,fifoTimeout) :
         '''!
         Set timeout to get a packet from FIFO buffer.
-        @param New timeout to get a packet from FIFO buffer
+        @param New timeout to get a packet from FIFO buffer in us
         @see MPU6050_FIFO_DEFAULT_TIMEOUT
         '''
-	self.fifoTimeout = fifoTimeout
-
-    def GetCurrentFIFOPacket(self, data, length)  : # overflow proof
-        '''!
-        Get latest byte from FIFO buffer no matter how much time has passed.
-        ===                  GetCurrentFIFOPacket                    ===
-        ================================================================
-        Returns 1) when nothing special was done
-        2) when recovering from overflow
-        0) when no valid data is available
-        ================================================================ 
-        '''
-
-        # This section of code is for when we allowed more than 1 packet to be acquired
-        BreakTimer = time();
-        packetReceived = False;
-        fifoc = self.getFIFOCount()
+        self.fifoTimeout = fifoTimeout
+
+    def GetCurrentFIFOPacket(self,length=MPU6050_DMP_PACKET_SIZE) : # overflow proof
+        '''!
+        Get the latest packet from the FIFO buffer no matter how much time has passed.
+        Stale packets are skipped: with more than MPU6050_FIFO_RESET_THRESHOLD bytes in the
+        FIFO it is faster to reset the FIFO and wait for the next packet than to read the
+        old ones, below the threshold the old packets are read and thrown away in
+        I2CDEVLIB_WIRE_BUFFER_LENGTH byte chunks.
+        Only whole packets are discarded: if the MPU6050 is writing a new packet while we
+        read, the last complete packet is returned and the partial one stays in the FIFO.
+        The packet is read into a preallocated buffer: copy it if it must survive the next call.
+        @param length: the packet size, MPU6050_DMP_PACKET_SIZE for the MotionApps 2.0 DMP firmware
+        @return (status,packet) with status
+          1) when nothing special was done
+          2) when recovering from overflow (the FIFO was reset or stale packets were discarded)
+          0) when no valid data is available, packet is None in this case
+        '''
+        if length != len(self.fifoPacket):
+            self.fifoPacket = bytearray(length)
+            self.fifoPacketView = memoryview(self.fifoPacket)
+        breakTimer = ticks_us()
+        status = 1
         while True:
             fifoC = self.getFIFOCount()
-            if fifoC > 200: # if you waited to get the FIFO buffer to > 200 bytes
-                            # it will take longer to get the last packet
-                            # in the FIFO Buffer than it will take
-                            # to  reset the buffer and wait for the next to arrive
-                self.resetFIFO()  # Fixes any overflow corruption
-                fifoC = 0
+            if fifoC > MPU6050_FIFO_RESET_THRESHOLD:
+                # it will take longer to get the last packet out of the FIFO than
+                # to reset it and wait for the next one to arrive
+                self.resetFIFO()            # fixes any overflow corruption
+                self.fifoResets += 1
+                status = 2
                 while True:
                     fifoC = self.getFIFOCount()
-                    if fifoC and time() - BreakTimer <= self.getFIFOTimeout() :
-                        pass  # Get Next New Packet
-                    else :        # We have more than 1 packet but less than 200 bytes of data in the FIFO Buffer
-                        while True:
-                            fifoC = self.getFIFOCount()
-                            if fifoC > length :            # Test each time just in case the MPU is writing to the FIFO Buffer
-                                fifoC = fifoC - length     # Save the last packet
-                            # uint16_t  RemoveBytes;
-                        while (fifoC) : # fifo count will reach zero so this is safe
-                            # Buffer Length is different than the packet length this will efficiently clear the buffer
-                            if fifoC < I2CDEVLIB_WIRE_BUFFER_LENGTH :
-                                RemoveBytes = fifoC
-                            else :
-                                RemoveBytes = I2CDEVLIB_WIRE_BUFFER_LENGTH
-                            
-                            Trash = getFIFOBytes(RemoveBytes)
-                            fifoC -= RemoveBytes
-                return 2,None
-            
-            if not fifoC :
-                return 0,None  # Called too early no data or we timed out after FIFO Reset
-            # We have 1 packet
-            if fifoC == length:
-                packetReceived = True
-            else :
-                packetReceived = False
-            if packetReceived and time() - BreakTimer > self.getFIFOTimeout():
+                    if fifoC:
+                        break
+                    if ticks_diff(ticks_us(),breakTimer) > self.fifoTimeout:
+                        self.fifoTimeouts += 1
+                        break
+            if not fifoC:
+                return 0,None               # called too early or timed out after the FIFO reset
+            if fifoC >= length:
+                break
+            # partial packet: wait for it to be completed
+            if ticks_diff(ticks_us(),breakTimer) > self.fifoTimeout:
+                self.fifoTimeouts += 1
                 return 0,None
-            if packetReceived:
-                data = self.getFIFOBytes(length)
-                return 1,data
+
+        # more than 1 packet but less than the threshold: keep the last complete one only
+        removeBytes = (fifoC // length - 1) * length
+        if removeBytes:
+            status = 2
+            self.fifoDiscarded += removeBytes
+            # full chunks into the preallocated buffer, only the final partial chunk is sliced
+            while removeBytes >= I2CDEVLIB_WIRE_BUFFER_LENGTH:
+                self.getFIFOBytesInto(self.fifoTrash)
+                removeBytes -= I2CDEVLIB_WIRE_BUFFER_LENGTH
+            if removeBytes:
+                self.getFIFOBytesInto(self.fifoTrashView[:removeBytes])
+        self.getFIFOBytesInto(self.fifoPacket)
+        self.fifoPackets += 1
+        return status,self.fifoPacketView
+
+    def resetFIFOPacketStats(self) :
+        '''!
+        Clear the GetCurrentFIFOPacket() statistics
+        '''
+        self.fifoPackets = 0
+        self.fifoResets = 0
+        self.fifoDiscarded = 0
+        self.fifoTimeouts = 0
+
+    def getFIFOPacketStats(self) :
+        '''!
+        Get the GetCurrentFIFOPacket() statistics
+        @return (packets read, FIFO resets, bytes discarded, timeouts)
+        '''
+        return self.fifoPackets,self.fifoResets,self.fifoDiscarded,self.fifoTimeouts
 
     def setFIFOByte(self,data) :
         '''!
@@ -3306,9 +3456,7 @@ class MPU6050:
         @see getFIFOByte()
         @see MPU6050_RA_FIFO_R_W
         '''
-        tmp = bytearray(1)
-        tmp[0] = data
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_FIFO_R_W, tmp)       
+        self.writeByte(MPU6050_RA_FIFO_R_W,data)       
 
 
     # ======== UNDOCUMENTED/DMP REGISTERS/METHODS ========
@@ -3322,59 +3470,55 @@ class MPU6050:
         self.writeBit(MPU6050_RA_XG_OFFS_TC, MPU6050_TC_OTP_BNK_VLD_BIT, enabled)
 
     def getXGyroOffsetTC(self) :
-        return self.readBits(MPU6050_RA_XG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH)
+        return self.readField(MPU6050_XG_OFFS_OFFSET_FIELD)
 
     def setXGyroOffsetTC(self,offset) :
-        self.writeBits(MPU6050_RA_XG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH, offset)
+        self.writeField(MPU6050_XG_OFFS_OFFSET_FIELD,offset)
 
 
 
     # YG_OFFS_TC register
 
     def getYGyroOffsetTC(self) :
-        return self.readBits(MPU6050_RA_YG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH)
+        return self.readField(MPU6050_YG_OFFS_OFFSET_FIELD)
 
     def setYGyroOffsetTC(self,offset) :
-        self.writeBits(MPU6050_RA_YG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH)
+        self.writeField(MPU6050_YG_OFFS_OFFSET_FIELD,offset)
 
 
     # ZG_OFFS_TC register
 
     def getZGyroOffsetTC(self) :
-        return self.readBits(MPU6050_RA_ZG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH)
+        return self.readField(MPU6050_ZG_OFFS_OFFSET_FIELD)
 
     def setZGyroOffsetTC(self,offset) :
-        self.writeBits(MPU6050_RA_ZG_OFFS_TC, MPU6050_TC_OFFSET_BIT, MPU6050_TC_OFFSET_LENGTH)
+        self.writeField(MPU6050_ZG_OFFS_OFFSET_FIELD,offset)
 
 
     # X_FINE_GAIN register
 
     def getXFineGain(self) :
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_X_FINE_GAIN,1)[0]
+        return self.readByte(MPU6050_RA_X_FINE_GAIN)
 
     def setXFineGain(self,gain) :
-        tmp = bytearray(1)
-        tmp[0] = gain
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_X_FINE_GAIN, tmp)       
+        self.writeByte(MPU6050_RA_X_FINE_GAIN,gain)       
 
     # Y_FINE_GAIN register
 
     def getYFineGain(self) :
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_Y_FINE_GAIN,1)[0]
+        return self.readByte(MPU6050_RA_Y_FINE_GAIN)
 
     def setYFineGain(self,gain) :
-        tmp = bytearray(1)
-        tmp[0] = gain
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_Y_FINE_GAIN, tmp)       
+        self.writeByte(MPU6050_RA_Y_FINE_GAIN,gain)       
 
     # Z_FINE_GAIN register
 
     def getZFineGain(self) :
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_Z_FINE_GAIN,1)[0]
+        return self.readByte(MPU6050_RA_Z_FINE_GAIN)
 
     def setZFineGain(self,gain) :
         tmp[0] = gain
-        self.i2c.writeto_mem(self.mpu6050_address,MPU6050_RA_Z_FINE_GAIN, tmp)       
+        self.regio.write(MPU6050_RA_Z_FINE_GAIN, tmp)       
 
     # XA_OFFS_* registers
     
@@ -3383,7 +3527,7 @@ class MPU6050:
             SaveAddress = MPU6050_RA_XA_OFFS_H
         else:
             SaveAddress = 0x77
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, SaveAddress,2))
+        return self.regio.readWord(SaveAddress)
 
     def setXAccelOffset(self,offset) :
         tmp = self.intToBytes(offset)
@@ -3391,7 +3535,7 @@ class MPU6050:
             SaveAddress = MPU6050_RA_XA_OFFS_H # MPU6050,MPU9150 Vs MPU6500,MPU9250
         else:
             SaveAddress = 0x77
-        self.i2c.writeto_mem(self.mpu6050_address,SaveAddress, tmp)
+        self.regio.write(SaveAddress, tmp)
 
     # YA_OFFS_* registers
     
@@ -3400,7 +3544,7 @@ class MPU6050:
             SaveAddress = MPU6050_RA_YA_OFFS_H # MPU6050,MPU9150 Vs MPU6500,MPU9250
         else:
             SaveAddress = 0x7a
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, SaveAddress,2))
+        return self.regio.readWord(SaveAddress)
 
     def setYAccelOffset(self,offset) :
         tmp = self.intToBytes(offset)
@@ -3408,7 +3552,7 @@ class MPU6050:
             SaveAddress = MPU6050_RA_YA_OFFS_H # MPU6050,MPU9150 Vs MPU6500,MPU9250
         else:
             SaveAddress = 0x7a
-        self.i2c.writeto_mem(self.mpu6050_address,SaveAddress, tmp)
+        self.regio.write(SaveAddress, tmp)
 
     # ZA_OFFS_* register
     
@@ -3417,7 +3561,7 @@ class MPU6050:
             SaveAddress = MPU6050_RA_ZA_OFFS_H # MPU6050,MPU9150 Vs MPU6500,MPU9250
         else:
             SaveAddress = 0x7d
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, SaveAddress,2))
+        return self.regio.readWord(SaveAddress)
 
     def setZAccelOffset(self,offset) :
         tmp = self.intToBytes(offset)
@@ -3425,34 +3569,34 @@ class MPU6050:
             SaveAddress = MPU6050_RA_ZA_OFFS_H # MPU6050,MPU9150 Vs MPU6500,MPU9250
         else:
             SaveAddress = 0x7d
-        self.i2c.writeto_mem(self.mpu6050_address,SaveAddress, tmp)
+        self.regio.write(SaveAddress, tmp)
         
     # XG_OFFS_USR* registers
 
     def getXGyroOffset(self) :
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_XG_OFFS_USRH ,2))
+        return self.regio.readWord(MPU6050_RA_XG_OFFS_USRH )
 
     def setXGyroOffset(self,offset) :
         tmp = self.intToBytes(offset)
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_XG_OFFS_USRH, tmp)
+        self.regio.write(MPU6050_RA_XG_OFFS_USRH, tmp)
 
     # YG_OFFS_USR* register
 
     def getYGyroOffset(self) :
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_YG_OFFS_USRH ,2))
+        return self.regio.readWord(MPU6050_RA_YG_OFFS_USRH )
 
     def setYGyroOffset(self,offset) :
         tmp = self.intToBytes(offset)
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_YG_OFFS_USRH, tmp)
+        self.regio.write(MPU6050_RA_YG_OFFS_USRH, tmp)
 
     # ZG_OFFS_USR* register
     
     def getZGyroOffset(self) :
-        return self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_ZG_OFFS_USRH ,2))
+        return self.regio.readWord(MPU6050_RA_ZG_OFFS_USRH )
 
     def setZGyroOffset(self,offset) :
         tmp = self.intToBytes(offset)
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_ZG_OFFS_USRH, tmp)
+        self.regio.write(MPU6050_RA_ZG_OFFS_USRH, tmp)
 
     # INT_ENABLE register (DMP functions)
 
@@ -3516,27 +3660,21 @@ class MPU6050:
             bank |= 0x20
         if prefetchEnabled:
             bank |= 0x40
-        tmp = bytearray(1)
-        tmp[0] = bank
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_BANK_SEL, tmp)
+        self.writeByte(MPU6050_RA_BANK_SEL,bank)
 
     # MEM_START_ADDR register
 
     def setMemoryStartAddress(self,address) :
-        tmp = bytearray(1)
-        tmp[0]= address
-        self.i2c.writeto_mem(self.mpu6050_address,  MPU6050_RA_MEM_START_ADDR, tmp)
+        self.writeByte(MPU6050_RA_MEM_START_ADDR,address)
 
 
     # MEM_R_W register
 
     def readMemoryByte(self) :
-        return self.i2c.readfrom_mem(self.mpu6050_address,  MPU6050_RA_MEM_R_W,1)[0]  
+        return self.readByte(MPU6050_RA_MEM_R_W)  
 
     def writeMemoryByte(self,data) :
-        tmp = bytearray(1)
-        tmp[0]=data
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_MEM_R_W, tmp)
+        self.writeByte(MPU6050_RA_MEM_R_W,data)
 
     def readMemoryBlock(self,dataSize, bank, address) :
         self.setMemoryBank(bank)
@@ -3560,7 +3698,7 @@ class MPU6050:
                 chunkSize = MPU6050_DMP_MEMORY_BANK_SIZE - address;
                     
             # read the chunk of data as specified
-            chunk = bytearray(self.i2c.readfrom_mem(self.mpu6050_address,MPU6050_RA_MEM_R_W,chunkSize))
+            chunk = bytearray(self.regio.read(MPU6050_RA_MEM_R_W,chunkSize))
             if self.debug:
                 for j in range(chunkSize):
                     print("0x{:02x} ".format(chunk[j]),end="")
@@ -3610,13 +3748,13 @@ class MPU6050:
                 for j in range(len(chunk)):
                     print("0x{:02x} ".format(chunk[j]),end="")
                 print("")
-            self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_MEM_R_W, chunk)
+            self.regio.write(MPU6050_RA_MEM_R_W, chunk)
 
             # verify data if needed
             if verify :
                 self.setMemoryBank(bank)
                 self.setMemoryStartAddress(address)
-                verify_chunk = bytearray(self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_MEM_R_W, chunkSize))
+                verify_chunk = bytearray(self.regio.read(MPU6050_RA_MEM_R_W, chunkSize))
                 print("Verification: ")
                 if self.debug:
                     for j in range(len(verify_chunk)):
@@ -3653,6 +3791,95 @@ class MPU6050:
         # return self.writeMemoryBlock(data, dataSize, bank, address, verify, useProgMem=True)
         return self.writeMemoryBlock(data, bank, address, verify)
 
+    def setMemoryBankAddress(self,bank,address) :
+        '''!
+        Set memory bank and start address in a single I2C transfer,
+        BANK_SEL and MEM_START_ADDR are consecutive registers
+        '''
+        self.memAddrBuf[0] = bank & 0x1F
+        self.memAddrBuf[1] = address
+        self.regio.write(MPU6050_RA_BANK_SEL, self.memAddrBuf)
+
+    def loadDMPImage(self, image, chunkSize=MPU6050_DMP_LOAD_CHUNK_SIZE, verify=True, diff=False) :
+        '''!
+        Upload a DMP firmware image into the DMP memory, starting at bank 0, address 0.
+        The image is written bank by bank in chunks of up to chunkSize bytes, the
+        bank and start address are set in a single transfer before each chunk.
+        When the image is given as a file, it is read from flash one bank at a time:
+        only a bank sized buffer is allocated, whatever the image size.
+        @param image: the firmware image: the name of a binary file (e.g. MPU6050_DMP_IMAGE),
+                      an open binary file or a bytes like object, e.g. from a frozen module
+        @param chunkSize: number of bytes per I2C transfer, at most MPU6050_DMP_MEMORY_BANK_SIZE
+        @param verify: read back each bank written and compare its CRC with the one of the image
+        @param diff: read back each bank before writing and skip the banks that are already
+                     correct. Speeds up warm restarts, where the DMP memory survived.
+        @return True on success, False if the verification failed
+        '''
+        if chunkSize < 1 or chunkSize > MPU6050_DMP_MEMORY_BANK_SIZE:
+            raise ValueError("chunkSize must be between 1 and {:d}".format(MPU6050_DMP_MEMORY_BANK_SIZE))
+        if isinstance(image,str):
+            with open(image,'rb') as f:
+                return self.loadDMPImage(f,chunkSize,verify,diff)
+
+        imageFile = None
+        if hasattr(image,'readinto'):
+            imageFile = image
+            bankBuf = memoryview(bytearray(MPU6050_DMP_MEMORY_BANK_SIZE))
+        else:
+            image = memoryview(image)
+        readBack = None
+        if verify or diff:
+            readBack = memoryview(bytearray(MPU6050_DMP_MEMORY_BANK_SIZE))
+        imageSize = 0
+        written = 0
+        skipped = 0
+        bank = 0
+        while True:
+            if imageFile:
+                bankSize = imageFile.readinto(bankBuf)
+                bankData = bankBuf[:bankSize]
+            else:
+                bankData = image[imageSize:imageSize+MPU6050_DMP_MEMORY_BANK_SIZE]
+                bankSize = len(bankData)
+            if not bankSize:
+                break
+            imageSize += bankSize
+            bankCrc = crc32(bankData)
+            if diff:
+                self.setMemoryBankAddress(bank,0)
+                self.regio.readInto(MPU6050_RA_MEM_R_W, readBack[:bankSize])
+                if crc32(readBack[:bankSize]) == bankCrc:
+                    if self.debug:
+                        print("loadDMPImage: bank {:d} unchanged".format(bank))
+                    skipped += 1
+                    bank += 1
+                    continue
+
+            address = 0
+            while address < bankSize:
+                n = bankSize - address
+                if n > chunkSize:
+                    n = chunkSize
+                self.setMemoryBankAddress(bank,address)
+                self.regio.write(MPU6050_RA_MEM_R_W, bankData[address:address+n])
+                address += n
+            written += 1
+
+            if verify:
+                self.setMemoryBankAddress(bank,0)
+                self.regio.readInto(MPU6050_RA_MEM_R_W, readBack[:bankSize])
+                if crc32(readBack[:bankSize]) != bankCrc:
+                    print("DMP image verification error in bank {:d}".format(bank))
+                    return False
+            if self.debug:
+                print("loadDMPImage: bank {:d} written".format(bank))
+            bank += 1
+
+        if self.debug:
+            print("loadDMPImage: {:d} bytes, {:d} banks written, {:d} banks unchanged".format(
+                imageSize,written,skipped))
+        return True
+
     # def writeDMPConfigurationSet(self, data, dataSize, useProgMem) :
     def writeDMPConfigurationSet(self, data, dataSize) :
         # if useProgMem:
@@ -3724,7 +3951,7 @@ class MPU6050:
                 # setIntDMPEnabled(true);
                 tmp = bytearray(1)
                 tmp[0] = 0x32
-                self.i2c.writeto_mem(self.mpu6050_address,  MPU6050_RA_INT_ENABLE, tmp, 1)
+                self.regio.write(MPU6050_RA_INT_ENABLE, tmp)
                 success = True;
             else :
                 # unknown special command
@@ -3740,22 +3967,18 @@ class MPU6050:
     # DMP_CFG_1 register
 
     def getDMPConfig1() :
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_DMP_CFG_1, 1)[0]
+        return self.readByte(MPU6050_RA_DMP_CFG_1)
 
     def setDMPConfig1(self,config) :
-        tmp = bytearray(1)
-        tmp[0]=config
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_DMP_CFG_1, tmp)
+        self.writeByte(MPU6050_RA_DMP_CFG_1,config)
 
     # DMP_CFG_2 register
 
     def getDMPConfig2(self) :
-        return self.i2c.readfrom_mem(self.mpu6050_address, MPU6050_RA_DMP_CFG_2, 1)[0]
+        return self.readByte(MPU6050_RA_DMP_CFG_2)
 
     def setDMPConfig2(self,config) :
-        tmp = bytearray(1)
-        tmp[0]=config
-        self.i2c.writeto_mem(self.mpu6050_address, MPU6050_RA_DMP_CFG_2, tmp)
+        self.writeByte(MPU6050_RA_DMP_CFG_2,config)
 
     #***************************************************************************************
     #**********************           Calibration Routines            **********************
@@ -3786,12 +4009,12 @@ class MPU6050:
     '''
     def CalibrateAccel(self,Loops) :
 
-	kP = 0.3
-	kI = 20
-	x = (100 - self.map(Loops, 1, 5, 20, 0)) * .01
-	kP *= x
-	kI *= x
-	self.PID( 0x3B, kP, kI,  Loops) 
+        kP = 0.3
+        kI = 20
+        x = (100 - self.map(Loops, 1, 5, 20, 0)) * .01
+        kP *= x
+        kI *= x
+        self.PID( 0x3B, kP, kI,  Loops) 
 
     def PID(self,ReadAddress, kP, kI, Loops):
         ITerm = [None]*3
@@ -3810,44 +4033,44 @@ class MPU6050:
         else:
             shift = 2
 
-	gravity = 8192 # prevent uninitialized compiler warning
-	if ReadAddress == 0x3B :
+        gravity = 8192 # prevent uninitialized compiler warning
+        if ReadAddress == 0x3B :
             gravity = 16384 >> self.getFullScaleAccelRange()
-	print('>',end='')
+        print('>',end='')
         for i in range(3):
-            Data = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, SaveAddress + (i * shift) ,2)) # reads a 16 bit integers (Word)
-	    Reading = Data
-	    if SaveAddress != 0x13:
-	        BitZero[i] = Data & 1									      # Capture Bit Zero to properly handle Accelerometer calibration
-		ITerm[i] = Reading * 8.0
-	    else :
-		ITerm[i] = Reading * 4.0
-	for int in range(Loops):
-	    eSample = 0
+            Data = self.regio.readWord(SaveAddress + (i * shift) ) # reads a 16 bit integers (Word)
+            Reading = Data
+            if SaveAddress != 0x13:
+                BitZero[i] = Data & 1                                                                         # Capture Bit Zero to properly handle Accelerometer calibration
+                ITerm[i] = Reading * 8.0
+            else :
+                ITerm[i] = Reading * 4.0
+        for int in range(Loops):
+            eSample = 0
             for c in range(100): # 100 pi Calculations
-	        eSum = 0
+                eSum = 0
                 for i in range(3) :
-                    Data = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, ReadAddress + (i * 2), 2)) # reads a 16 bit integers (Word)
-		    Reading = Data
-		    # if ReadAddress == 0x3B and i == 2:
+                    Data = self.regio.readWord(ReadAddress + (i * 2)) # reads a 16 bit integers (Word)
+                    Reading = Data
+                    # if ReadAddress == 0x3B and i == 2:
                     if ReadAddress == 0x3B and i == 0:  # my mpu6050 is mounted vertically
-                        Reading -= gravity	        # remove Gravity
-		    Error = -Reading
-		    eSum += abs(Reading)
-		    PTerm = kP * Error
-		    ITerm[i] += (Error * 0.001) * kI				# Integral term 1000 Calculations a second = 0.001
-		    if SaveAddress != 0x13 :
-			Data = round((PTerm + ITerm[i] ) / 8)		        # Compute PID Output
-			Data = (Data & 0xFFFE) | BitZero[i]			        # Insert Bit0 Saved at beginning
-		    else :
-                        Data = round((PTerm + ITerm[i] ) / 4)	                # Compute PID Output
+                        Reading -= gravity              # remove Gravity
+                    Error = -Reading
+                    eSum += abs(Reading)
+                    PTerm = kP * Error
+                    ITerm[i] += (Error * 0.001) * kI                            # Integral term 1000 Calculations a second = 0.001
+                    if SaveAddress != 0x13 :
+                        Data = round((PTerm + ITerm[i] ) / 8)                   # Compute PID Output
+                        Data = (Data & 0xFFFE) | BitZero[i]                             # Insert Bit0 Saved at beginning
+                    else :
+                        Data = round((PTerm + ITerm[i] ) / 4)                   # Compute PID Output
                         
                     tmp = self.intToBytes(Data)
-                    self.i2c.writeto_mem(self.mpu6050_address, SaveAddress + (i * shift), tmp)
+                    self.regio.write(SaveAddress + (i * shift), tmp)
 
-		    if c == 99 and eSum > 1000 :				# Error is still to great to continue 
-			c = 0
-			print('*',end='')
+                    if c == 99 and eSum > 1000 :                                # Error is still to great to continue 
+                        c = 0
+                        print('*',end='')
 
                     if ReadAddress == 0x3B:
                         tmp = 0.5
@@ -3855,57 +4078,57 @@ class MPU6050:
                         tmp = 1
                     if eSum * tmp < 5:
                         eSample += 1
-		    # if((eSum * ((ReadAddress == 0x3B)?.05: 1)) < 5):
-                    #     eSample++;	// Successfully found offsets prepare to  advance
+                    # if((eSum * ((ReadAddress == 0x3B)?.05: 1)) < 5):
+                    #     eSample++;    // Successfully found offsets prepare to  advance
 
-		    if eSum < 100 and c > 10 and eSample >= 10 :
-                        break		#Advance to next Loop
-		    sleep_ms(1)
+                    if eSum < 100 and c > 10 and eSample >= 10 :
+                        break           #Advance to next Loop
+                    sleep_ms(1)
 
-	    print('.',end='')
-	    kP *= .75
-	    kI *= .75
+            print('.',end='')
+            kP *= .75
+            kI *= .75
             for i in range(3):
-		if SaveAddress != 0x13 :
-		    Data = round((ITerm[i] ) / 8)		# Compute PID Output
-		    Data = (Data & 0xFFFE) |BitZero[i]	# Insert Bit0 Saved at beginning
-		else :
+                if SaveAddress != 0x13 :
+                    Data = round((ITerm[i] ) / 8)               # Compute PID Output
+                    Data = (Data & 0xFFFE) |BitZero[i]  # Insert Bit0 Saved at beginning
+                else :
                     Data = round((ITerm[i]) / 4)
                     tmp = self.intToBytes(Data)
-                    self.i2c.writeto_mem(self.mpu6050_address, SaveAddress + (i * shift), tmp)
+                    self.regio.write(SaveAddress + (i * shift), tmp)
 
-	self.resetFIFO()
-	self.resetDMP()
+        self.resetFIFO()
+        self.resetDMP()
 
     def PrintActiveOffsets(self) :
         if self.getDeviceID() < 0x38 :    
-	    AOffsetRegister = MPU6050_RA_XA_OFFS_H
+            AOffsetRegister = MPU6050_RA_XA_OFFS_H
         else :
             AOffsetRegister = 0x77
-	Data = [None]*3
-	# print("Offset Register 0x{:04x}".format(AOffsetRegister>>4))
-	# print(AOffsetRegister&0x0F,HEX);
-	print("\n   X Accel  Y Accel  Z Accel   X Gyro   Y Gyro   Z Gyro      OFFSETS ")
-	if AOffsetRegister == 0x06 :
-            Data[0] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister, 2)) # reads a 16 bit integers (Word)
-            Data[1] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister+2, 2)) # reads a 16 bit integers (Word)
-            Data[2] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister+4, 2)) # reads a 16 bit integers (Word)
-
-	    # I2Cdev::readWords(devAddr, AOffsetRegister, 3, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
-	else :
-            Data[0] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister, 2)) # reads a 16 bit integers (Word)
-            Data[1] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister+3, 2)) # reads a 16 bit integers (Word)
-            Data[2] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, AOffsetRegister+6, 2)) # reads a 16 bit integers (Word)
-	    # I2Cdev::readWords(devAddr, AOffsetRegister, 1, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
-	    # I2Cdev::readWords(devAddr, AOffsetRegister+3, 1, (uint16_t *)Data+1, I2Cdev::readTimeout, wireObj);
-	    # I2Cdev::readWords(devAddr, AOffsetRegister+6, 1, (uint16_t *)Data+2, I2Cdev::readTimeout, wireObj);
+        Data = [None]*3
+        # print("Offset Register 0x{:04x}".format(AOffsetRegister>>4))
+        # print(AOffsetRegister&0x0F,HEX);
+        print("\n   X Accel  Y Accel  Z Accel   X Gyro   Y Gyro   Z Gyro      OFFSETS ")
+        if AOffsetRegister == 0x06 :
+            Data[0] = self.regio.readWord(AOffsetRegister) # reads a 16 bit integers (Word)
+            Data[1] = self.regio.readWord(AOffsetRegister+2) # reads a 16 bit integers (Word)
+            Data[2] = self.regio.readWord(AOffsetRegister+4) # reads a 16 bit integers (Word)
+
+            # I2Cdev::readWords(devAddr, AOffsetRegister, 3, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
+        else :
+            Data[0] = self.regio.readWord(AOffsetRegister) # reads a 16 bit integers (Word)
+            Data[1] = self.regio.readWord(AOffsetRegister+3) # reads a 16 bit integers (Word)
+            Data[2] = self.regio.readWord(AOffsetRegister+6) # reads a 16 bit integers (Word)
+            # I2Cdev::readWords(devAddr, AOffsetRegister, 1, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
+            # I2Cdev::readWords(devAddr, AOffsetRegister+3, 1, (uint16_t *)Data+1, I2Cdev::readTimeout, wireObj);
+            # I2Cdev::readWords(devAddr, AOffsetRegister+6, 1, (uint16_t *)Data+2, I2Cdev::readTimeout, wireObj);
 
         print("    {:5d},   ".format(int(Data[0])),end='')
         print("{:5d},   ".format(int(Data[1])),end='')
         print("{:5d},   ".format(int(Data[2])),end='')
         for i in range(3):
-            Data[i] = self.bytesToInt(self.i2c.readfrom_mem(self.mpu6050_address, 0x13 + 2*i, 2)) # reads a 16 bit integers (Word)
-	    # I2Cdev::readWords(devAddr, 0x13, 3, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
+            Data[i] = self.regio.readWord(0x13 + 2*i) # reads a 16 bit integers (Word)
+            # I2Cdev::readWords(devAddr, 0x13, 3, (uint16_t *)Data, I2Cdev::readTimeout, wireObj);
             # XG_OFFSET_H_READ_OFFS_USR(Data);
         print("{:5d},   ".format(int(Data[0])),end='')
         print("{:5d},   ".format(int(Data[1])),end='')
@@ -0,0 +1,267 @@
+'''!
+MPU6050_DMP_packet.py: decodes the 42 byte FIFO packets written by the MotionApps 2.0 DMP firmware
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Packet layout, all values are big endian 32 bit signed integers:
+<pre>
+   0..15  quaternion w, x, y, z     1.0 = 2^30
+  16..27  gyro x, y, z              the upper 16 bits are the raw gyro values
+  28..39  accel x, y, z             the upper 16 bits are the raw accel values, 1 g = 8192
+  40..41  unused
+</pre>
+The quaternion is decoded with full 32 bit precision, gyro and accel are reduced to their upper
+16 bits as in the i2cdevlib C++ code. A packet is decoded with a single unpack_from.
+All derived values (gravity, yaw/pitch/roll, linear acceleration) are written into
+preallocated float arrays.
+
+Typical use:
+<pre>
+  decoder = DMPPacket()
+  status,packet = mpu.GetCurrentFIFOPacket()
+  if status:
+      decoder.update(packet)
+      print(decoder.ypr[0],decoder.ypr[1],decoder.ypr[2])
+</pre>
+'''
+
+from array import array
+from struct import unpack_from
+from math import atan2, asin, sqrt, pi
+from MPU6050_const import *
+
+DMP_PACKET_FORMAT = '>4lhxxhxxhxxhxxhxxhxx2x'
+DMP_QUAT_SCALE    = 1.0 / 1073741824       # 2^30
+DMP_ACCEL_1G      = 8192                   # raw accel value for 1 g
+
+def _int16(buf,offset):
+    # big endian 16 bit signed value, no tuple
+    value = buf[offset] << 8 | buf[offset+1]
+    if value & 0x8000:
+        value -= 0x10000
+    return value
+
+def _quat(buf,offset):
+    # big endian 32 bit quaternion component scaled to 1.0, computed in float: the raw value
+    # does not fit into a small int
+    return (_int16(buf,offset) * 65536.0 + (buf[offset+2] << 8 | buf[offset+3])) * DMP_QUAT_SCALE
+
+class DMPPacket:
+
+    def __init__(self):
+        '''!
+        Create the decoder and its result arrays
+        '''
+        self.quat = array('l',[1<<30,0,0,0])   # raw quaternion w, x, y, z
+        self.gyro = array('h',[0,0,0])          # raw gyro x, y, z
+        self.accel = array('h',[0,0,0])         # raw accel x, y, z
+        self.q = array('f',[1.0,0.0,0.0,0.0])   # unit quaternion w, x, y, z
+        self.gravity = array('f',[0.0,0.0,1.0]) # gravity direction in the sensor frame in g
+        self.ypr = array('f',[0.0,0.0,0.0])     # yaw, pitch, roll in radians
+        self.euler = array('f',[0.0,0.0,0.0])   # psi, theta, phi in radians
+        self.linearAccel = array('f',[0.0,0.0,0.0])       # accel without gravity, sensor frame, raw units
+        self.linearAccelWorld = array('f',[0.0,0.0,0.0])  # accel without gravity, world frame, raw units
+
+    def decode(self,packet,offset=0):
+        '''!
+        Extract the raw quaternion, gyro and accel values from a packet
+        @param packet: bytes, bytearray or memoryview holding the packet
+        @param offset: start of the packet within the buffer
+        '''
+        qw,qx,qy,qz,gx,gy,gz,ax,ay,az = unpack_from(DMP_PACKET_FORMAT,packet,offset)
+        quat = self.quat
+        quat[0] = qw
+        quat[1] = qx
+        quat[2] = qy
+        quat[3] = qz
+        gyro = self.gyro
+        gyro[0] = gx
+        gyro[1] = gy
+        gyro[2] = gz
+        accel = self.accel
+        accel[0] = ax
+        accel[1] = ay
+        accel[2] = az
+        q = self.q
+        q[0] = qw * DMP_QUAT_SCALE
+        q[1] = qx * DMP_QUAT_SCALE
+        q[2] = qy * DMP_QUAT_SCALE
+        q[3] = qz * DMP_QUAT_SCALE
+
+    def computeGravity(self):
+        '''!
+        Direction of gravity in the sensor frame, derived from the quaternion
+        @return the gravity array
+        '''
+        w,x,y,z = self.q
+        gravity = self.gravity
+        gravity[0] = 2 * (x*z - w*y)
+        gravity[1] = 2 * (w*x + y*z)
+        gravity[2] = w*w - x*x - y*y + z*z
+        return gravity
+
+    def computeYawPitchRoll(self):
+        '''!
+        Yaw (about Z), pitch (nose up/down, about Y) and roll (tilt left/right, about X)
+        in radians. Needs the gravity computed by computeGravity()
+        @return the ypr array
+        '''
+        w,x,y,z = self.q
+        gx,gy,gz = self.gravity
+        ypr = self.ypr
+        ypr[0] = atan2(2*x*y - 2*w*z, 2*w*w + 2*x*x - 1)
+        pitch = atan2(gx, sqrt(gy*gy + gz*gz))
+        if gz < 0:
+            if pitch > 0:
+                pitch = pi - pitch
+            else:
+                pitch = -pi - pitch
+        ypr[1] = pitch
+        ypr[2] = atan2(gy, gz)
+        return ypr
+
+    def computeEuler(self):
+        '''!
+        Euler angles psi, theta, phi in radians
+        @return the euler array
+        '''
+        w,x,y,z = self.q
+        euler = self.euler
+        euler[0] = atan2(2*x*y - 2*w*z, 2*w*w + 2*x*x - 1)
+        euler[1] = -asin(2*x*z + 2*w*y)
+        euler[2] = atan2(2*y*z - 2*w*x, 2*w*w + 2*z*z - 1)
+        return euler
+
+    def computeLinearAccel(self):
+        '''!
+        Remove the gravity component from the measured acceleration.
+        Needs the gravity computed by computeGravity()
+        @return the linearAccel array, in raw units (1 g = 8192)
+        '''
+        accel = self.accel
+        gravity = self.gravity
+        linear = self.linearAccel
+        linear[0] = accel[0] - gravity[0] * DMP_ACCEL_1G
+        linear[1] = accel[1] - gravity[1] * DMP_ACCEL_1G
+        linear[2] = accel[2] - gravity[2] * DMP_ACCEL_1G
+        return linear
+
+    def computeLinearAccelInWorld(self):
+        '''!
+        Rotate the linear acceleration into the frame of reference of the initial orientation.
+        Needs the linear acceleration computed by computeLinearAccel()
+        @return the linearAccelWorld array, in raw units (1 g = 8192)
+        '''
+        w,x,y,z = self.q
+        vx,vy,vz = self.linearAccel
+        # v' = q v q*, written as v + 2w (u x v) + 2 u x (u x v) with u = (x,y,z)
+        tx = 2 * (y*vz - z*vy)
+        ty = 2 * (z*vx - x*vz)
+        tz = 2 * (x*vy - y*vx)
+        world = self.linearAccelWorld
+        world[0] = vx + w*tx + (y*tz - z*ty)
+        world[1] = vy + w*ty + (z*tx - x*tz)
+        world[2] = vz + w*tz + (x*ty - y*tx)
+        return world
+
+    def update(self,packet,offset=0):
+        '''!
+        Decode a packet and compute all derived values
+        @param packet: bytes, bytearray or memoryview holding the packet
+        @param offset: start of the packet within the buffer
+        '''
+        self.decode(packet,offset)
+        self.computeGravity()
+        self.computeYawPitchRoll()
+        self.computeLinearAccel()
+        self.computeLinearAccelInWorld()
+
+class DMPPacketBatch:
+
+    def __init__(self,capacity=16,packetSize=MPU6050_DMP_PACKET_SIZE):
+        '''!
+        Decode several DMP packets read from the FIFO in a single I2C transfer into columnar arrays
+        @param capacity: max number of packets per read
+        @param packetSize: the DMP packet size
+        '''
+        self.capacity = capacity
+        self.packetSize = packetSize
+        self.buf = bytearray(capacity * packetSize)
+        # one view per number of packets: slicing in read() would allocate
+        bufView = memoryview(self.buf)
+        self.bufViews = [bufView[:n * packetSize] for n in range(capacity + 1)]
+        self.count = 0                      # number of valid packets in the columns
+        self.overflows = 0                  # FIFO resets after overflow or loss of packet alignment
+        # columns
+        self.qw = array('f',[0.0]*capacity)
+        self.qx = array('f',[0.0]*capacity)
+        self.qy = array('f',[0.0]*capacity)
+        self.qz = array('f',[0.0]*capacity)
+        self.gx = array('h',[0]*capacity)
+        self.gy = array('h',[0]*capacity)
+        self.gz = array('h',[0]*capacity)
+        self.ax = array('h',[0]*capacity)
+        self.ay = array('h',[0]*capacity)
+        self.az = array('h',[0]*capacity)
+
+    def read(self,mpu):
+        '''!
+        Read all complete packets, up to capacity, from the FIFO and decode them.
+        If the FIFO overflowed or its byte count is not a multiple of the packet size,
+        the packet boundaries are lost: the FIFO is reset and the event counted in overflows.
+        @param mpu: the MPU6050 object
+        @return number of packets decoded
+        '''
+        packetSize = self.packetSize
+        fifoC = mpu.getFIFOCount()
+        if fifoC + packetSize > MPU6050_FIFO_SIZE or fifoC % packetSize:
+            self.overflows += 1
+            mpu.resetFIFO()
+            self.count = 0
+            return 0
+        n = fifoC // packetSize
+        if n > self.capacity:
+            n = self.capacity
+        if n:
+            mpu.getFIFOBytesInto(self.bufViews[n])
+        return self.decode(self.buf,n)
+
+    def decode(self,buf,n):
+        '''!
+        Decode n consecutive packets into the columns.
+        The values are taken from their fixed offsets in the packets, no tuple is built. The
+        quaternion components are floats: on ports with boxed floats, like the ESP32, each of
+        them still allocates a float object before it is stored into its column.
+        @param buf: buffer holding the packets
+        @param n: number of packets
+        @return number of packets decoded
+        '''
+        if n > self.capacity:
+            n = self.capacity
+        packetSize = self.packetSize
+        qw = self.qw
+        qx = self.qx
+        qy = self.qy
+        qz = self.qz
+        gx = self.gx
+        gy = self.gy
+        gz = self.gz
+        ax = self.ax
+        ay = self.ay
+        az = self.az
+        offset = 0
+        for i in range(n):
+            qw[i] = _quat(buf,offset)
+            qx[i] = _quat(buf,offset+4)
+            qy[i] = _quat(buf,offset+8)
+            qz[i] = _quat(buf,offset+12)
+            gx[i] = _int16(buf,offset+16)
+            gy[i] = _int16(buf,offset+20)
+            gz[i] = _int16(buf,offset+24)
+            ax[i] = _int16(buf,offset+28)
+            ay[i] = _int16(buf,offset+32)
+            az[i] = _int16(buf,offset+36)
+            offset += packetSize
+        self.count = n
+        return n
@@ -157,6 +157,16 @@ MPU6050_RA_FIFO_COUNTL     = const(0x73)
 MPU6050_RA_FIFO_R_W        = const(0x74)
 MPU6050_RA_WHO_AM_I        = const(0x75)
 
+MPU6050_NO_OF_REGISTERS    = const(0x80)
+MPU6050_MOTION_FRAME_SIZE  = const(14)  # ACCEL_XOUT_H .. GYRO_ZOUT_L
+# configuration registers that can be collected in a configure() block
+# USER_CTRL, PWR_MGMT_1, SIGNAL_PATH_RESET and I2C_SLV4_CTRL contain self clearing bits,
+# the FIFO, DMP memory and the status registers change by themselves: these are always accessed directly
+MPU6050_BATCHABLE_REGISTERS = tuple(range(MPU6050_RA_SMPLRT_DIV,MPU6050_RA_I2C_SLV4_DO+1)) + \
+                              (MPU6050_RA_INT_PIN_CFG,MPU6050_RA_INT_ENABLE) + \
+                              tuple(range(MPU6050_RA_I2C_SLV0_DO,MPU6050_RA_I2C_MST_DELAY_CTRL+1)) + \
+                              (MPU6050_RA_MOT_DETECT_CTRL,MPU6050_RA_PWR_MGMT_2)
+
 MPU6050_SELF_TEST_XA_1_BIT    = const(0x07)
 MPU6050_SELF_TEST_XA_1_LENGTH = const(0x03)
 MPU6050_SELF_TEST_XA_2_BIT    = const(0x05)
@@ -415,6 +425,20 @@ MPU6050_WHO_AM_I_LENGTH     = const(6)
 MPU6050_DMP_MEMORY_BANKS        = const(8)
 MPU6050_DMP_MEMORY_BANK_SIZE    = const(256)
 MPU6050_DMP_MEMORY_CHUNK_SIZE   = const(16)
+MPU6050_DMP_LOAD_CHUNK_SIZE     = const(128)   # bytes per I2C transfer in loadDMPImage()
+# MotionApps 2.0 DMP firmware image. dmpMemory.bin must be uploaded to the ESP32 together with
+# the driver, into the same directory, e.g.  mpremote cp src/dmpMemory.bin :
+# The path is taken relative to this module where __file__ is available, relative to the
+# working directory otherwise (e.g. for a frozen module)
+try:
+    MPU6050_DMP_IMAGE = __file__[:__file__.rfind("/")+1] + "dmpMemory.bin"
+except NameError:
+    MPU6050_DMP_IMAGE = "dmpMemory.bin"
 
 MPU6050_FIFO_DEFAULT_TIMEOUT = const(11000)
+MPU6050_FIFO_SIZE            = const(1024)
+MPU6050_FIFO_RESET_THRESHOLD = const(200)    # reset rather than discard above this FIFO count
+MPU6050_DMP_PACKET_SIZE      = const(42)     # MotionApps 2.0 FIFO packet
+
+I2CDEVLIB_WIRE_BUFFER_LENGTH = const(32)     # max number of bytes per FIFO read when discarding
 
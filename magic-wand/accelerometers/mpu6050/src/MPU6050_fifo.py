@@ -0,0 +1,195 @@
+'''!
+MPU6050_fifo.py: streams raw sensor frames through the 1024 byte hardware FIFO of the MPU6050
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+The MPU6050 writes the enabled sensor registers into its FIFO at the sample rate, in
+order of their register address:
+<pre>
+  ACCEL_XOUT, ACCEL_YOUT, ACCEL_ZOUT  6 bytes  setAccelFIFOEnabled()
+  TEMP_OUT                            2 bytes  setTempFIFOEnabled()
+  GYRO_XOUT                           2 bytes  setXGyroFIFOEnabled()
+  GYRO_YOUT                           2 bytes  setYGyroFIFOEnabled()
+  GYRO_ZOUT                           2 bytes  setZGyroFIFOEnabled()
+</pre>
+All values are big endian 16 bit signed integers.
+FIFOStream reads the FIFO in I2C transfers holding whole frames only, byte swaps each transfer
+into a preallocated array('h') and keeps the frames in a RingBuffer of 16 bit values.
+Nothing is allocated while the FIFO is drained.
+The hardware FIFO can hold 1024/12 = 85 frames with accel and gyro enabled, that's 85 ms at
+a 1 kHz sample rate: the program can sleep in between calls to drain().
+
+Typical use:
+<pre>
+  mpu = MPU6050()
+  mpu.setDLPFMode(MPU6050_DLPF_BW_188)    # 1 kHz gyro output rate
+  mpu.setRate(0)                          # 1 kHz sample rate
+  stream = FIFOStream(mpu,accel=True,gyro=True)
+  stream.start()
+  frame = array('h',[0]*stream.words)
+  while True:
+      stream.drain()
+      while stream.read(frame):
+          ...
+      sleep_ms(20)
+</pre>
+'''
+
+from array import array
+from MPU6050_const import *
+from ringbuffer import RingBuffer
+
+FIFO_CHUNK_SIZE = 120          # max number of bytes read in a single I2C transfer
+
+class FIFOStream:
+
+    def __init__(self,mpu,accel=True,gyro=True,temp=False,capacity=256,chunkSize=FIFO_CHUNK_SIZE,
+                 timestamps=False,debug=False):
+        '''!
+        Create a FIFO stream
+        @param mpu: the MPU6050 object
+        @param accel: put the 3 accelerometer values into the FIFO
+        @param gyro: put the 3 gyroscope values into the FIFO, a tuple of 3 booleans selects single axes
+        @param temp: put the temperature into the FIFO
+        @param capacity: number of frames kept in the ring buffer
+        @param chunkSize: max number of bytes per I2C transfer
+        @param timestamps: keep the ticks_us() time of each frame
+        '''
+        self.mpu = mpu
+        self.debug = debug
+        self.accel = accel
+        self.temp = temp
+        if gyro is True or gyro is False:
+            gyro = (gyro,gyro,gyro)
+        self.gyro = gyro
+
+        # the frame layout follows the register order
+        self.frameSize = 0
+        if accel:
+            self.frameSize += 6
+        if temp:
+            self.frameSize += 2
+        for axis in gyro:
+            if axis:
+                self.frameSize += 2
+        if self.frameSize == 0:
+            raise ValueError("FIFOStream: no sensor enabled")
+        self.words = self.frameSize // 2
+
+        # I2C transfers always hold whole frames
+        self.framesPerChunk = max(1,chunkSize // self.frameSize)
+        self.chunk = bytearray(self.framesPerChunk * self.frameSize)
+        # one view per number of frames in a transfer: slicing in drain() would allocate
+        chunkView = memoryview(self.chunk)
+        self.chunkViews = [chunkView[:n * self.frameSize] for n in range(self.framesPerChunk + 1)]
+        self.values = array('h',[0] * (self.framesPerChunk * self.words))
+
+        self.ring = RingBuffer(capacity,self.words,timestamps)
+        self.period = 0               # us between 2 frames, to timestamp the frames of a transfer
+
+        # statistics
+        self.frames = 0               # frames transferred from the FIFO
+        self.overflows = 0            # FIFO resets after overflow or loss of frame alignment
+
+    def start(self):
+        '''!
+        Select the FIFO sources, enable and reset the FIFO
+        '''
+        mpu = self.mpu
+        with mpu.configure():
+            mpu.setAccelFIFOEnabled(self.accel)
+            mpu.setTempFIFOEnabled(self.temp)
+            mpu.setXGyroFIFOEnabled(self.gyro[0])
+            mpu.setYGyroFIFOEnabled(self.gyro[1])
+            mpu.setZGyroFIFOEnabled(self.gyro[2])
+        mpu.setFIFOEnabled(True)
+        self.resync()
+        self.ring.discard()
+        # sample rate = gyro output rate / (1 + rate divider), the gyro output rate is 8 kHz
+        # with the DLPF disabled, 1 kHz otherwise
+        gyroRate = 1000
+        if mpu.getDLPFMode() in (0,7):
+            gyroRate = 8000
+        self.period = 1000000 * (1 + mpu.getRate()) // gyroRate
+
+    def stop(self):
+        '''!
+        Stop writing sensor data into the FIFO
+        '''
+        mpu = self.mpu
+        with mpu.configure():
+            mpu.setAccelFIFOEnabled(False)
+            mpu.setTempFIFOEnabled(False)
+            mpu.setXGyroFIFOEnabled(False)
+            mpu.setYGyroFIFOEnabled(False)
+            mpu.setZGyroFIFOEnabled(False)
+        mpu.setFIFOEnabled(False)
+
+    def resync(self):
+        '''!
+        Throw away the FIFO contents. The next byte read is the start of a frame
+        '''
+        self.mpu.resetFIFO()
+
+    def drain(self):
+        '''!
+        Transfer all complete frames from the hardware FIFO into the ring buffer.
+        Frames are only read as long as there is space in the ring buffer, the others
+        stay in the hardware FIFO.
+        If the hardware FIFO overflowed, or its byte count is not a multiple of the frame size,
+        the frame boundaries are lost: the FIFO is reset and the event counted in overflows.
+        @return number of frames transferred
+        '''
+        count = self.mpu.getFIFOCount()
+        if count + self.frameSize > MPU6050_FIFO_SIZE or count % self.frameSize:
+            self.overflows += 1
+            if self.debug:
+                print("FIFOStream: FIFO overflow, {:d} bytes in the FIFO, resynchronising".format(count))
+            self.resync()
+            return 0
+        available = count // self.frameSize
+        free = self.ring.free()
+        if available > free:
+            available = free
+        transferred = 0
+        while transferred < available:
+            n = available - transferred
+            if n > self.framesPerChunk:
+                n = self.framesPerChunk
+            self.decode(n)
+            transferred += n
+        self.frames += transferred
+        return transferred
+
+    def decode(self,n):
+        '''!
+        Read n frames from the FIFO and append them to the ring buffer
+        '''
+        self.mpu.getFIFOBytesInto(self.chunkViews[n])
+        # big endian to native 16 bit values
+        chunk = self.chunk
+        values = self.values
+        j = 0
+        for i in range(n * self.words):
+            value = chunk[j] << 8 | chunk[j+1]
+            if value & 0x8000:
+                value -= 0x10000
+            values[i] = value
+            j += 2
+        self.ring.write_block(values,n,period=self.period)
+
+    def available(self):
+        '''!
+        @return number of frames in the ring buffer
+        '''
+        return self.ring.available()
+
+    def read(self,frame,stamp=None):
+        '''!
+        Copy the oldest frame from the ring buffer
+        @param frame: an array('h') or list of at least words elements
+        @param stamp: an array('l') of at least 1 element receiving the timestamp
+        @return True if a frame was copied, False if the ring buffer is empty
+        '''
+        return self.ring.read_block(frame,1,stamp)
@@ -0,0 +1,285 @@
+'''!
+adxl345_model.py: register level model of the ADXL345 accelerometer
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Modelled after the data sheet (Rev. G):
+- output data rate from BW_RATE, sampling only in measurement mode (POWER_CTL)
+- DATA_FORMAT: range, full resolution, left justified data, INT_INVERT; offsets OFSX..OFSZ
+- FIFO in bypass, FIFO, stream and trigger mode with 32 entries plus the sample in the
+  output registers: FIFO_STATUS reports up to 33 entries. In trigger mode the FIFO runs as a
+  stream until an interrupt is raised on the line selected by the trigger bit, then keeps the
+  last "samples" entries, sets FIFO_TRIG and continues in FIFO mode. Going through bypass
+  mode re-arms the trigger.
+  Any read transfer touching DATAX0..DATAZ1 pops one entry.
+- INT_SOURCE: DATA_READY, watermark and overrun follow the FIFO; activity and inactivity
+  (dc and ac coupled, on the full resolution data whatever the range) are evaluated at each
+  sample when enabled and latched until INT_SOURCE is read
+- INT_MAP routes the enabled sources to the INT1 and INT2 lines
+Tap and free fall detection, self test, sleep and auto sleep are not modelled.
+'''
+
+from regmodel import RegisterModel
+
+DEVID           = 0x00
+OFSX            = 0x1e
+THRESH_ACT      = 0x24
+THRESH_INACT    = 0x25
+TIME_INACT      = 0x26
+ACT_INACT_CTL   = 0x27
+ACT_TAP_STATUS  = 0x2b
+BW_RATE         = 0x2c
+POWER_CTL       = 0x2d
+INT_ENABLE      = 0x2e
+INT_MAP         = 0x2f
+INT_SOURCE      = 0x30
+DATA_FORMAT     = 0x31
+DATAX0          = 0x32
+DATAZ1          = 0x37
+FIFO_CTL        = 0x38
+FIFO_STATUS     = 0x39
+
+DATA_READY      = 0x80
+ACTIVITY        = 0x10
+INACTIVITY      = 0x08
+WATERMARK       = 0x02
+OVERRUN         = 0x01
+LATCHED         = 0x7c          # tap, activity, inactivity, free fall: cleared by reading INT_SOURCE
+
+BYPASS          = 0
+FIFO            = 1
+STREAM          = 2
+TRIGGER         = 3
+
+FIFO_DEPTH      = 33            # 32 FIFO levels + the output registers
+FIFO_TRIG       = 0x80
+
+class ADXL345Model(RegisterModel):
+    SIZE = 0x40
+    ADDRESS = 0x53
+
+    def reset(self):
+        super().reset()
+        self.regs[DEVID] = 0xe5
+        self.regs[BW_RATE] = 0x0a
+        self.fifo = []                 # samples not yet read, fifo[0] is in the output registers
+        self.output = (0,0,0)          # contents of the output registers
+        self.dataReady = False
+        self.overrun = False
+        self.triggered = False         # trigger mode: the trigger event has been seen
+        self.latched = 0               # latched INT_SOURCE bits
+        self.actTapStatus = 0
+        self.actReference = None       # ac coupled activity reference
+        self.inactReference = None
+        self.inactSince = None         # start of the current inactivity period
+        self.popped = False
+        self.restartSampling()
+
+    # conversion
+
+    def scale(self):
+        '''
+        @return LSB per g and number of bits of the output data
+        '''
+        fmt = self.regs[DATA_FORMAT]
+        rng = fmt & 0x03
+        if fmt & 0x08:
+            return 256,10 + rng
+        return 256 >> rng,10
+
+    def convert(self,accel):
+        scale,bits = self.scale()
+        raw = []
+        for i in range(3):
+            offset = self.signed(self.regs[OFSX + i]) * 0.0156
+            raw.append(self.toRaw(accel[i] + offset,scale,bits))
+        return raw
+
+    @staticmethod
+    def signed(value):
+        return value - 256 if value & 0x80 else value
+
+    def encode(self,value):
+        fmt = self.regs[DATA_FORMAT]
+        if fmt & 0x04:                 # left justified
+            scale,bits = self.scale()
+            value <<= 16 - bits
+        return value & 0xffff
+
+    # sampling
+
+    def samplePeriod(self):
+        if not self.regs[POWER_CTL] & 0x08:
+            return 0
+        code = self.regs[BW_RATE] & 0x0f
+        return 1000000 / (3200 / (1 << (15 - code)))
+
+    def fifoMode(self):
+        return self.regs[FIFO_CTL] >> 6
+
+    def sample(self,t):
+        accel = self.motion.accel(t)
+        raw = self.convert(accel)
+        mode = self.fifoMode()
+        if mode == BYPASS:
+            if self.dataReady:
+                self.overrun = True
+            self.output = raw
+            self.dataReady = True
+        elif len(self.fifo) < FIFO_DEPTH:
+            self.fifo.append(raw)
+        elif mode == STREAM or (mode == TRIGGER and not self.triggered):
+            self.fifo.pop(0)           # the oldest unread sample is lost
+            self.fifo.append(raw)
+            self.overrun = True
+        self.detect(accel)
+        if mode == TRIGGER and not self.triggered and self.triggerLevel():
+            # keep the last samples entries, then behave as FIFO mode
+            self.triggered = True
+            keep = self.regs[FIFO_CTL] & 0x1f
+            del self.fifo[:max(0,len(self.fifo) - keep)]
+        if self.fifo:
+            self.output = self.fifo[0]
+
+    def detect(self,accel):
+        enabled = self.regs[INT_ENABLE]
+        ctl = self.regs[ACT_INACT_CTL]
+        if enabled & ACTIVITY and ctl & 0x70:
+            threshold = self.regs[THRESH_ACT] * 16      # 62.5 mg/LSB, in 3.9 mg/LSB units
+            reference = (0,0,0)
+            if ctl & 0x80:                               # ac coupled
+                if self.actReference is None:
+                    self.actReference = self.fullRes(accel)
+                reference = self.actReference
+            value = self.fullRes(accel)
+            source = 0
+            for axis,bit in ((0,0x40),(1,0x20),(2,0x10)):
+                if ctl & bit and abs(value[axis] - reference[axis]) > threshold:
+                    source |= bit
+            if source:
+                self.latched |= ACTIVITY
+                self.actTapStatus = (self.actTapStatus & 0x0f) | (source & 0x70)
+                self.actReference = None
+                self.inactSince = None
+                self.inactReference = None
+        if enabled & INACTIVITY and ctl & 0x07:
+            threshold = self.regs[THRESH_INACT] * 16
+            value = self.fullRes(accel)
+            reference = (0,0,0)
+            if ctl & 0x08:
+                if self.inactReference is None:
+                    self.inactReference = value
+                reference = self.inactReference
+            quiet = True
+            for axis,bit in ((0,0x04),(1,0x02),(2,0x01)):
+                if ctl & bit and abs(value[axis] - reference[axis]) > threshold:
+                    quiet = False
+            now = self.world.now if self.world is not None else 0
+            if not quiet:
+                self.inactSince = None
+                self.inactReference = None
+            elif self.inactSince is None:
+                self.inactSince = now
+            elif now - self.inactSince >= self.regs[TIME_INACT] * 1000000:
+                self.latched |= INACTIVITY
+                self.inactSince = None
+                self.actReference = None
+
+    def fullRes(self,accel):
+        # the thresholds compare the data at 3.9 mg/LSB and +-16 g, whatever the range
+        value = []
+        for i in range(3):
+            offset = self.signed(self.regs[OFSX + i]) * 0.0156
+            value.append(self.toRaw(accel[i] + offset,256,13))
+        return value
+
+    # registers
+
+    def entries(self):
+        if self.fifoMode() == BYPASS:
+            return 0
+        return len(self.fifo)
+
+    def intSource(self):
+        source = self.latched
+        if self.fifoMode() == BYPASS:
+            if self.dataReady:
+                source |= DATA_READY
+        elif self.fifo:
+            source |= DATA_READY
+        samples = self.regs[FIFO_CTL] & 0x1f
+        if self.fifoMode() != BYPASS and samples and len(self.fifo) >= samples:
+            source |= WATERMARK
+        if self.overrun:
+            source |= OVERRUN
+        return source
+
+    def readRegister(self,register):
+        if DATAX0 <= register <= DATAZ1:
+            value = self.encode(self.output[(register - DATAX0) >> 1])
+            if register & 1:
+                return value >> 8
+            return value & 0xff
+        if register == INT_SOURCE:
+            return self.intSource()
+        if register == FIFO_STATUS:
+            if self.fifoMode() == TRIGGER and self.triggered:
+                return self.entries() | FIFO_TRIG
+            return self.entries()
+        if register == ACT_TAP_STATUS:
+            return self.actTapStatus
+        return self.regs[register]
+
+    def endRead(self,first,last):
+        if first <= DATAZ1 and last >= DATAX0:
+            if self.fifoMode() == BYPASS:
+                self.dataReady = False
+                self.overrun = False
+            elif self.fifo:
+                self.fifo.pop(0)
+                self.overrun = False
+                if self.fifo:
+                    self.output = self.fifo[0]
+        if first <= INT_SOURCE <= last:
+            self.latched = 0
+            self.actTapStatus = 0
+
+    def writeRegister(self,register,value):
+        if register in (DEVID,INT_SOURCE,FIFO_STATUS,ACT_TAP_STATUS) or DATAX0 <= register <= DATAZ1:
+            return                     # read only
+        old = self.regs[register]
+        self.regs[register] = value
+        if register in (BW_RATE,POWER_CTL) and old != value:
+            if register == BW_RATE or (old ^ value) & 0x08:
+                self.restartSampling()
+        elif register == FIFO_CTL and (value >> 6) == BYPASS:
+            del self.fifo[:]           # bypass mode clears the FIFO and re-arms the trigger
+            self.overrun = False
+            self.triggered = False
+        elif register in (ACT_INACT_CTL,INT_ENABLE,THRESH_ACT,THRESH_INACT):
+            self.actReference = None
+            self.inactReference = None
+            self.inactSince = None
+
+    # interrupts
+
+    def triggerLevel(self):
+        # the trigger event: an interrupt on the line selected by the trigger bit
+        line = 2 if self.regs[FIFO_CTL] & 0x20 else 1
+        level = self.interruptLevel(line)
+        if self.regs[DATA_FORMAT] & 0x20:
+            level = not level
+        return level
+
+    def interruptLevel(self,line):
+        active = self.intSource() & self.regs[INT_ENABLE]
+        mapping = self.regs[INT_MAP]
+        if line == 2:
+            active &= mapping
+        else:
+            active &= ~mapping
+        level = bool(active)
+        if self.regs[DATA_FORMAT] & 0x20:
+            level = not level
+        return level
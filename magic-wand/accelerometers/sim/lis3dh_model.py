@@ -0,0 +1,305 @@
+'''!
+lis3dh_model.py: register level model of the LIS3DH accelerometer
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Modelled after the data sheet (DocID17530 Rev 2) and application note AN3308:
+- output data rate and low power mode from CTRL_REG1, full scale, high resolution and
+  big/little endian data from CTRL_REG4: 8, 10 or 12 bit left justified data
+- I2C: the register address auto-increments only if bit 7 of the sub address is set,
+  SPI: if the multi-byte bit of the command is set
+- FIFO (CTRL_REG5 FIFO_EN) in bypass, FIFO, stream and stream-to-FIFO mode, 32 levels.
+  Stream-to-FIFO runs as stream mode until the interrupt generator selected by the TR bit
+  (0: INT1, 1: INT2) raises its IA flag, then as FIFO mode: the FIFO stops collecting once
+  it is full. Going through bypass mode re-arms the trigger. In FIFO modes the register address rolls over from
+  OUT_Z_H to OUT_X_L and reading OUT_Z_H pops the next sample into the output registers.
+  FIFO_SRC_REG reports the watermark, overrun and empty flags and the number of samples
+  (0 with OVRN set when all 32 levels are filled)
+- STATUS_REG ZYXDA/ZYXOR in bypass mode
+- the two interrupt generators (INTx_CFG, THS, DURATION) in OR and AND mode with the
+  high and low events, latched in INTx_SRC if LIR_INTx is set, until INTx_SRC is read
+- INT1 routing (CTRL_REG3): IA1, IA2, ZYXDA, watermark, overrun; INT2 routing
+  (CTRL_REG6): IA1, IA2; INT_POLARITY
+- the temperature sensor on OUT_ADC3 (1 digit/deg C, offset as observed on our boards)
+Click detection, 6D/4D detection, the high pass filter and the ADC inputs are not modelled.
+'''
+
+from regmodel import RegisterModel
+
+STATUS_REG_AUX  = 0x07
+OUT_ADC1_L      = 0x08
+OUT_ADC3_L      = 0x0c
+OUT_ADC3_H      = 0x0d
+WHO_AM_I        = 0x0f
+CTRL_REG0       = 0x1e
+TEMP_CFG_REG    = 0x1f
+CTRL_REG1       = 0x20
+CTRL_REG3       = 0x22
+CTRL_REG4       = 0x23
+CTRL_REG5       = 0x24
+CTRL_REG6       = 0x25
+STATUS_REG      = 0x27
+OUT_X_L         = 0x28
+OUT_Z_H         = 0x2d
+FIFO_CTRL_REG   = 0x2e
+FIFO_SRC_REG    = 0x2f
+INT1_CFG        = 0x30
+INT1_SRC        = 0x31
+INT2_CFG        = 0x34
+INT2_SRC        = 0x35
+CLICK_SRC       = 0x39
+
+READ_ONLY = (STATUS_REG_AUX,WHO_AM_I,STATUS_REG,FIFO_SRC_REG,INT1_SRC,INT2_SRC,CLICK_SRC) + \
+            tuple(range(OUT_ADC1_L,OUT_ADC3_H+1)) + tuple(range(OUT_X_L,OUT_Z_H+1))
+
+ODR = (0,1,10,25,50,100,200,400,1620,1344)
+SENSITIVITY = (1,2,4,12)            # mg/digit in high resolution mode for +-2, 4, 8, 16 g
+THRESHOLD = (16,32,62,186)          # mg/LSB of INTx_THS for +-2, 4, 8, 16 g
+TEMPERATURE_OFFSET = 37             # see lis3dh.temperature_calib
+
+BYPASS          = 0
+FIFO            = 1
+STREAM          = 2
+STREAM_TO_FIFO  = 3
+FIFO_DEPTH      = 32
+
+class InterruptGenerator:
+    '''
+    One of the two interrupt generators, configured by INTx_CFG, INTx_THS and INTx_DURATION
+    '''
+    def __init__(self,model,cfg,latchBit):
+        self.model = model
+        self.cfg = cfg                 # address of INTx_CFG, SRC = cfg+1, THS = cfg+2, DURATION = cfg+3
+        self.latchBit = latchBit       # LIR_INTx bit in CTRL_REG5
+        self.count = 0                 # number of consecutive samples meeting the condition
+        self.source = 0                # INTx_SRC
+
+    def evaluate(self,mg):
+        regs = self.model.regs
+        cfg = regs[self.cfg]
+        if not cfg & 0x3f:
+            self.count = 0
+            if not regs[CTRL_REG5] & self.latchBit:
+                self.source = 0
+            return
+        fs = (regs[CTRL_REG4] >> 4) & 0x03
+        threshold = (regs[self.cfg + 2] & 0x7f) * THRESHOLD[fs]
+        events = 0
+        for axis in range(3):
+            if abs(mg[axis]) > threshold:
+                events |= 0x02 << (2 * axis)     # XH, YH, ZH
+            else:
+                events |= 0x01 << (2 * axis)     # XL, YL, ZL
+        enabled = cfg & 0x3f
+        if cfg & 0x80:                           # AND combination
+            active = events & enabled == enabled
+        else:
+            active = bool(events & enabled)
+        if active:
+            self.count += 1
+        else:
+            self.count = 0
+        duration = regs[self.cfg + 3] & 0x7f
+        if active and self.count > duration:
+            self.source = 0x40 | (events & enabled)
+        elif not regs[CTRL_REG5] & self.latchBit:
+            self.source = 0
+
+    def read(self):
+        value = self.source
+        if self.model.regs[CTRL_REG5] & self.latchBit:
+            self.source = 0                      # latched: cleared by reading INTx_SRC
+        return value
+
+class LIS3DHModel(RegisterModel):
+    SIZE = 0x40
+    ADDRESS = 0x18
+
+    def reset(self):
+        super().reset()
+        self.regs[WHO_AM_I] = 0x33
+        self.regs[CTRL_REG0] = 0x10
+        self.regs[CTRL_REG1] = 0x07
+        self.fifo = []
+        self.output = (0,0,0)
+        self.dataReady = False
+        self.dataOverrun = False
+        self.fifoOverrun = False
+        self.triggered = False                   # stream-to-FIFO: the trigger event has been seen
+        self.int1 = InterruptGenerator(self,INT1_CFG,0x08)
+        self.int2 = InterruptGenerator(self,INT2_CFG,0x02)
+        self.restartSampling()
+
+    # conversion
+
+    def resolution(self):
+        if self.regs[CTRL_REG1] & 0x08:
+            return 8
+        if self.regs[CTRL_REG4] & 0x08:
+            return 12
+        return 10
+
+    def convert(self,accel):
+        fs = (self.regs[CTRL_REG4] >> 4) & 0x03
+        scale = 16000 / SENSITIVITY[fs]          # left justified: 16 LSB per digit of the 12 bit data
+        drop = 16 - self.resolution()
+        enables = self.regs[CTRL_REG1]
+        raw = []
+        for axis in range(3):
+            if not enables & (1 << axis):
+                raw.append(0)
+                continue
+            value = self.toRaw(accel[axis],scale)
+            raw.append((value >> drop) << drop)
+        return raw
+
+    def toMilliG(self,raw):
+        fs = (self.regs[CTRL_REG4] >> 4) & 0x03
+        return [value * SENSITIVITY[fs] / 16 for value in raw]
+
+    # sampling
+
+    def samplePeriod(self):
+        code = self.regs[CTRL_REG1] >> 4
+        if code == 0 or code >= len(ODR):
+            return 0
+        rate = ODR[code]
+        if code == 9 and self.regs[CTRL_REG1] & 0x08:
+            rate = 5376
+        return 1000000 / rate
+
+    def fifoMode(self):
+        if not self.regs[CTRL_REG5] & 0x40:
+            return BYPASS
+        return self.regs[FIFO_CTRL_REG] >> 6
+
+    def sample(self,t):
+        raw = self.convert(self.motion.accel(t))
+        mode = self.fifoMode()
+        if mode == BYPASS:
+            if self.dataReady:
+                self.dataOverrun = True
+            self.output = raw
+            self.dataReady = True
+        else:
+            if len(self.fifo) < FIFO_DEPTH:
+                self.fifo.append(raw)
+            elif mode == STREAM or (mode == STREAM_TO_FIFO and not self.triggered):
+                # stream: the oldest sample is overwritten
+                self.fifo.pop(0)
+                self.fifo.append(raw)
+            if len(self.fifo) == FIFO_DEPTH:
+                self.fifoOverrun = True
+            self.output = self.fifo[0]
+        mg = self.toMilliG(raw)
+        self.int1.evaluate(mg)
+        self.int2.evaluate(mg)
+        if mode == STREAM_TO_FIFO and not self.triggered:
+            generator = self.int2 if self.regs[FIFO_CTRL_REG] & 0x20 else self.int1
+            self.triggered = bool(generator.source & 0x40)
+
+    def pop(self):
+        if self.fifoMode() == BYPASS:
+            self.dataReady = False
+            self.dataOverrun = False
+            return
+        if self.fifo:
+            self.fifo.pop(0)
+            if self.fifo:
+                self.output = self.fifo[0]
+        if len(self.fifo) < FIFO_DEPTH:
+            self.fifoOverrun = False
+
+    # registers
+
+    def fifoSource(self):
+        count = len(self.fifo) if self.fifoMode() != BYPASS else 0
+        value = count & 0x1f
+        threshold = self.regs[FIFO_CTRL_REG] & 0x1f
+        if threshold and count >= threshold:
+            value |= 0x80
+        if self.fifoOverrun and self.fifoMode() != BYPASS:
+            value |= 0x40
+        if count == 0:
+            value |= 0x20
+        return value
+
+    def readRegister(self,register):
+        if OUT_X_L <= register <= OUT_Z_H:
+            value = self.output[(register - OUT_X_L) >> 1] & 0xffff
+            high = register & 1
+            if self.regs[CTRL_REG4] & 0x40:      # big endian: the high byte at the lower address
+                high = not high
+            byte = value >> 8 if high else value & 0xff
+            if register == OUT_Z_H:
+                self.pop()
+            return byte
+        if register == STATUS_REG:
+            if self.fifoMode() == BYPASS:
+                return (0x08 if self.dataReady else 0) | (0x80 if self.dataOverrun else 0)
+            return 0x08 if self.fifo else 0
+        if register == FIFO_SRC_REG:
+            return self.fifoSource()
+        if register == INT1_SRC:
+            return self.int1.read()
+        if register == INT2_SRC:
+            return self.int2.read()
+        if register == OUT_ADC3_H:
+            if self.regs[TEMP_CFG_REG] & 0xc0 == 0xc0:
+                return (int(round(self.motion.temperature)) - TEMPERATURE_OFFSET) & 0xff
+            return 0
+        return self.regs[register]
+
+    def i2cRead(self,register,n):
+        return self.read(register & 0x7f,n,bool(register & 0x80))
+
+    def i2cWrite(self,register,data):
+        self.write(register & 0x7f,data,bool(register & 0x80))
+
+    def nextRegister(self,register,increment):
+        if not increment:
+            return register
+        if register == OUT_Z_H and self.fifoMode() != BYPASS:
+            return OUT_X_L
+        return (register + 1) % self.SIZE
+
+    def writeRegister(self,register,value):
+        if register in READ_ONLY:
+            return
+        if register == CTRL_REG5:
+            value &= 0x7f                        # BOOT clears itself once the trimming is reloaded
+        old = self.regs[register]
+        self.regs[register] = value
+        if register == CTRL_REG1 and (old ^ value) & 0xf8:
+            self.restartSampling()
+        elif register == FIFO_CTRL_REG and (value >> 6) == BYPASS:
+            del self.fifo[:]                     # bypass mode empties the FIFO and re-arms the trigger
+            self.fifoOverrun = False
+            self.triggered = False
+        elif register == CTRL_REG5 and (old ^ value) & 0x40 and not value & 0x40:
+            del self.fifo[:]
+            self.fifoOverrun = False
+            self.triggered = False
+
+    # interrupts
+
+    def interruptLevel(self,line):
+        if line == 1:
+            route = self.regs[CTRL_REG3]
+            level = (route & 0x40 and self.int1.source & 0x40) or \
+                    (route & 0x20 and self.int2.source & 0x40)
+            if route & 0x10:
+                level = level or (self.dataReady if self.fifoMode() == BYPASS else bool(self.fifo))
+            if route & 0x04:
+                level = level or bool(self.fifoSource() & 0x80)
+            if route & 0x02:
+                level = level or bool(self.fifoSource() & 0x40)
+        else:
+            route = self.regs[CTRL_REG6]
+            level = (route & 0x40 and self.int1.source & 0x40) or \
+                    (route & 0x20 and self.int2.source & 0x40)
+        level = bool(level)
+        if self.regs[CTRL_REG6] & 0x02:          # INT_POLARITY: active low
+            level = not level
+        return level
@@ -0,0 +1,230 @@
+'''!
+machine.py: host stand-in for the MicroPython machine module
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Implements the parts of machine used by the accelerometer drivers and programs:
+Pin (with interrupts), Signal, I2C, SoftI2C, SPI and SoftSPI.
+The buses talk to the device models attached with simworld.attachI2C/attachSPI.
+Each transfer advances the virtual clock by the time it takes on the wire:
+9 clock cycles per byte plus a start, stop and a fixed software overhead for I2C,
+8 clock cycles per byte plus an overhead for SPI.
+'''
+
+import simworld
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self,id,mode=-1,pull=-1,value=None):
+        self.id = id
+        self.mode = mode
+        self.handler = None
+        self.trigger = 0
+        objects = simworld.pinObjects.setdefault(id,[])
+        objects.append(self)
+        if pull == Pin.PULL_UP and id not in simworld.pinLevels:
+            simworld.pinLevels[id] = 1
+        if value is not None:
+            self.value(value)
+
+    def init(self,mode=-1,pull=-1,value=None):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self,v=None):
+        if v is None:
+            return simworld.pinLevel(self.id)
+        simworld.drive(self.id,v)
+
+    def __call__(self,v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self,handler=None,trigger=IRQ_RISING | IRQ_FALLING,hard=False):
+        self.handler = handler
+        self.trigger = trigger if handler is not None else 0
+
+class Signal:
+    def __init__(self,pin,invert=False):
+        if not isinstance(pin,Pin):
+            pin = Pin(pin,Pin.OUT)
+        self.pin = pin
+        self.invert = invert
+
+    def value(self,v=None):
+        if v is None:
+            return self.pin.value() ^ self.invert
+        self.pin.value((1 if v else 0) ^ self.invert)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+class I2C:
+    OVERHEAD_US = 20            # driver and controller set up time per transfer
+
+    def __init__(self,id=0,scl=None,sda=None,freq=400000,timeout=50000):
+        self.id = id
+        self.freq = freq
+
+    def init(self,scl=None,sda=None,freq=400000):
+        self.freq = freq
+
+    def _device(self,addr):
+        device = simworld.i2cDevices.get(addr)
+        if device is None:
+            raise OSError(19)         # ENODEV, as MicroPython for a missing acknowledge
+        return device
+
+    def _transfer(self,nbytes):
+        # address + register byte, a repeated start for reads, 9 bits per byte
+        simworld.busTransfer(self.OVERHEAD_US + (nbytes + 3) * 9 * 1000000 // self.freq,
+                             False,nbytes)
+
+    def scan(self):
+        simworld.update()
+        return sorted(simworld.i2cDevices)
+
+    def readfrom_mem_into(self,addr,memaddr,buf,addrsize=8):
+        simworld.update()
+        view = memoryview(buf).cast('B')
+        data = self._device(addr).i2cRead(memaddr,len(view))
+        view[:] = data
+        self._transfer(len(view))
+
+    def readfrom_mem(self,addr,memaddr,nbytes,addrsize=8):
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(addr,memaddr,buf)
+        return bytes(buf)
+
+    def writeto_mem(self,addr,memaddr,buf,addrsize=8):
+        simworld.update()
+        data = bytes(memoryview(buf).cast('B'))
+        self._device(addr).i2cWrite(memaddr,data)
+        self._transfer(len(data))
+
+class SoftI2C(I2C):
+    OVERHEAD_US = 60            # bit-banged: the bus clock only reaches part of freq
+
+    def __init__(self,scl=None,sda=None,freq=400000,timeout=50000):
+        super().__init__(-1,scl,sda,freq,timeout)
+
+class SPI:
+    OVERHEAD_US = 10
+    MSB = 0
+    LSB = 1
+
+    def __init__(self,id=1,baudrate=1000000,polarity=0,phase=0,bits=8,firstbit=0,
+                 sck=None,mosi=None,miso=None):
+        self.id = id
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+
+    def init(self,baudrate=1000000,polarity=0,phase=0,**kwargs):
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+
+    def deinit(self):
+        pass
+
+    def _selected(self):
+        for cs,device in simworld.spiDevices.items():
+            if device.selected:
+                return device
+        return None
+
+    def _transfer(self,nbytes):
+        simworld.busTransfer(self.OVERHEAD_US + nbytes * 8 * 1000000 // self.baudrate,
+                             True,nbytes)
+
+    def write(self,buf):
+        simworld.update()
+        data = bytes(memoryview(buf).cast('B'))
+        device = self._selected()
+        if device is not None:
+            device.spiWrite(data)
+        self._transfer(len(data))
+
+    def readinto(self,buf,write=0x00):
+        simworld.update()
+        view = memoryview(buf).cast('B')
+        device = self._selected()
+        if device is not None:
+            view[:] = device.spiRead(len(view))
+        else:
+            for i in range(len(view)):
+                view[i] = 0xff
+        self._transfer(len(view))
+
+    def read(self,nbytes,write=0x00):
+        buf = bytearray(nbytes)
+        self.readinto(buf,write)
+        return bytes(buf)
+
+    def write_readinto(self,write_buf,read_buf):
+        # full duplex: the first byte written is the command, the rest is clocked in
+        simworld.update()
+        out = bytes(memoryview(write_buf).cast('B'))
+        view = memoryview(read_buf).cast('B')
+        device = self._selected()
+        if device is None:
+            for i in range(len(view)):
+                view[i] = 0xff
+        else:
+            device.spiWrite(out[:1])
+            view[0] = 0xff
+            view[1:] = device.spiRead(len(view) - 1)
+        self._transfer(len(view))
+
+class SoftSPI(SPI):
+    OVERHEAD_US = 40
+
+    def __init__(self,baudrate=500000,polarity=0,phase=0,bits=8,firstbit=0,
+                 sck=None,mosi=None,miso=None):
+        super().__init__(-1,baudrate,polarity,phase,bits,firstbit,sck,mosi,miso)
+
+def freq(hz=None):
+    return 240000000
+
+def reset():
+    raise SystemExit("machine.reset()")
+
+def soft_reset():
+    raise SystemExit("machine.soft_reset()")
+
+def deepsleep(ms=0):
+    raise SystemExit("machine.deepsleep({:d})".format(ms))
+
+def lightsleep(ms=0):
+    simworld.advance(ms * 1000)
+
+def idle():
+    simworld.tick()
+
+def unique_id():
+    return b'\x24\x0a\xc4\x00\x00\x01'
+
+def disable_irq():
+    return 0
+
+def enable_irq(state=0):
+    pass
@@ -0,0 +1,42 @@
+'''!
+micropython.py: host stand-in for the micropython module
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+'''
+
+import simworld
+
+def const(value):
+    return value
+
+def schedule(func,arg):
+    # runs func(arg) at the next safe point, raises RuntimeError if the queue is full
+    simworld.schedule(func,arg)
+
+def native(func):
+    return func
+
+def viper(func):
+    return func
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+def mem_info(verbose=False):
+    print("mem_info: not available in the simulation")
+
+def qstr_info(verbose=False):
+    pass
+
+def opt_level(level=None):
+    return 0
+
+def kbd_intr(chr):
+    pass
+
+def heap_lock():
+    pass
+
+def heap_unlock():
+    return 0
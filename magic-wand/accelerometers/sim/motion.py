@@ -0,0 +1,123 @@
+'''!
+motion.py: the motion seen by the simulated sensors
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+The sensor is at rest in a fixed orientation, given by the gravity vector measured in the
+sensor frame (0,0,1 g when lying flat). Gestures add a linear acceleration during a
+time window: a sine burst with a Hann envelope along an axis, which is what a flick of
+the wand looks like to an accelerometer.
+Gaussian noise, reproducible through the seed, is added to each reading.
+
+All sensor models of a simulation usually share the same Motion object.
+'''
+
+import math
+import random
+
+class Gesture:
+    def __init__(self,start,duration,axis,amplitude,freq):
+        self.start = int(start * 1000000)
+        self.end = self.start + int(duration * 1000000)
+        self.axis = axis
+        self.amplitude = amplitude
+        self.omega = 2 * math.pi * freq
+        self.duration = duration
+
+    def accel(self,t):
+        '''
+        @return the acceleration in g along the gesture axis at t us, 0 outside the window
+        '''
+        if t < self.start or t >= self.end:
+            return 0.0
+        s = (t - self.start) / 1000000
+        envelope = 0.5 - 0.5 * math.cos(2 * math.pi * s / self.duration)
+        return self.amplitude * envelope * math.sin(self.omega * s)
+
+class Motion:
+
+    def __init__(self,gravity=(0.0,0.0,1.0),noise=0.0,seed=1):
+        '''!
+        @param gravity: the gravity vector in the sensor frame in g
+        @param noise: standard deviation of the noise in g
+        @param seed: seed of the noise generator
+        '''
+        self.gravity = tuple(gravity)
+        self.noise = noise
+        self.random = random.Random(seed)
+        self.gestures = []
+        self.temperature = 25.0        # deg C
+
+    def setTilt(self,pitch=0.0,roll=0.0):
+        '''!
+        Orient the sensor from the pitch and roll angles in degrees
+        '''
+        p = math.radians(pitch)
+        r = math.radians(roll)
+        self.gravity = (-math.sin(p),math.cos(p) * math.sin(r),math.cos(p) * math.cos(r))
+
+    def addGesture(self,start,duration=1.0,axis=0,amplitude=1.5,freq=2.0):
+        '''!
+        Add a gesture
+        @param start: start time in s
+        @param duration: duration in s
+        @param axis: 0, 1, 2 for x, y, z
+        @param amplitude: peak acceleration in g
+        @param freq: frequency of the sine in Hz
+        '''
+        self.gestures.append(Gesture(start,duration,axis,amplitude,freq))
+
+    def moving(self,t):
+        for gesture in self.gestures:
+            if gesture.start <= t < gesture.end:
+                return True
+        return False
+
+    def accel(self,t):
+        '''!
+        @param t: time in us
+        @return the acceleration ax, ay, az in g as measured by the sensor
+        '''
+        a = list(self.gravity)
+        for gesture in self.gestures:
+            a[gesture.axis] += gesture.accel(t)
+        if self.noise:
+            for i in range(3):
+                a[i] += self.random.gauss(0.0,self.noise)
+        return a
+
+    def linearAccel(self,t):
+        '''!
+        @return the acceleration without gravity in g
+        '''
+        a = [0.0,0.0,0.0]
+        for gesture in self.gestures:
+            a[gesture.axis] += gesture.accel(t)
+        return a
+
+    def gyro(self,t):
+        '''!
+        @return the angular rate gx, gy, gz in deg/s: the orientation is fixed, only noise
+        '''
+        if not self.noise:
+            return [0.0,0.0,0.0]
+        return [self.random.gauss(0.0,self.noise * 10) for _ in range(3)]
+
+    def quaternion(self):
+        '''!
+        @return the orientation quaternion w, x, y, z whose gravity, as computed by the
+                DMP formulas (see MPU6050_DMP_packet.computeGravity), is the gravity vector
+        '''
+        gx,gy,gz = self.gravity
+        norm = math.sqrt(gx*gx + gy*gy + gz*gz)
+        gx /= norm
+        gy /= norm
+        gz /= norm
+        if gz < -0.999999:               # upside down: rotate by 180 deg about x
+            return (0.0,1.0,0.0,0.0)
+        w = 1.0 + gz
+        x = gy
+        y = -gx
+        n = math.sqrt(w*w + x*x + y*y)
+        return (w/n,x/n,y/n,0.0)
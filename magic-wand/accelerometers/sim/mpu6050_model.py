@@ -0,0 +1,277 @@
+'''!
+mpu6050_model.py: register level model of the MPU6050 and its MotionApps 2.0 DMP FIFO stream
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+Modelled after the register map (RM-MPU-6000A-00 Rev 4.2):
+- sample rate = gyro output rate (8 kHz with the DLPF off, 1 kHz otherwise) / (1 + SMPLRT_DIV),
+  no sampling while PWR_MGMT_1 SLEEP is set; DEVICE_RESET restores the power on state
+- accel and gyro full scale ranges, accel (XA_OFFS) and gyro (XG_OFFS_USR) offset registers,
+  temperature; all data registers big endian
+- the 1024 byte FIFO filled at the sample rate with the sensors selected in FIFO_EN,
+  the oldest bytes are lost on overflow (FIFO_OFLOW). FIFO_R_W and MEM_R_W do not
+  auto-increment the register address
+- the DMP memory: 8 banks of 256 bytes through BANK_SEL, MEM_START_ADDR and MEM_R_W.
+  With DMP_EN and FIFO_EN set and firmware loaded, the DMP writes a 42 byte MotionApps 2.0
+  packet every (1 + divisor) samples, the divisor being the 16 bit value at bank 2, offset 0x16
+- INT_STATUS: DATA_RDY, DMP_INT, FIFO_OFLOW and MOT_INT, cleared by reading INT_STATUS (or by
+  any read with INT_RD_CLEAR); the INT pin is a level with LATCH_INT_EN and a pulse (one edge
+  each way) otherwise, active low with INT_LEVEL
+- motion detection: the acceleration without gravity above MOT_THR (2 mg/LSB) for MOT_DUR ms
+The I2C master, the self test and zero motion detection are not modelled.
+'''
+
+from struct import pack
+from regmodel import RegisterModel
+
+XG_OFFS_TC      = 0x00
+XA_OFFS_H       = 0x06
+XG_OFFS_USRH    = 0x13
+SMPLRT_DIV      = 0x19
+CONFIG          = 0x1a
+GYRO_CONFIG     = 0x1b
+ACCEL_CONFIG    = 0x1c
+MOT_THR         = 0x1f
+MOT_DUR         = 0x20
+FIFO_EN         = 0x23
+INT_PIN_CFG     = 0x37
+INT_ENABLE      = 0x38
+INT_STATUS      = 0x3a
+ACCEL_XOUT_H    = 0x3b
+GYRO_ZOUT_L     = 0x48
+MOT_DETECT_STATUS = 0x61
+USER_CTRL       = 0x6a
+PWR_MGMT_1      = 0x6b
+BANK_SEL        = 0x6d
+MEM_START_ADDR  = 0x6e
+MEM_R_W         = 0x6f
+FIFO_COUNTH     = 0x72
+FIFO_COUNTL     = 0x73
+FIFO_R_W        = 0x74
+WHO_AM_I        = 0x75
+
+MOT_INT         = 0x40
+FIFO_OFLOW_INT  = 0x10
+DMP_INT         = 0x02
+DATA_RDY_INT    = 0x01
+
+FIFO_SIZE       = 1024
+BANK_SIZE       = 256
+BANKS           = 8
+DMP_RATE_ADDRESS = 2 * BANK_SIZE + 0x16
+
+DMP_QUAT_SCALE  = 1 << 30
+DMP_ACCEL_1G    = 8192
+DMP_GYRO_DPS    = 16.4
+
+class MPU6050Model(RegisterModel):
+    SIZE = 0x80
+    ADDRESS = 0x68
+
+    def reset(self):
+        super().reset()
+        self.regs[PWR_MGMT_1] = 0x40
+        self.regs[WHO_AM_I] = 0x68
+        self.regs[XG_OFFS_TC] = 0x01   # OTP_BNK_VLD
+        self.memory = bytearray(BANKS * BANK_SIZE)
+        self.fifo = bytearray()
+        self.status = 0                # INT_STATUS
+        self.dmpCount = 0              # samples since the last DMP packet
+        self.motionCount = 0           # consecutive samples above the motion threshold
+        self.pulse = False             # an interrupt pulse is due
+        self.packets = 0               # statistics
+        self.overflows = 0
+        self.restartSampling()
+
+    # conversion
+
+    def signedWord(self,register):
+        value = self.regs[register] << 8 | self.regs[register + 1]
+        return value - 0x10000 if value & 0x8000 else value
+
+    def putWord(self,register,value):
+        value &= 0xffff
+        self.regs[register] = value >> 8
+        self.regs[register + 1] = value & 0xff
+
+    # sampling
+
+    def samplePeriod(self):
+        if self.regs[PWR_MGMT_1] & 0x40:
+            return 0
+        dlpf = self.regs[CONFIG] & 0x07
+        gyroRate = 8000 if dlpf in (0,7) else 1000
+        return 1000000 * (1 + self.regs[SMPLRT_DIV]) / gyroRate
+
+    def sample(self,t):
+        motion = self.motion
+        accel = motion.accel(t)
+        gyro = motion.gyro(t)
+        accelScale = 16384 >> ((self.regs[ACCEL_CONFIG] >> 3) & 0x03)
+        gyroScale = 131.0 / (1 << ((self.regs[GYRO_CONFIG] >> 3) & 0x03))
+        for axis in range(3):
+            offset = (self.signedWord(XA_OFFS_H + 2 * axis) >> 1 << 1) / 2048
+            self.putWord(ACCEL_XOUT_H + 2 * axis,self.toRaw(accel[axis] + offset,accelScale))
+            offset = self.signedWord(XG_OFFS_USRH + 2 * axis) / 32.8
+            self.putWord(ACCEL_XOUT_H + 8 + 2 * axis,self.toRaw(gyro[axis] + offset,gyroScale))
+        self.putWord(ACCEL_XOUT_H + 6,self.toRaw(motion.temperature - 36.53,340))
+        events = DATA_RDY_INT
+        user = self.regs[USER_CTRL]
+        if user & 0x40:
+            if user & 0x80:
+                events |= self.dmpSample(t,accel,gyro)
+            else:
+                self.fifoSample()
+        if self.detectMotion(t):
+            events |= MOT_INT
+        if len(self.fifo) > FIFO_SIZE:
+            del self.fifo[:len(self.fifo) - FIFO_SIZE]
+            self.overflows += 1
+            events |= FIFO_OFLOW_INT
+        self.status |= events
+        if events & self.regs[INT_ENABLE]:
+            self.pulse = True
+
+    def fifoSample(self):
+        enabled = self.regs[FIFO_EN]
+        regs = self.regs
+        if enabled & 0x08:
+            self.fifo.extend(regs[ACCEL_XOUT_H:ACCEL_XOUT_H + 6])
+        if enabled & 0x80:
+            self.fifo.extend(regs[ACCEL_XOUT_H + 6:ACCEL_XOUT_H + 8])
+        for bit,register in ((0x40,ACCEL_XOUT_H + 8),(0x20,ACCEL_XOUT_H + 10),(0x10,ACCEL_XOUT_H + 12)):
+            if enabled & bit:
+                self.fifo.extend(regs[register:register + 2])
+
+    def dmpLoaded(self):
+        return any(self.memory[:BANK_SIZE])
+
+    def dmpSample(self,t,accel,gyro):
+        if not self.dmpLoaded():
+            return 0
+        divisor = self.memory[DMP_RATE_ADDRESS] << 8 | self.memory[DMP_RATE_ADDRESS + 1]
+        self.dmpCount += 1
+        if self.dmpCount <= divisor:
+            return 0
+        self.dmpCount = 0
+        quat = [int(round(q * DMP_QUAT_SCALE)) for q in self.motion.quaternion()]
+        values = [self.toRaw(g,DMP_GYRO_DPS) << 16 for g in gyro] + \
+                 [self.toRaw(a,DMP_ACCEL_1G) << 16 for a in accel]
+        quat = [max(-0x80000000,min(0x7fffffff,q)) for q in quat]
+        self.fifo.extend(pack('>4l6l2x',*(quat + values)))
+        self.packets += 1
+        return DMP_INT
+
+    def detectMotion(self,t):
+        threshold = self.regs[MOT_THR] * 2 / 1000       # g
+        if not threshold:
+            self.motionCount = 0
+            return False
+        linear = self.motion.linearAccel(t)
+        status = 0
+        for axis in range(3):
+            if linear[axis] > threshold:
+                status |= 0x40 >> (2 * axis)            # X_POS, Y_POS, Z_POS
+            elif linear[axis] < -threshold:
+                status |= 0x80 >> (2 * axis)            # X_NEG, Y_NEG, Z_NEG
+        if not status:
+            self.motionCount = 0
+            return False
+        self.motionCount += 1
+        if self.motionCount * self.period >= self.regs[MOT_DUR] * 1000:
+            self.regs[MOT_DETECT_STATUS] = status
+            return True
+        return False
+
+    # registers
+
+    def memoryAddress(self):
+        bank = self.regs[BANK_SEL] & 0x1f
+        if bank >= BANKS:
+            return None
+        return bank * BANK_SIZE + self.regs[MEM_START_ADDR]
+
+    def readRegister(self,register):
+        if register == FIFO_COUNTH:
+            return len(self.fifo) >> 8
+        if register == FIFO_COUNTL:
+            return len(self.fifo) & 0xff
+        if register == FIFO_R_W:
+            if not self.fifo:
+                return 0
+            value = self.fifo[0]
+            del self.fifo[0]
+            return value
+        if register == MEM_R_W:
+            address = self.memoryAddress()
+            self.regs[MEM_START_ADDR] = (self.regs[MEM_START_ADDR] + 1) & 0xff
+            return 0 if address is None else self.memory[address]
+        if register == INT_STATUS:
+            value = self.status
+            self.status = 0
+            return value
+        if register == MOT_DETECT_STATUS:
+            value = self.regs[MOT_DETECT_STATUS]
+            self.regs[MOT_DETECT_STATUS] = 0
+            return value
+        return self.regs[register]
+
+    def endRead(self,first,last):
+        if self.regs[INT_PIN_CFG] & 0x10:                # INT_RD_CLEAR: any read clears
+            self.status = 0
+
+    def nextRegister(self,register,increment):
+        if register in (FIFO_R_W,MEM_R_W):
+            return register
+        return (register + 1) % self.SIZE
+
+    def writeRegister(self,register,value):
+        if register in (INT_STATUS,FIFO_COUNTH,FIFO_COUNTL,WHO_AM_I,MOT_DETECT_STATUS) or \
+           ACCEL_XOUT_H <= register <= GYRO_ZOUT_L:
+            return
+        if register == MEM_R_W:
+            address = self.memoryAddress()
+            if address is not None:
+                self.memory[address] = value
+            self.regs[MEM_START_ADDR] = (self.regs[MEM_START_ADDR] + 1) & 0xff
+            return
+        if register == FIFO_R_W:
+            self.fifo.append(value)
+            return
+        if register == PWR_MGMT_1 and value & 0x80:
+            self.reset()
+            return
+        if register == USER_CTRL:
+            if value & 0x04:                            # FIFO_RESET
+                del self.fifo[:]
+            if value & 0x08:                            # DMP_RESET
+                self.dmpCount = 0
+            value &= 0xf0                               # the reset bits clear themselves
+        old = self.regs[register]
+        self.regs[register] = value
+        if (register == PWR_MGMT_1 and (old ^ value) & 0x40) or \
+           (register in (SMPLRT_DIV,CONFIG) and old != value):
+            self.restartSampling()
+
+    # interrupts
+
+    def interruptLevel(self,line):
+        cfg = self.regs[INT_PIN_CFG]
+        if cfg & 0x20:                                  # LATCH_INT_EN: level until cleared
+            level = bool(self.status & self.regs[INT_ENABLE])
+        else:
+            level = False
+        if cfg & 0x80:                                  # INT_LEVEL: active low
+            level = not level
+        return level
+
+    def updateLines(self):
+        if self.pulse and self.world is not None and not self.regs[INT_PIN_CFG] & 0x20:
+            active = 0 if self.regs[INT_PIN_CFG] & 0x80 else 1
+            for line,pin in self.lines.items():
+                self.world.drive(pin,active)
+                self.world.drive(pin,1 - active)
+                self.levels[line] = 1 - active
+        self.pulse = False
+        super().updateLines()
@@ -0,0 +1,201 @@
+'''!
+regmodel.py: base class of the register level device models
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+A device model holds a register file and implements
+- the I2C protocol: a transfer starts at a register and moves on to the next register
+  after each byte, as decided by nextRegister() (auto-increment, FIFO registers that
+  do not increment, roll over in FIFO mode)
+- the 4 wire SPI protocol of the ADXL345 and the LIS3DH: the first byte after chip select
+  holds the read bit (7), the multi-byte bit (6) and the register address (bits 0..5)
+- sampling: the sub class gives the sample period, sample() is called at each sample time
+- interrupt lines: interruptLevel() tells if a line is active, updateLines() drives the
+  connected ESP32 pins
+
+Sub classes override readRegister(), writeRegister(), endRead() (e.g. to pop the FIFO
+once per transfer), samplePeriod(), sample() and interruptLevel().
+'''
+
+import math
+
+class RegisterModel:
+    SIZE = 0x80
+    SPI_READ = 0x80
+    SPI_MULTI_BYTE = 0x40
+    SPI_ADDRESS_MASK = 0x3f
+
+    def __init__(self,motion):
+        self.motion = motion
+        self.world = None
+        self.regs = bytearray(self.SIZE)
+        self.lines = {}                # interrupt line -> ESP32 pin
+        self.levels = {}               # interrupt line -> level last driven
+        self.nextSample = None         # time of the next sample in us, may be fractional
+        self.period = 0                # sample period in us (float), 0: not sampling
+        self.selected = False          # SPI chip select active
+        self.spiCommand = None
+        self.spiRegister = 0
+        self.spiIncrement = False
+        self.reads = 0                 # register level statistics
+        self.writes = 0
+        self.reset()
+
+    def reset(self):
+        for i in range(self.SIZE):
+            self.regs[i] = 0
+
+    # register access, overridden by the sub classes
+
+    def readRegister(self,register):
+        return self.regs[register]
+
+    def writeRegister(self,register,value):
+        self.regs[register] = value
+
+    def nextRegister(self,register,increment):
+        if not increment:
+            return register
+        return (register + 1) % self.SIZE
+
+    def beginRead(self,register):
+        pass
+
+    def endRead(self,first,last):
+        pass
+
+    def endWrite(self,first,last):
+        pass
+
+    # bus protocols
+
+    def read(self,register,n,increment=True):
+        self.reads += 1
+        out = bytearray(n)
+        first = register
+        self.beginRead(register)
+        for i in range(n):
+            out[i] = self.readRegister(register) & 0xff
+            last = register
+            if i < n - 1:
+                register = self.nextRegister(register,increment)
+        if n:
+            self.endRead(first,last)
+        self.updateLines()
+        return out
+
+    def write(self,register,data,increment=True):
+        self.writes += 1
+        first = register
+        last = register
+        for i in range(len(data)):
+            self.writeRegister(register,data[i] & 0xff)
+            last = register
+            if i < len(data) - 1:
+                register = self.nextRegister(register,increment)
+        self.endWrite(first,last)
+        self.updateLines()
+
+    def i2cRead(self,register,n):
+        return self.read(register,n)
+
+    def i2cWrite(self,register,data):
+        self.write(register,data)
+
+    def select(self):
+        self.selected = True
+        self.spiCommand = None
+
+    def deselect(self):
+        self.selected = False
+        self.spiCommand = None
+
+    def spiWrite(self,data):
+        if not data:
+            return
+        if self.spiCommand is None:
+            self.spiCommand = data[0]
+            self.spiRegister = data[0] & self.SPI_ADDRESS_MASK
+            self.spiIncrement = bool(data[0] & self.SPI_MULTI_BYTE)
+            data = data[1:]
+            if not data:
+                return
+        if self.spiCommand & self.SPI_READ:
+            return
+        self.write(self.spiRegister,data,self.spiIncrement)
+        # a following write continues where this one stopped
+        for _ in range(len(data)):
+            self.spiRegister = self.nextRegister(self.spiRegister,self.spiIncrement)
+
+    def spiRead(self,n):
+        if self.spiCommand is None or not self.spiCommand & self.SPI_READ:
+            return bytes(n)
+        data = self.read(self.spiRegister,n,self.spiIncrement)
+        for _ in range(n):
+            self.spiRegister = self.nextRegister(self.spiRegister,self.spiIncrement)
+        return data
+
+    # sampling
+
+    def samplePeriod(self):
+        '''
+        @return the sample period in us, 0 if the device does not sample
+        '''
+        return 0
+
+    def restartSampling(self):
+        '''
+        Called when the output data rate or the power mode change
+        '''
+        self.period = self.samplePeriod()
+        if self.period and self.world is not None:
+            self.nextSample = self.world.now + self.period
+        elif self.period:
+            self.nextSample = self.period
+        else:
+            self.nextSample = None
+
+    def nextEvent(self):
+        if self.nextSample is None:
+            return None
+        return int(math.ceil(self.nextSample))
+
+    def update(self,now):
+        while self.nextSample is not None and self.nextSample <= now:
+            t = self.nextSample
+            self.nextSample += self.period
+            self.sample(t)
+        self.updateLines()
+
+    def sample(self,t):
+        pass
+
+    # interrupts
+
+    def interruptLevel(self,line):
+        return False
+
+    def updateLines(self):
+        if self.world is None:
+            return
+        for line,pin in self.lines.items():
+            level = 1 if self.interruptLevel(line) else 0
+            if self.levels.get(line) != level:
+                self.levels[line] = level
+                self.world.drive(pin,level)
+
+    # helpers
+
+    @staticmethod
+    def toRaw(value,scale,bits=16):
+        '''
+        Convert a physical value to a signed integer of bits bits, saturated
+        '''
+        raw = int(round(value * scale))
+        top = (1 << (bits - 1)) - 1
+        if raw > top:
+            raw = top
+        elif raw < -top - 1:
+            raw = -top - 1
+        return raw
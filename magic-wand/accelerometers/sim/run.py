@@ -0,0 +1,138 @@
+'''!
+run.py: run a MicroPython accelerometer program under CPython against the simulated sensors
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+usage: python3 sim/run.py [options] program.py [program arguments]
+
+options:
+  --duration S        end the program after S seconds of virtual time (default: run to the end)
+  --gesture T,D,A,G,F add a gesture starting at T s, lasting D s along axis A (0..2),
+                      peak acceleration G g, frequency F Hz. May be repeated
+  --tilt P,R          orient the sensors: pitch and roll in degrees
+  --noise G           standard deviation of the noise in g
+  --seed N            seed of the noise generator
+  --int DEV.LINE=PIN  connect interrupt line LINE of adxl345, lis3dh or mpu6050 to the ESP32 pin PIN
+  --spi DEV=CS        attach adxl345 or lis3dh to the SPI bus with chip select CS instead of I2C
+  --chdir DIR         working directory of the program (default: its own directory),
+                      e.g. the directory of the data files the program opens
+
+All three sensors share the same motion: ADXL345 at 0x53, MPU6050 at 0x68, LIS3DH at 0x18.
+The interrupt lines are wired as on our boards: ADXL345 INT1 to GPIO 19, INT2 to GPIO 18,
+MPU6050 INT to GPIO 26. The bus statistics are printed at the end.
+'''
+
+import os
+import sys
+import runpy
+import time
+
+SIM = os.path.dirname(os.path.abspath(__file__))
+TOP = os.path.dirname(SIM)
+sys.path[0:0] = [SIM] + [os.path.join(TOP,d) for d in ("common","adxl345","lis3dh",os.path.join("mpu6050","src"))]
+
+import simworld
+import utime
+from motion import Motion
+from adxl345_model import ADXL345Model
+from lis3dh_model import LIS3DHModel
+from mpu6050_model import MPU6050Model
+
+INTERRUPTS = {"adxl345.1": 19, "adxl345.2": 18, "mpu6050.1": 26}
+
+def usage():
+    print(__doc__.split("usage:")[1].split("All three")[0].rstrip())
+    sys.exit(2)
+
+def floats(text,n):
+    values = [float(v) for v in text.split(",")]
+    if len(values) != n:
+        raise ValueError(text)
+    return values
+
+def main(argv):
+    duration = None
+    gestures = []
+    tilt = None
+    noise = 0.0
+    seed = 1
+    interrupts = dict(INTERRUPTS)
+    spi = {}
+    chdir = None
+    while argv and argv[0].startswith("--"):
+        option = argv.pop(0)
+        if not argv:
+            usage()
+        value = argv.pop(0)
+        try:
+            if option == "--duration":
+                duration = float(value)
+            elif option == "--gesture":
+                gestures.append(floats(value,5))
+            elif option == "--tilt":
+                tilt = floats(value,2)
+            elif option == "--noise":
+                noise = float(value)
+            elif option == "--seed":
+                seed = int(value)
+            elif option == "--int":
+                line,pin = value.split("=")
+                interrupts[line] = int(pin)
+            elif option == "--spi":
+                name,cs = value.split("=")
+                spi[name] = int(cs)
+            elif option == "--chdir":
+                chdir = value
+            else:
+                usage()
+        except ValueError:
+            usage()
+    if not argv:
+        usage()
+    program = os.path.abspath(argv[0])
+
+    simworld.reset()
+    utime.patch(time)
+    motion = Motion(noise=noise,seed=seed)
+    if tilt is not None:
+        motion.setTilt(*tilt)
+    for start,length,axis,amplitude,freq in gestures:
+        motion.addGesture(start,length,int(axis),amplitude,freq)
+    models = {
+        "adxl345": ADXL345Model(motion),
+        "lis3dh": LIS3DHModel(motion),
+        "mpu6050": MPU6050Model(motion),
+    }
+    for name,model in models.items():
+        if name in spi:
+            simworld.attachSPI(model,spi[name])
+        else:
+            simworld.attachI2C(model,model.ADDRESS)
+    for key,pin in interrupts.items():
+        name,line = key.split(".")
+        simworld.connect(models[name],int(line),pin)
+    simworld.setDeadline(duration)
+
+    sys.argv = argv
+    # after the drivers: an example must not hide the driver module of the same name
+    sys.path.append(os.path.dirname(program))
+    os.chdir(chdir if chdir is not None else os.path.dirname(program))
+    status = 0
+    try:
+        runpy.run_path(program,run_name="__main__")
+    except simworld.SimulationEnd:
+        pass
+    except SystemExit as exc:
+        status = exc.code
+    except KeyboardInterrupt:
+        pass
+    print("\n--- simulation: {:.6f} s virtual time".format(simworld.now / 1000000))
+    for key,value in simworld.stats.items():
+        print("{:<14s}: {:d}".format(key,int(value)))
+    for name,model in models.items():
+        print("{:<14s}: {:d} register reads, {:d} register writes".format(name,model.reads,model.writes))
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
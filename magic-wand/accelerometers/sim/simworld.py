@@ -0,0 +1,195 @@
+'''!
+simworld.py: the simulated world behind the machine, utime and micropython stand-ins
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+The world keeps
+- a virtual clock in us. It only advances when the program sleeps, when a bus transfer
+  takes place (by the time the transfer takes on the wire) and by TICKS_COST_US at each
+  ticks_xx() call, such that polling loops terminate. The run time of the Python code
+  itself is not counted: under CPython it says nothing about the run time on the ESP32.
+- the device models attached to the I2C bus (by address) and to the SPI bus (by chip select pin)
+- the pin levels and the pin interrupt handlers
+- the queue of functions scheduled with micropython.schedule
+
+Pin interrupt handlers and scheduled functions run at the next safe point, as soft
+interrupts do in MicroPython: at the end of a bus transfer, in sleep_xx() and in ticks_xx().
+When the clock advances, the device models are updated sample by sample, such that the
+interrupt handlers run at the virtual time at which the device raised its interrupt line.
+'''
+
+import sys
+
+TICKS_COST_US = 1              # virtual time taken by each ticks_xx() call
+
+now = 0                        # virtual time in us
+deadline = None                # end of the simulation in us, see setDeadline()
+devices = []                   # all device models
+i2cDevices = {}                # I2C address -> device model
+spiDevices = {}                # chip select pin -> device model
+pinLevels = {}                 # pin id -> level driven by a device or by the program
+pinObjects = {}                # pin id -> list of Pin objects
+queue = []                     # pending (function, argument) pairs
+running = False                # the queue is being processed
+
+# statistics
+stats = {
+    'i2cTransfers': 0,
+    'i2cBytes': 0,
+    'spiTransfers': 0,
+    'spiBytes': 0,
+    'busTimeUs': 0,
+    'scheduled': 0,
+    'irqs': 0,
+}
+
+class SimulationEnd(SystemExit):
+    '''
+    Raised at a safe point when the virtual clock passes the deadline
+    '''
+    pass
+
+def reset():
+    '''
+    Remove all devices and pins and restart the clock at 0
+    '''
+    global now, deadline, running
+    now = 0
+    deadline = None
+    running = False
+    del devices[:]
+    i2cDevices.clear()
+    spiDevices.clear()
+    pinLevels.clear()
+    pinObjects.clear()
+    del queue[:]
+    for key in stats:
+        stats[key] = 0
+
+def setDeadline(seconds):
+    '''
+    End the simulation with SimulationEnd once the virtual clock reaches seconds
+    '''
+    global deadline
+    deadline = None if seconds is None else int(seconds * 1000000)
+
+def attachI2C(device,address):
+    if device not in devices:
+        devices.append(device)
+    i2cDevices[address] = device
+    device.world = sys.modules[__name__]
+
+def attachSPI(device,cs):
+    if device not in devices:
+        devices.append(device)
+    spiDevices[cs] = device
+    device.world = sys.modules[__name__]
+
+def connect(device,line,pin):
+    '''
+    Wire the interrupt output line of device to the ESP32 pin
+    '''
+    device.lines[line] = pin
+    device.updateLines()
+
+# time
+
+def time_us():
+    return now
+
+def update():
+    for device in devices:
+        device.update(now)
+
+def advance(us):
+    '''
+    Advance the virtual clock by us, updating the devices at each of their sample times
+    and running the interrupt handlers when they are due
+    '''
+    global now
+    target = now + int(us)
+    while True:
+        nextEvent = None
+        for device in devices:
+            t = device.nextEvent()
+            if t is not None and (nextEvent is None or t < nextEvent):
+                nextEvent = t
+        if nextEvent is None or nextEvent > target:
+            break
+        if nextEvent > now:
+            now = nextEvent
+        update()
+        pump()
+        if now >= target:
+            break
+    if now < target:
+        now = target
+    update()
+    pump()
+
+def busTransfer(us,spi=False,nbytes=0):
+    '''
+    Account for a bus transfer lasting us
+    '''
+    stats['busTimeUs'] += us
+    if spi:
+        stats['spiTransfers'] += 1
+        stats['spiBytes'] += nbytes
+    else:
+        stats['i2cTransfers'] += 1
+        stats['i2cBytes'] += nbytes
+    advance(us)
+
+def tick():
+    advance(TICKS_COST_US)
+
+# pins and interrupts
+
+def pinLevel(pin):
+    return pinLevels.get(pin,0)
+
+def drive(pin,level):
+    '''
+    Set the level of a pin, called by the devices for their interrupt lines and by
+    the Pin objects configured as outputs. Edges trigger the registered handlers
+    '''
+    level = 1 if level else 0
+    old = pinLevels.get(pin,0)
+    pinLevels[pin] = level
+    if level == old:
+        return
+    for obj in pinObjects.get(pin,()):
+        if obj.handler is None:
+            continue
+        if (level and obj.trigger & obj.IRQ_RISING) or (not level and obj.trigger & obj.IRQ_FALLING):
+            stats['irqs'] += 1
+            queue.append((obj.handler,obj))
+    if pin in spiDevices:
+        if level:
+            spiDevices[pin].deselect()
+        else:
+            spiDevices[pin].select()
+
+def schedule(func,arg):
+    if len(queue) >= 32:
+        raise RuntimeError("schedule queue full")
+    stats['scheduled'] += 1
+    queue.append((func,arg))
+
+def pump():
+    '''
+    Run the pending interrupt handlers and scheduled functions
+    '''
+    global running
+    if deadline is not None and now >= deadline:
+        raise SimulationEnd(0)
+    if running:
+        return
+    running = True
+    try:
+        while queue:
+            func,arg = queue.pop(0)
+            func(arg)
+    finally:
+        running = False
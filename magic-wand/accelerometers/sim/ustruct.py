@@ -0,0 +1,2 @@
+# ustruct.py: host stand-in for the MicroPython ustruct module
+from struct import *
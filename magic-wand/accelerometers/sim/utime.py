@@ -0,0 +1,68 @@
+'''!
+utime.py: host stand-in for the MicroPython utime module, running on the virtual clock
+Copyright (c) U. Raich Oct. 2026
+This program is part of a course on machine learning at the University of Cape Coast,Ghana
+It is released under the MIT license
+
+sleep_xx() advance the virtual clock instead of waiting, ticks_xx() read it.
+The ticks wrap around at 2^30 as on the ESP32.
+'''
+
+import simworld
+
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+EPOCH_OFFSET = 0                 # seconds since 2000-01-01 at virtual time 0
+
+def sleep(seconds):
+    simworld.advance(int(seconds * 1000000))
+
+def sleep_ms(ms):
+    simworld.advance(int(ms) * 1000)
+
+def sleep_us(us):
+    simworld.advance(int(us))
+
+def ticks_us():
+    simworld.tick()
+    return simworld.now & TICKS_MAX
+
+def ticks_ms():
+    simworld.tick()
+    return (simworld.now // 1000) & TICKS_MAX
+
+def ticks_cpu():
+    return ticks_us()
+
+def ticks_add(ticks,delta):
+    return (ticks + delta) & TICKS_MAX
+
+def ticks_diff(ticks1,ticks2):
+    return ((ticks1 - ticks2 + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+def time():
+    return EPOCH_OFFSET + simworld.now // 1000000
+
+def time_ns():
+    return simworld.now * 1000
+
+def localtime(secs=None):
+    import time as _time
+    if secs is None:
+        secs = time()
+    t = _time.gmtime(secs + 946684800)
+    return (t.tm_year,t.tm_mon,t.tm_mday,t.tm_hour,t.tm_min,t.tm_sec,t.tm_wday,t.tm_yday - 1)
+
+gmtime = localtime
+
+def patch(module):
+    '''
+    Add the MicroPython extensions to the CPython time module, which cannot be replaced
+    on sys.path because it is built into the interpreter. Programs importing
+    "from time import sleep_ms" then run on the virtual clock too
+    '''
+    for name in ('sleep_ms','sleep_us','ticks_us','ticks_ms','ticks_cpu','ticks_add','ticks_diff'):
+        setattr(module,name,globals()[name])
+    module.sleep = sleep
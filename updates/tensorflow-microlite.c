@@ -32,6 +32,9 @@
 #include "py/qstr.h"
 #include "py/misc.h"
 
+#include <stdint.h>
+#include <string.h>
+
 #include "tensorflow-microlite.h"
 
 #include "openmv-libtf.h"
@@ -44,8 +47,6 @@ const mp_obj_type_t microlite_interpreter_type;
 const mp_obj_type_t microlite_tensor_type;
 const mp_obj_type_t microlite_audio_frontend_type;
 
-STATIC mp_obj_t interpreter_get_input_tensor(mp_obj_t self_in, mp_obj_t index_obj);
-
 // - microlite tensor
 STATIC void tensor_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t kind) {
     (void)kind;
@@ -201,13 +202,329 @@ STATIC mp_obj_t tensor_quantize_int8_to_float (mp_obj_t self_in, mp_obj_t int_ob
 
 MP_DEFINE_CONST_FUN_OBJ_2(microlite_tensor_quantize_int8_to_float, tensor_quantize_int8_to_float);
 
+// bulk access to the tensor data
+
+// array typecode of the tensor elements, 0 if the type has no array equivalent
+STATIC char tensor_typecode (TfLiteTensor *tensor) {
+
+    switch (tensor->type) {
+        case kTfLiteFloat32:
+            return 'f';
+        case kTfLiteInt8:
+            return 'b';
+        case kTfLiteUInt8:
+            return 'B';
+        case kTfLiteInt16:
+            return 'h';
+        case kTfLiteInt32:
+            return 'i';
+        default:
+            return 0;
+    }
+}
+
+// size of a buffer element, 0 if the typecode is not supported by fillFrom and copyTo
+STATIC size_t tensor_item_size (char typecode) {
+
+    switch (typecode) {
+        case BYTEARRAY_TYPECODE:
+        case 'b':
+        case 'B':
+            return 1;
+        case 'h':
+        case 'H':
+            return 2;
+        case 'i':
+        case 'I':
+            return sizeof(int);
+        case 'l':
+        case 'L':
+            return sizeof(long);
+        case 'f':
+            return sizeof(float);
+        default:
+            return 0;
+    }
+}
+
+// the elements are converted through float, exact for all 8 and 16 bit integers
+STATIC float tensor_load (char typecode, const void *data, size_t index) {
+
+    switch (typecode) {
+        case 'b':
+            return ((const int8_t *)data)[index];
+        case 'h':
+            return ((const int16_t *)data)[index];
+        case 'H':
+            return ((const uint16_t *)data)[index];
+        case 'i':
+            return ((const int *)data)[index];
+        case 'I':
+            return ((const unsigned int *)data)[index];
+        case 'l':
+            return ((const long *)data)[index];
+        case 'L':
+            return ((const unsigned long *)data)[index];
+        case 'f':
+            return ((const float *)data)[index];
+        default:
+            return ((const uint8_t *)data)[index];
+    }
+}
+
+STATIC int32_t tensor_round_clamp (float value, int32_t min, int32_t max) {
+
+    if (value <= (float)min) {
+        return min;
+    }
+    if (value >= (float)max) {
+        return max;
+    }
+    return (int32_t)(value < 0 ? value - 0.5f : value + 0.5f);
+}
+
+// integer elements are rounded and saturated
+STATIC void tensor_store (char typecode, void *data, size_t index, float value) {
+
+    switch (typecode) {
+        case 'b':
+            ((int8_t *)data)[index] = tensor_round_clamp(value, INT8_MIN, INT8_MAX);
+            break;
+        case 'h':
+            ((int16_t *)data)[index] = tensor_round_clamp(value, INT16_MIN, INT16_MAX);
+            break;
+        case 'H':
+            ((uint16_t *)data)[index] = tensor_round_clamp(value, 0, UINT16_MAX);
+            break;
+        case 'i':
+        case 'l':
+            if (tensor_item_size(typecode) == 4) {
+                ((int32_t *)data)[index] = tensor_round_clamp(value, INT32_MIN, INT32_MAX);
+            }
+            else {
+                ((int64_t *)data)[index] = (int64_t)value;
+            }
+            break;
+        case 'I':
+        case 'L':
+            if (tensor_item_size(typecode) == 4) {
+                ((uint32_t *)data)[index] = value <= 0 ? 0 : (uint32_t)(value + 0.5f);
+            }
+            else {
+                ((uint64_t *)data)[index] = value <= 0 ? 0 : (uint64_t)value;
+            }
+            break;
+        case 'f':
+            ((float *)data)[index] = value;
+            break;
+        default:
+            ((uint8_t *)data)[index] = tensor_round_clamp(value, 0, UINT8_MAX);
+            break;
+    }
+}
+
+// checks the buffer and the tensor for fillFrom and copyTo
+// returns the number of tensor elements
+STATIC size_t tensor_bulk_setup (TfLiteTensor *tensor, mp_obj_t buf_obj, mp_buffer_info_t *bufinfo,
+                                 mp_uint_t flags, size_t *buf_len) {
+
+    mp_get_buffer_raise(buf_obj, bufinfo, flags);
+
+    size_t item_size = tensor_item_size(bufinfo->typecode);
+
+    if (item_size == 0) {
+        mp_raise_TypeError(MP_ERROR_TEXT("Unsupported Buffer Type"));
+    }
+
+    char typecode = tensor_typecode(tensor);
+
+    if (typecode == 0) {
+        mp_raise_TypeError(MP_ERROR_TEXT("Unsupported Tensor Type"));
+    }
+
+    *buf_len = bufinfo->len / item_size;
+
+    return tensor->bytes / tensor_item_size(typecode);
+}
+
+// the optional scale and zero point arguments of fillFrom and copyTo
+// returns true if the values are to be converted, false for a plain copy
+STATIC bool tensor_bulk_params (size_t n_args, const mp_obj_t *args, float *scale, float *zero_point) {
+
+    *scale = 1.0f;
+    *zero_point = 0.0f;
+
+    bool convert = false;
+
+    if (n_args > 2 && args[2] != mp_const_none) {
+        *scale = mp_obj_get_float_to_f(args[2]);
+        if (*scale == 0.0f) {
+            mp_raise_ValueError(MP_ERROR_TEXT("scale must not be 0"));
+        }
+        convert = true;
+    }
+    if (n_args > 3 && args[3] != mp_const_none) {
+        *zero_point = mp_obj_get_float_to_f(args[3]);
+        convert = true;
+    }
+    return convert;
+}
+
+// the tensor quantization, only for integer tensors with a scale
+STATIC bool tensor_is_quantized (TfLiteTensor *tensor) {
+
+    return tensor->type != kTfLiteFloat32 && tensor->params.scale != 0.0f;
+}
+
+// a plain copy of the bytes: same element type, or untyped bytes (bytes, bytearray) and a
+// tensor of 1 byte elements, such that quantized int8 data in a bytearray are not saturated
+STATIC bool tensor_raw_copy (char typecode, mp_obj_t buf_obj, mp_buffer_info_t *bufinfo) {
+
+    if (bufinfo->typecode == typecode) {
+        return true;
+    }
+    bool untyped = bufinfo->typecode == BYTEARRAY_TYPECODE || mp_obj_is_type(buf_obj, &mp_type_bytes);
+
+    return untyped && tensor_item_size(typecode) == 1;
+}
+
+// tensor.fillFrom(buf[, scale[, zero_point]])
+// Fills the tensor from the elements of buf (bytes, bytearray, array or memoryview of the
+// types b, B, h, H, i, I, l, L, f) in a single call.
+// Without scale and zero_point the values are copied as they are, converted to the tensor type
+// (rounded and saturated for integer tensors): for data that already matches the tensor.
+// bytes and bytearray are copied byte by byte into int8 and uint8 tensors, no conversion.
+// With scale and/or zero_point the buffer holds quantized values: their real values
+// (value - zero_point) * scale are stored into a float tensor, or quantized with the tensor's
+// own scale and zero point into an int8 or uint8 tensor.
+// Returns the number of elements copied. buf may hold fewer elements than the tensor.
+STATIC mp_obj_t tensor_fill_from (size_t n_args, const mp_obj_t *args) {
+
+    microlite_tensor_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+
+    TfLiteTensor * tensor = (TfLiteTensor *)self->tf_tensor;
+
+    mp_buffer_info_t bufinfo;
+    size_t buf_len;
+    size_t tensor_len = tensor_bulk_setup(tensor, args[1], &bufinfo, MP_BUFFER_READ, &buf_len);
+
+    if (buf_len > tensor_len) {
+        mp_raise_ValueError(MP_ERROR_TEXT("Buffer larger than the tensor"));
+    }
+
+    float scale, zero_point;
+    bool convert = tensor_bulk_params(n_args, args, &scale, &zero_point);
+
+    char typecode = tensor_typecode(tensor);
+    char buf_typecode = bufinfo.typecode == BYTEARRAY_TYPECODE ? 'B' : bufinfo.typecode;
+
+    if (!convert && tensor_raw_copy(typecode, args[1], &bufinfo)) {
+        memcpy(tensor->data.raw, bufinfo.buf, bufinfo.len);
+        return MP_OBJ_NEW_SMALL_INT(buf_len);
+    }
+
+    bool quantized = convert && tensor_is_quantized(tensor);
+    float tensor_scale = tensor->params.scale;
+    float tensor_zero_point = tensor->params.zero_point;
+
+    for (size_t i = 0; i < buf_len; i++) {
+        float value = tensor_load(buf_typecode, bufinfo.buf, i);
+        if (convert) {
+            value = (value - zero_point) * scale;
+            if (quantized) {
+                value = value / tensor_scale + tensor_zero_point;
+            }
+        }
+        tensor_store(typecode, tensor->data.raw, i, value);
+    }
+
+    return MP_OBJ_NEW_SMALL_INT(buf_len);
+}
+
+MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(microlite_tensor_fill_from, 2, 4, tensor_fill_from);
+
+// tensor.copyTo(buf[, scale[, zero_point]])
+// Copies the tensor elements into buf, the reverse of fillFrom:
+// without scale and zero_point the values are copied as they are, converted to the buffer type.
+// int8 and uint8 tensors are copied byte by byte into a bytearray, no conversion.
+// With scale and/or zero_point the real values of the tensor (dequantized with the tensor's
+// own scale and zero point for an int8 or uint8 tensor) are stored as
+// real / scale + zero_point: e.g. copyTo(array('f', ...), 1.0) gives the real values.
+// Returns the number of elements copied, at most as many as buf holds.
+STATIC mp_obj_t tensor_copy_to (size_t n_args, const mp_obj_t *args) {
+
+    microlite_tensor_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+
+    TfLiteTensor * tensor = (TfLiteTensor *)self->tf_tensor;
+
+    mp_buffer_info_t bufinfo;
+    size_t buf_len;
+    size_t tensor_len = tensor_bulk_setup(tensor, args[1], &bufinfo, MP_BUFFER_WRITE, &buf_len);
+
+    size_t len = buf_len < tensor_len ? buf_len : tensor_len;
+
+    float scale, zero_point;
+    bool convert = tensor_bulk_params(n_args, args, &scale, &zero_point);
+
+    char typecode = tensor_typecode(tensor);
+    char buf_typecode = bufinfo.typecode == BYTEARRAY_TYPECODE ? 'B' : bufinfo.typecode;
+
+    if (!convert && tensor_raw_copy(typecode, args[1], &bufinfo)) {
+        memcpy(bufinfo.buf, tensor->data.raw, len * tensor_item_size(typecode));
+        return MP_OBJ_NEW_SMALL_INT(len);
+    }
+
+    bool quantized = convert && tensor_is_quantized(tensor);
+    float tensor_scale = tensor->params.scale;
+    float tensor_zero_point = tensor->params.zero_point;
+
+    for (size_t i = 0; i < len; i++) {
+        float value = tensor_load(typecode, tensor->data.raw, i);
+        if (convert) {
+            if (quantized) {
+                value = (value - tensor_zero_point) * tensor_scale;
+            }
+            value = value / scale + zero_point;
+        }
+        tensor_store(buf_typecode, bufinfo.buf, i, value);
+    }
+
+    return MP_OBJ_NEW_SMALL_INT(len);
+}
+
+MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(microlite_tensor_copy_to, 2, 4, tensor_copy_to);
+
+// buffer protocol: memoryview(tensor) gives direct access to the tensor data, typed as
+// the tensor elements (f, b, B, h or i)
+STATIC mp_int_t tensor_get_buffer (mp_obj_t self_in, mp_buffer_info_t *bufinfo, mp_uint_t flags) {
+    (void)flags;
+
+    microlite_tensor_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    TfLiteTensor * tensor = (TfLiteTensor *)self->tf_tensor;
+
+    char typecode = tensor_typecode(tensor);
+
+    if (typecode == 0 || tensor->data.raw == NULL) {
+        return 1;
+    }
+
+    bufinfo->buf = tensor->data.raw;
+    bufinfo->len = tensor->bytes;
+    bufinfo->typecode = typecode;
+
+    return 0;
+}
+
 // interpreter class
 STATIC const mp_rom_map_elem_t tensor_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_getValue), MP_ROM_PTR(&microlite_tensor_get_value) },
     { MP_ROM_QSTR(MP_QSTR_setValue), MP_ROM_PTR(&microlite_tensor_set_value) },
     { MP_ROM_QSTR(MP_QSTR_getType), MP_ROM_PTR(&microlite_tensor_get_tensor_type) },
     { MP_ROM_QSTR(MP_QSTR_quantizeFloatToInt8), MP_ROM_PTR(&microlite_tensor_quantize_float_to_int8) },
-    { MP_ROM_QSTR(MP_QSTR_quantizeInt8ToFloat), MP_ROM_PTR(&microlite_tensor_quantize_int8_to_float) }
+    { MP_ROM_QSTR(MP_QSTR_quantizeInt8ToFloat), MP_ROM_PTR(&microlite_tensor_quantize_int8_to_float) },
+    { MP_ROM_QSTR(MP_QSTR_fillFrom), MP_ROM_PTR(&microlite_tensor_fill_from) },
+    { MP_ROM_QSTR(MP_QSTR_copyTo), MP_ROM_PTR(&microlite_tensor_copy_to) }
 };
 
 STATIC MP_DEFINE_CONST_DICT(tensor_locals_dict, tensor_locals_dict_table);
@@ -217,6 +534,7 @@ MP_DEFINE_CONST_OBJ_TYPE(
     MP_QSTR_tensor,
     MP_TYPE_FLAG_NONE,
     print, tensor_print,
+    buffer, tensor_get_buffer,
     locals_dict,&tensor_locals_dict
 );
 // audio_frontend
@@ -272,18 +590,78 @@ MP_DEFINE_CONST_OBJ_TYPE(
 
 // - microlite interpreter
 
+// number of input and output tensors whose tensor objects are kept by the interpreter
+#define MICROLITE_CACHED_TENSORS 4
+
+// the interpreter object with its tensor objects: getInputTensor and getOutputTensor are called
+// for every inference, they return the same tensor objects instead of allocating new ones.
+// The interpreter must stay the first member, the object is passed to libtf as
+// microlite_interpreter_obj_t.
+typedef struct _microlite_interpreter_tensors_obj_t {
+    microlite_interpreter_obj_t interpreter;
+    microlite_tensor_obj_t *input_tensors[MICROLITE_CACHED_TENSORS];
+    microlite_tensor_obj_t *output_tensors[MICROLITE_CACHED_TENSORS];
+} microlite_interpreter_tensors_obj_t;
+
+STATIC microlite_tensor_obj_t *interpreter_new_tensor(microlite_interpreter_obj_t *microlite_interpreter, TfLiteTensor *tf_tensor) {
+
+    microlite_tensor_obj_t *microlite_tensor = m_new_obj(microlite_tensor_obj_t);
+
+    microlite_tensor->tf_tensor = tf_tensor;
+    microlite_tensor->microlite_interpreter = microlite_interpreter;
+    microlite_tensor->base.type = &microlite_tensor_type;
+
+    return microlite_tensor;
+}
+
+// returns the tensor object of input or output tensor index
+// the tensor objects are created on first use, only tensors beyond MICROLITE_CACHED_TENSORS
+// get a new object on each call
+STATIC microlite_tensor_obj_t *interpreter_tensor(microlite_interpreter_tensors_obj_t *self, mp_uint_t index, bool input) {
+
+    microlite_interpreter_obj_t *microlite_interpreter = &self->interpreter;
+
+    TfLiteTensor *tf_tensor;
+
+    if (input) {
+        tf_tensor = libtf_interpreter_get_input_tensor(microlite_interpreter, index);
+    }
+    else {
+        tf_tensor = libtf_interpreter_get_output_tensor(microlite_interpreter, index);
+    }
+
+    if (index >= MICROLITE_CACHED_TENSORS) {
+        return interpreter_new_tensor(microlite_interpreter, tf_tensor);
+    }
+
+    microlite_tensor_obj_t **cache = input ? self->input_tensors : self->output_tensors;
+
+    if (cache[index] == NULL) {
+        cache[index] = interpreter_new_tensor(microlite_interpreter, tf_tensor);
+    }
+    else {
+        // no allocation, the tensor pointer is refreshed in case the interpreter moved it
+        cache[index]->tf_tensor = tf_tensor;
+    }
+    return cache[index];
+}
+
 STATIC void interpreter_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t kind) {
     (void)kind;
-    microlite_interpreter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    microlite_interpreter_tensors_obj_t *self = MP_OBJ_TO_PTR(self_in);
     mp_print_str(print, "interpreter(");
     
-    mp_printf(print, "model size = %d, tensor_area size = %d\n", self->model_data->len, self->tensor_area->len);
+    mp_printf(print, "model size = %d, tensor_area size = %d\n", self->interpreter.model_data->len, self->interpreter.tensor_area->len);
     
-    microlite_tensor_obj_t *input_tensor = MP_OBJ_TO_PTR(interpreter_get_input_tensor(self, 0));
+    microlite_tensor_obj_t *input_tensor = interpreter_tensor(self, 0, true);
+
+    microlite_tensor_obj_t *output_tensor = interpreter_tensor(self, 0, false);
 
-    microlite_tensor_obj_t *output_tensor = MP_OBJ_TO_PTR(interpreter_get_input_tensor(self, 0));
+    mp_print_str(print, "input: ");
+    mp_obj_print_helper (print, MP_OBJ_FROM_PTR(input_tensor), PRINT_STR);
 
-    mp_obj_print_helper (print, output_tensor, PRINT_STR);
+    mp_print_str(print, "\noutput: ");
+    mp_obj_print_helper (print, MP_OBJ_FROM_PTR(output_tensor), PRINT_STR);
 
     mp_print_str(print, ")");
 }
@@ -316,7 +694,9 @@ STATIC mp_obj_t interpreter_make_new(const mp_obj_type_t *type, size_t n_args, s
 
     // to start with just hard code to the hello-world model
 
-    microlite_interpreter_obj_t *self = m_new_obj(microlite_interpreter_obj_t);
+    microlite_interpreter_tensors_obj_t *interpreter_tensors = m_new_obj(microlite_interpreter_tensors_obj_t);
+
+    microlite_interpreter_obj_t *self = &interpreter_tensors->interpreter;
 
     self->input_callback = input_callback_fn;
     self->output_callback = output_callback_fn;
@@ -345,7 +725,16 @@ STATIC mp_obj_t interpreter_make_new(const mp_obj_type_t *type, size_t n_args, s
 
     libtf_interpreter_init(self);
 
-    return MP_OBJ_FROM_PTR(self);
+    // create the tensor objects of the first input and output tensor now,
+    // the inference loop then runs without heap allocation
+    for (int i = 0; i < MICROLITE_CACHED_TENSORS; i++) {
+        interpreter_tensors->input_tensors[i] = NULL;
+        interpreter_tensors->output_tensors[i] = NULL;
+    }
+    interpreter_tensor(interpreter_tensors, 0, true);
+    interpreter_tensor(interpreter_tensors, 0, false);
+
+    return MP_OBJ_FROM_PTR(interpreter_tensors);
 }
 
 // called before passing the tensor to the callback
@@ -353,17 +742,9 @@ STATIC mp_obj_t interpreter_get_input_tensor(mp_obj_t self_in, mp_obj_t index_ob
 
     mp_uint_t index = mp_obj_int_get_uint_checked(index_obj);
 
-    microlite_interpreter_obj_t *microlite_interpreter = MP_OBJ_TO_PTR(self_in);
-
-    microlite_tensor_obj_t *microlite_tensor = m_new_obj(microlite_tensor_obj_t);
-
-    TfLiteTensor *input_tensor = libtf_interpreter_get_input_tensor(microlite_interpreter, index);
-
-    microlite_tensor->tf_tensor = input_tensor;
-    microlite_tensor->microlite_interpreter = microlite_interpreter;
-    microlite_tensor->base.type = &microlite_tensor_type;
+    microlite_interpreter_tensors_obj_t *self = MP_OBJ_TO_PTR(self_in);
 
-    return MP_OBJ_FROM_PTR(microlite_tensor);
+    return MP_OBJ_FROM_PTR(interpreter_tensor(self, index, true));
 }
 
 MP_DEFINE_CONST_FUN_OBJ_2(microlite_interpreter_get_input_tensor, interpreter_get_input_tensor);
@@ -372,17 +753,9 @@ STATIC mp_obj_t interpreter_get_output_tensor(mp_obj_t self_in, mp_obj_t index_o
 
     mp_uint_t index = mp_obj_int_get_uint_checked(index_obj);
 
-    microlite_interpreter_obj_t *microlite_interpreter = MP_OBJ_TO_PTR(self_in);
-
-    microlite_tensor_obj_t *microlite_tensor = m_new_obj(microlite_tensor_obj_t);
-
-    TfLiteTensor *output_tensor = libtf_interpreter_get_output_tensor(microlite_interpreter, index);
-
-    microlite_tensor->tf_tensor = output_tensor;
-    microlite_tensor->microlite_interpreter = microlite_interpreter;
-    microlite_tensor->base.type = &microlite_tensor_type;
+    microlite_interpreter_tensors_obj_t *self = MP_OBJ_TO_PTR(self_in);
 
-    return MP_OBJ_FROM_PTR(microlite_tensor);
+    return MP_OBJ_FROM_PTR(interpreter_tensor(self, index, false));
 }
 
 MP_DEFINE_CONST_FUN_OBJ_2(microlite_interpreter_get_output_tensor, interpreter_get_output_tensor);